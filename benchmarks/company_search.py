@@ -0,0 +1,106 @@
+"""Benchmark company search on a seeded scratch table.
+
+Seeds ``bench_companies`` (same columns as ``companies``) with generated rows,
+then times the search predicates used by ``CompanyRepository`` without and
+with the pg_trgm indexes added in migration ``b5d82e61a0c4``.
+
+    python -m benchmarks.company_search --rows 1000000
+"""
+import argparse
+import asyncio
+import statistics
+import time
+
+from sqlalchemy import text
+
+from src.app.config.config import Settings
+from src.infrastructure.dbs.postgre import create_engine
+
+SEED = """
+INSERT INTO bench_companies (owner_id, name, bin, description, address, logo_url, status, created_at, updated_at)
+SELECT
+    g,
+    'Company ' || md5(g::text) || ' ' || (ARRAY['Taxi', 'Trans', 'Cargo', 'Tour', 'Express'])[1 + g % 5],
+    lpad(g::text, 12, '0'),
+    'Intercity trips ' || md5((g * 7)::text) || ' across ' || (ARRAY['Almaty', 'Astana', 'Shymkent', 'Aktobe'])[1 + g % 4],
+    'Street ' || g,
+    '/logos/' || g || '.png',
+    (ARRAY['APPROVED', 'WAITING', 'REJECTED'])[1 + g % 3]::status,
+    now() - (g || ' seconds')::interval,
+    now()
+FROM generate_series(1, :rows) AS g
+"""
+
+QUERIES = {
+    "contains": (
+        "SELECT id FROM bench_companies "
+        "WHERE (name ILIKE :pattern OR description ILIKE :pattern) AND status = 'APPROVED' "
+        "ORDER BY greatest(similarity(name, :text), word_similarity(:text, description)) DESC, created_at, id "
+        "LIMIT 10",
+        lambda term: {"pattern": f"%{term}%", "text": term},
+    ),
+    "prefix": (
+        "SELECT id FROM bench_companies WHERE name ILIKE :pattern ORDER BY name, id LIMIT 10",
+        lambda term: {"pattern": f"{term}%"},
+    ),
+}
+
+TERMS = {"contains": ["cargo", "5f3a", "shymkent"], "prefix": ["Company 5f", "Company ab1"]}
+
+INDEXES = [
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    "CREATE INDEX ON bench_companies USING gin (name gin_trgm_ops)",
+    "CREATE INDEX ON bench_companies USING gin (description gin_trgm_ops)",
+    "CREATE INDEX ON bench_companies (name, id)",
+]
+
+
+async def measure(conn, repeat: int) -> dict:
+    results = {}
+    for name, (sql, params) in QUERIES.items():
+        for term in TERMS[name]:
+            timings = []
+            for _ in range(repeat):
+                started = time.perf_counter()
+                await conn.execute(text(sql), params(term))
+                timings.append((time.perf_counter() - started) * 1000)
+            results[f"{name}:{term}"] = statistics.median(timings)
+    return results
+
+
+async def main(rows: int, repeat: int) -> None:
+    settings = Settings()
+    engine = create_engine(settings.db_url, echo=False, pool_mode="null")
+
+    async with engine.connect() as conn:
+        await conn.execute(text("DROP TABLE IF EXISTS bench_companies"))
+        await conn.execute(text("CREATE TABLE bench_companies (LIKE companies INCLUDING DEFAULTS)"))
+        await conn.execute(text(SEED), {"rows": rows})
+        await conn.execute(text("ANALYZE bench_companies"))
+        await conn.commit()
+
+        before = await measure(conn, repeat)
+
+        for statement in INDEXES:
+            await conn.execute(text(statement))
+        await conn.execute(text("ANALYZE bench_companies"))
+        await conn.commit()
+
+        after = await measure(conn, repeat)
+
+        await conn.execute(text("DROP TABLE bench_companies"))
+        await conn.commit()
+
+    await engine.dispose()
+
+    print(f"{'query':<28}{'seq scan, ms':>16}{'trigram, ms':>16}")
+    for key in before:
+        print(f"{key:<28}{before[key]:>16.2f}{after[key]:>16.2f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    asyncio.run(main(args.rows, args.repeat))
@@ -0,0 +1,48 @@
+"""added keyset pagination indexes
+
+Revision ID: 7c1e4b9d2f3a
+Revises: 453304db2f8a
+Create Date: 2026-10-18 10:12:41.208311
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7c1e4b9d2f3a'
+down_revision: Union[str, Sequence[str], None] = '453304db2f8a'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_drivers_created_at_id', 'drivers', ['created_at', 'id'], unique=False)
+    op.create_index('ix_drivers_status_created_at_id', 'drivers', ['status', 'created_at', 'id'], unique=False)
+    op.create_index('ix_companies_created_at_id', 'companies', ['created_at', 'id'], unique=False)
+    op.create_index('ix_companies_status_created_at_id', 'companies', ['status', 'created_at', 'id'], unique=False)
+    op.create_index(
+        'ix_driver_company_company_id_created_at_driver_id',
+        'driver_company',
+        ['company_id', 'created_at', 'driver_id'],
+        unique=False,
+    )
+    op.create_index(
+        'ix_driver_company_driver_id_created_at_company_id',
+        'driver_company',
+        ['driver_id', 'created_at', 'company_id'],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_driver_company_driver_id_created_at_company_id', table_name='driver_company')
+    op.drop_index('ix_driver_company_company_id_created_at_driver_id', table_name='driver_company')
+    op.drop_index('ix_companies_status_created_at_id', table_name='companies')
+    op.drop_index('ix_companies_created_at_id', table_name='companies')
+    op.drop_index('ix_drivers_status_created_at_id', table_name='drivers')
+    op.drop_index('ix_drivers_created_at_id', table_name='drivers')
@@ -0,0 +1,47 @@
+"""added trigram search indexes for companies
+
+Revision ID: b5d82e61a0c4
+Revises: 7c1e4b9d2f3a
+Create Date: 2026-10-18 11:03:17.574920
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b5d82e61a0c4'
+down_revision: Union[str, Sequence[str], None] = '7c1e4b9d2f3a'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.create_index(
+        'ix_companies_name_trgm',
+        'companies',
+        ['name'],
+        unique=False,
+        postgresql_using='gin',
+        postgresql_ops={'name': 'gin_trgm_ops'},
+    )
+    op.create_index(
+        'ix_companies_description_trgm',
+        'companies',
+        ['description'],
+        unique=False,
+        postgresql_using='gin',
+        postgresql_ops={'description': 'gin_trgm_ops'},
+    )
+    op.create_index('ix_companies_name_id', 'companies', ['name', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_companies_name_id', table_name='companies')
+    op.drop_index('ix_companies_description_trgm', table_name='companies')
+    op.drop_index('ix_companies_name_trgm', table_name='companies')
@@ -1,4 +1,5 @@
 from pathlib import Path
+from typing import Dict, List, Literal, Optional, Tuple
 from pydantic_settings import BaseSettings
 
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -9,6 +10,9 @@ class Settings(BaseSettings):
     APP_NAME: str
     APP_ENV: str
 
+    # Seconds between metric snapshots in the logs; 0 disables them
+    METRICS_LOG_INTERVAL: float = 60
+
     # ---- Database ----
     POSTGRES_USER: str
     POSTGRES_PASSWORD: str
@@ -17,14 +21,52 @@ class Settings(BaseSettings):
     POSTGRES_PORT: int
     DATABASE_URL: str
     ALEMBIC_URL: str
+    REPLICA_DATABASE_URL: Optional[str] = None
+
+    # ---- Database pool ----
+    DB_POOL_MODE: Literal["queue", "null"] = "queue"
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_PRE_PING: bool = True
+    DB_POOL_RECYCLE: int = 1800
+    DB_POOL_TIMEOUT: int = 30
 
     # ---- Redis ----
+    # redis://, rediss://, unix://, redis+sentinel://host:port,.../<service>[/<db>] or redis+cluster://host:port
     REDIS_URL: str
+    REDIS_MAX_CONNECTIONS: int = 50
+    REDIS_POOL_TIMEOUT: float = 5
+    REDIS_SOCKET_TIMEOUT: float = 5
+    REDIS_CONNECT_TIMEOUT: float = 5
+    REDIS_HEALTH_CHECK_INTERVAL: int = 30
+
+    # ---- User cache ----
+    USER_CACHE_TTL: int = 300
+    USER_CACHE_LOCAL_TTL: int = 5
+    USER_CACHE_LOCAL_SIZE: int = 10000
+
+    # ---- Rate limiting ----
+    # route name -> (requests, period in seconds), applied per client IP, user and email
+    RATE_LIMIT_ENABLED: bool = True
+    RATE_LIMITS: Dict[str, Tuple[int, int]] = {
+        "login": (10, 60),
+        "send_otp": (3, 300),
+    }
+    # Proxy addresses or CIDRs whose forwarded header carries the real client IP
+    RATE_LIMIT_TRUSTED_PROXIES: List[str] = []
+    RATE_LIMIT_FORWARDED_HEADER: str = "X-Forwarded-For"
 
     # ---- JWT ----
     JWT_SECRET: str
     JWT_ALGORITHM: str
     ACCESS_TOKEN_EXPIRE_MINUTES: int
+    JWT_BACKEND: Literal["jose", "pyjwt"] = "jose"
+    JWT_CACHE_SIZE: int = 10000
+
+    # ---- Password hashing ----
+    BCRYPT_ROUNDS: int = 12
+    HASH_MAX_WORKERS: int = 4
+    HASH_MAX_QUEUE: int = 100
 
     # ---- SMTP ----
     SMTP_HOST: str
@@ -32,15 +74,48 @@ class Settings(BaseSettings):
     SMTP_USER: str
     SMTP_PASSWORD: str
     SMTP_FROM: str
+    SMTP_START_TLS: bool = True
+    SMTP_TIMEOUT: int = 30
+    SMTP_POOL_SIZE: int = 4
+    SMTP_HEALTH_CHECK_INTERVAL: int = 30
+
+    # ---- Email queue ----
+    EMAIL_QUEUE_PREFIX: str = "email"
+    EMAIL_MAX_ATTEMPTS: int = 5
+    EMAIL_RETRY_BASE_DELAY: int = 2
+    EMAIL_RETRY_MAX_DELAY: int = 300
+    EMAIL_WORKER_BATCH: int = 50
 
     # ---- OTP ----
     OTP_TTL: int
+    OTP_MAX_ATTEMPTS: int = 5
 
     # ---- MinIO ----
     MINIO_ROOT_USER: str
     MINIO_ROOT_PASSWORD: str
     MINIO_BUCKET: str
     MINIO_ENDPOINT: str
+    MINIO_SECURE: bool = False
+    MINIO_PUBLIC_ENDPOINT: Optional[str] = None
+    MINIO_REGION: str = "us-east-1"
+    MINIO_POOL_SIZE: int = 16
+    MINIO_CONNECT_TIMEOUT: float = 5
+    MINIO_READ_TIMEOUT: float = 60
+    MINIO_MAX_RETRIES: int = 3
+    MINIO_UPLOAD_CONCURRENCY: int = 4
+    MINIO_PART_SIZE: int = 5 * 1024 * 1024
+    MINIO_STREAM_CONCURRENCY: int = 4
+    MINIO_STREAM_READ_TIMEOUT: float = 30
+    MINIO_CONTENT_ADDRESSED: bool = False
+
+    STORAGE_CLEANUP_KEY: str = "storage:cleanup"
+    STORAGE_CLEANUP_BATCH: int = 1000
+    STORAGE_CLEANUP_INTERVAL: float = 5
+    STORAGE_RECONCILE_INTERVAL: int = 3600
+    STORAGE_ORPHAN_GRACE: int = 86400
+
+    IMAGE_WORKERS: int = 2
+    IMAGE_MAX_PIXELS: int = 40_000_000
 
     @property
     def db_url(self) -> str:
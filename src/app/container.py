@@ -1,13 +1,20 @@
 from dependency_injector import containers, providers
 
 from src.app.config.config import Settings
-from src.application.users.services import EmailOtpService
-from src.infrastructure.dbs.postgre import create_engine, create_session_factory
+from src.application.companies.models import Company
+from src.application.drivers.models import Driver
+from src.application.users.models import User
+from src.application.users.services import EmailOtpService, UserCacheService, TokenVersionService, TokenIssuer
+from src.infrastructure.dbs.postgre import create_engine, create_replica_engine, create_session_factory
 from src.infrastructure.dbs.redis import RedisConnection
 from src.infrastructure.integrations.hash_service import HashService
 from src.infrastructure.integrations.jwt_service import JWTService
-from src.infrastructure.integrations.email_service import EmailService
+from src.infrastructure.integrations.email_queue import EmailQueue, EmailWorker
+from src.infrastructure.integrations.email_service import EmailService, SMTPPool
 from src.infrastructure.integrations.minio_service import MinioService
+from src.infrastructure.integrations.image_service import ImageService
+from src.infrastructure.integrations.storage_cleanup import StorageCleanupQueue, StorageCleanupWorker
+from src.infrastructure.rate_limiter import RateLimiter
 
 
 class Container(containers.DeclarativeContainer):
@@ -15,34 +22,116 @@ class Container(containers.DeclarativeContainer):
         modules=[
             "src.presentation.v1.depends.session",
             "src.presentation.v1.depends.security",
+            "src.presentation.v1.depends.repositories",
+            "src.presentation.v1.depends.rate_limit",
             "src.presentation.v1.depends.controllers",
         ]
     )
 
     settings = Settings()
 
-    engine = providers.Singleton(create_engine, db_url=settings.db_url, echo=False)
+    engine = providers.Singleton(
+        create_engine,
+        db_url=settings.db_url,
+        echo=False,
+        pool_mode=settings.DB_POOL_MODE,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_pre_ping=settings.DB_POOL_PRE_PING,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+    )
+
+    replica_engine = providers.Singleton(
+        create_replica_engine,
+        db_url=settings.REPLICA_DATABASE_URL,
+        echo=False,
+        pool_mode=settings.DB_POOL_MODE,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_pre_ping=settings.DB_POOL_PRE_PING,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+    )
 
     session_factory = providers.Resource(
-        create_session_factory, engine=engine
+        create_session_factory, engine=engine, replica_engine=replica_engine
+    )
+
+    redis = providers.Singleton(
+        RedisConnection,
+        url=settings.REDIS_URL,
+        max_connections=settings.REDIS_MAX_CONNECTIONS,
+        pool_timeout=settings.REDIS_POOL_TIMEOUT,
+        socket_timeout=settings.REDIS_SOCKET_TIMEOUT,
+        socket_connect_timeout=settings.REDIS_CONNECT_TIMEOUT,
+        health_check_interval=settings.REDIS_HEALTH_CHECK_INTERVAL,
+    )
+
+    user_cache = providers.Singleton(
+        UserCacheService,
+        redis=redis,
+        ttl=settings.USER_CACHE_TTL,
+        local_ttl=settings.USER_CACHE_LOCAL_TTL,
+        local_maxsize=settings.USER_CACHE_LOCAL_SIZE,
     )
 
-    redis = providers.Resource(RedisConnection, url=settings.REDIS_URL)
+    token_versions = providers.Singleton(TokenVersionService, redis=redis)
+
+    rate_limiter = providers.Singleton(
+        RateLimiter,
+        redis=redis,
+        rules=settings.RATE_LIMITS,
+        enabled=settings.RATE_LIMIT_ENABLED,
+    )
+
+    email_queue = providers.Singleton(
+        EmailQueue,
+        redis=redis,
+        prefix=settings.EMAIL_QUEUE_PREFIX,
+    )
 
     email_service = providers.Factory(
         EmailService,
+        queue=email_queue,
+    )
+
+    smtp_pool = providers.Singleton(
+        SMTPPool,
         smtp_host=settings.SMTP_HOST,
         smtp_port=settings.SMTP_PORT,
         username=settings.SMTP_USER,
         password=settings.SMTP_PASSWORD,
         from_email=settings.SMTP_FROM,
+        start_tls=settings.SMTP_START_TLS,
+        timeout=settings.SMTP_TIMEOUT,
+        size=settings.SMTP_POOL_SIZE,
+        health_check_interval=settings.SMTP_HEALTH_CHECK_INTERVAL,
+    )
+
+    email_worker = providers.Singleton(
+        EmailWorker,
+        queue=email_queue,
+        sender=smtp_pool,
+        batch_size=settings.EMAIL_WORKER_BATCH,
+        max_attempts=settings.EMAIL_MAX_ATTEMPTS,
+        retry_base_delay=settings.EMAIL_RETRY_BASE_DELAY,
+        retry_max_delay=settings.EMAIL_RETRY_MAX_DELAY,
     )
 
-    jwt_service = providers.Factory(
+    jwt_service = providers.Singleton(
         JWTService,
         secret_key=settings.JWT_SECRET,
         algorithm=settings.JWT_ALGORITHM,
         access_token_expire_minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES,
+        backend=settings.JWT_BACKEND,
+        cache_size=settings.JWT_CACHE_SIZE,
+    )
+
+    token_issuer = providers.Singleton(
+        TokenIssuer,
+        jwt_service=jwt_service,
+        token_versions=token_versions,
     )
 
     email_otp_service = providers.Factory(
@@ -50,16 +139,62 @@ class Container(containers.DeclarativeContainer):
         email_service=email_service,
         redis=redis,
         otp_ttl=settings.OTP_TTL,
+        max_attempts=settings.OTP_MAX_ATTEMPTS,
     )
 
-    hash_service = providers.Factory(
+    hash_service = providers.Singleton(
         HashService,
+        rounds=settings.BCRYPT_ROUNDS,
+        max_workers=settings.HASH_MAX_WORKERS,
+        max_queue=settings.HASH_MAX_QUEUE,
     )
 
-    minio_service = providers.Factory(
+    image_service = providers.Singleton(
+        ImageService,
+        max_workers=settings.IMAGE_WORKERS,
+        max_pixels=settings.IMAGE_MAX_PIXELS,
+    )
+
+    storage_cleanup = providers.Singleton(
+        StorageCleanupQueue,
+        redis=redis,
+        key=settings.STORAGE_CLEANUP_KEY,
+    )
+
+    minio_service = providers.Singleton(
         MinioService,
         endpoint=settings.MINIO_ENDPOINT,
         access_key=settings.MINIO_ROOT_USER,
         secret_key=settings.MINIO_ROOT_PASSWORD,
-        bucket=settings.MINIO_BUCKET
+        bucket=settings.MINIO_BUCKET,
+        secure=settings.MINIO_SECURE,
+        pool_size=settings.MINIO_POOL_SIZE,
+        connect_timeout=settings.MINIO_CONNECT_TIMEOUT,
+        read_timeout=settings.MINIO_READ_TIMEOUT,
+        max_retries=settings.MINIO_MAX_RETRIES,
+        public_endpoint=settings.MINIO_PUBLIC_ENDPOINT,
+        region=settings.MINIO_REGION,
+        upload_concurrency=settings.MINIO_UPLOAD_CONCURRENCY,
+        part_size=settings.MINIO_PART_SIZE,
+        stream_concurrency=settings.MINIO_STREAM_CONCURRENCY,
+        stream_read_timeout=settings.MINIO_STREAM_READ_TIMEOUT,
+        image_service=image_service,
+        content_addressed=settings.MINIO_CONTENT_ADDRESSED,
+        cleanup=storage_cleanup,
+    )
+
+    storage_worker = providers.Singleton(
+        StorageCleanupWorker,
+        queue=storage_cleanup,
+        storage=minio_service,
+        session_factory=session_factory,
+        referenced_columns=[
+            User.avatar_url, User.avatar_thumb_url, User.avatar_medium_url,
+            Driver.id_photo_url, Driver.license_photo_url,
+            Company.logo_url, Company.logo_thumb_url, Company.logo_medium_url,
+        ],
+        batch_size=settings.STORAGE_CLEANUP_BATCH,
+        interval=settings.STORAGE_CLEANUP_INTERVAL,
+        reconcile_interval=settings.STORAGE_RECONCILE_INTERVAL,
+        orphan_grace=settings.STORAGE_ORPHAN_GRACE,
     )
\ No newline at end of file
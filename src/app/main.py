@@ -1,15 +1,52 @@
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
+from redis.exceptions import RedisError
 
+from src.infrastructure.metrics import metrics
 from src.presentation.v1.routers import user_router, admin_router, company_router, driver_router
 from .container import Container
 
 
+logger = logging.getLogger(__name__)
+
 container = Container()
-app = FastAPI()
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    try:
+        await container.redis().connect()
+    except RedisError as e:
+        # Redis-backed features degrade or reconnect lazily; do not block startup.
+        logger.warning("Redis is unavailable at startup: %s", e)
+
+    await container.minio_service().ensure_bucket()
+
+    reporter = None
+    if container.settings.METRICS_LOG_INTERVAL > 0:
+        reporter = asyncio.create_task(metrics.report(container.settings.METRICS_LOG_INTERVAL, logger))
+
+    yield
+    if reporter is not None:
+        reporter.cancel()
+    await container.redis().disconnect()
+    container.hash_service().shutdown()
+    container.minio_service().shutdown()
+    await container.engine().dispose()
+
+    replica_engine = container.replica_engine()
+    if replica_engine is not None:
+        await replica_engine.dispose()
+
+
+app = FastAPI(lifespan=lifespan)
 app.container = container
 
 
 app.include_router(admin_router.router)
 app.include_router(user_router.router)
 app.include_router(company_router.router)
-app.include_router(driver_router.router)
\ No newline at end of file
+app.include_router(driver_router.router)
@@ -0,0 +1,36 @@
+import asyncio
+import logging
+import signal
+
+from src.app.container import Container
+from src.infrastructure.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+
+async def main() -> None:
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+
+    container = Container()
+    worker = container.storage_worker()
+
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, worker.stop)
+
+    reporter = None
+    if container.settings.METRICS_LOG_INTERVAL > 0:
+        reporter = asyncio.create_task(metrics.report(container.settings.METRICS_LOG_INTERVAL, logger))
+
+    try:
+        await worker.run()
+    finally:
+        if reporter is not None:
+            reporter.cancel()
+        await container.redis().disconnect()
+        container.minio_service().shutdown()
+        await container.engine().dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -1,16 +1,17 @@
-from typing import Dict, Optional
+from functools import partial
+from typing import Dict, Optional, List
 
 from fastapi import HTTPException, status as s
+from starlette.responses import Response
 
 from src.application.companies.dtos import CompanyDTO, PaginationCompanyDTO
 from src.application.companies.interfaces import ICompanyController, ICompanyRepository, IAdminCompanyController
 from src.application.drivers.dtos import PaginationDriverCompanyDTO, DriverCompanyDTO
 from src.application.drivers.interfaces import IDriverCompanyRepository, IDriverRepository
 from src.application.users.dtos import UserDTO
-from src.application.users.interfaces import IUserRepository
-from src.domain.enums import UserRoles, Status
-from src.domain.interfaces import IStorageService
-from src.domain.value_objects import ALLOWED_STATUS_TRANSITIONS, ALLOWED_IMAGE_TYPES
+from src.application.users.interfaces import IUserRepository, ITokenIssuer
+from src.domain.enums import UserRoles, Status, SearchMode, UploadFolder
+from src.domain.interfaces import IStorageService, IUoW, IStorageCleanup
 
 
 class CompanyController(ICompanyController):
@@ -21,14 +22,20 @@ class CompanyController(ICompanyController):
             driver_repository: IDriverRepository,
             user_repository: IUserRepository,
             storage_service: IStorageService,
+            storage_cleanup: IStorageCleanup,
+            token_issuer: ITokenIssuer,
+            uow: IUoW,
     ):
         self._company_repository = company_repository
         self._user_repository = user_repository
         self._driver_repository = driver_repository
         self._driver_company_repository = driver_company_repository
         self._storage_service = storage_service
+        self._storage_cleanup = storage_cleanup
+        self._token_issuer = token_issuer
+        self._uow = uow
 
-    async def create_company(self, user: UserDTO, company_data: CompanyDTO) -> Dict:
+    async def create_company(self, user: UserDTO, company_data: CompanyDTO, response: Response) -> Dict:
         if not user.role == UserRoles.PASSENGER:
             raise HTTPException(status_code=s.HTTP_409_CONFLICT, detail="User is not a PASSENGER. To change your role you should be passenger")
 
@@ -36,15 +43,24 @@ class CompanyController(ICompanyController):
         if exists:
             raise HTTPException(status_code=s.HTTP_409_CONFLICT, detail="User already have a company")
 
-        if company_data.logo_file.content_type not in ALLOWED_IMAGE_TYPES:
-            raise HTTPException(status_code=s.HTTP_400_BAD_REQUEST, detail=f"Incorrect image type")
-        logo_url = await self._storage_service.upload_file(company_data.logo_file, 'logos')
+        logo_url = await self._storage_service.store_image(
+            UploadFolder.LOGOS.value, user.id, company_data.logo_file, company_data.logo_path
+        )
+        if logo_url is None:
+            raise HTTPException(status_code=s.HTTP_400_BAD_REQUEST, detail="Company logo is required")
+        variants = self._storage_service.variant_urls(logo_url)
         company_data.logo_url = logo_url
-        company_data.logo_file = None
+        company_data.logo_thumb_url = variants["thumb"]
+        company_data.logo_medium_url = variants["medium"]
+        company_data.logo_file = company_data.logo_path = None
+
+        async with self._uow:
+            created = await self._company_repository.add(company_data.to_payload(exclude_none=True))
 
-        created = await self._company_repository.add(company_data.to_payload(exclude_none=True))
+            updated_user = await self._user_repository.update(user_id=created.owner_id, user_data={"role": UserRoles.COMPANY})
 
-        await self._user_repository.update(user_id=created.owner_id, user_data={"role": UserRoles.COMPANY})
+        # The role change revoked the caller's tokens.
+        await self._token_issuer.issue(updated_user, response)
 
         return {
             "detail": "Company created successfully",
@@ -59,7 +75,14 @@ class CompanyController(ICompanyController):
 
         return company.to_payload(exclude_none=True)
 
-    async def search_companies(self, user: UserDTO, text: str, status: Optional[Status], pagination: PaginationCompanyDTO) -> Dict:
+    async def search_companies(
+            self,
+            user: UserDTO,
+            text: str,
+            status: Optional[Status],
+            pagination: PaginationCompanyDTO,
+            mode: SearchMode = SearchMode.CONTAINS,
+    ) -> Dict:
         if not user.role == UserRoles.ADMIN:
             status = Status.APPROVED
 
@@ -67,6 +90,7 @@ class CompanyController(ICompanyController):
             text=text,
             status=status,
             pagination=pagination.to_payload(),
+            mode=mode,
         )
 
         return pagination_dto.to_payload(exclude_none=True)
@@ -85,32 +109,41 @@ class CompanyController(ICompanyController):
         if not company:
             raise HTTPException(status_code=s.HTTP_404_NOT_FOUND, detail="User does not have a company registered")
 
-        if company_data.logo_file:
-            if company_data.logo_file.content_type not in ALLOWED_IMAGE_TYPES:
-                raise HTTPException(status_code=s.HTTP_400_BAD_REQUEST, detail=f"Incorrect image type")
-            logo_url = await self._storage_service.upload_file(company_data.logo_file, 'logos')
+        logo_url = await self._storage_service.store_image(
+            UploadFolder.LOGOS.value, user.id, company_data.logo_file, company_data.logo_path
+        )
+        replaced = []
+        if logo_url:
+            variants = self._storage_service.variant_urls(logo_url)
             company_data.logo_url = logo_url
-            company_data.logo_file = None
-
-            await self._storage_service.delete_file(company.logo_url)
+            company_data.logo_thumb_url = variants["thumb"]
+            company_data.logo_medium_url = variants["medium"]
+            replaced = [company.logo_url, company.logo_thumb_url, company.logo_medium_url]
+        company_data.logo_file = company_data.logo_path = None
 
         company_data.status = Status.WAITING
 
-        company = await self._company_repository.update(company.id, company_data.to_payload(exclude_none=True))
+        async with self._uow:
+            self._uow.after_commit(partial(self._storage_cleanup.enqueue, replaced))
+            company = await self._company_repository.update(company.id, company_data.to_payload(exclude_none=True))
 
         return company.to_payload(exclude_none=True)
 
-    async def delete_company(self, user: UserDTO) -> Dict:
+    async def delete_company(self, user: UserDTO, response: Response) -> Dict:
         company = await self._company_repository.get_by_user_id(user.id)
 
         if not company:
             raise HTTPException(status_code=s.HTTP_404_NOT_FOUND, detail="Company not found")
 
-        await self._storage_service.delete_file(company.logo_url)
+        async with self._uow:
+            self._uow.after_commit(partial(
+                self._storage_cleanup.enqueue, [company.logo_url, company.logo_thumb_url, company.logo_medium_url]
+            ))
+            await self._company_repository.delete(company.id)
 
-        await self._company_repository.delete(company.id)
+            updated_user = await self._user_repository.update(user_id=user.id, user_data={"role": UserRoles.PASSENGER})
 
-        await self._user_repository.update(user_id=user.id, user_data={"role": UserRoles.PASSENGER})
+        await self._token_issuer.issue(updated_user, response)
 
         return {
             "detail": "Company deleted successfully",
@@ -136,26 +169,54 @@ class CompanyController(ICompanyController):
         if not company:
             raise HTTPException(status_code=s.HTTP_404_NOT_FOUND, detail="Company not found")
 
-        driver = await self._driver_repository.get_by_id(driver_company_data.driver_id)
+        if driver_company_data.status == Status.REJECTED and not driver_company_data.rejection_reason:
+            raise HTTPException(status_code=s.HTTP_400_BAD_REQUEST, detail="Can not update status to rejected without rejection reason")
 
-        if not driver:
-            raise HTTPException(status_code=s.HTTP_404_NOT_FOUND, detail="Driver profile not found")
+        updated = await self._driver_company_repository.update_status(
+            driver_id=driver_company_data.driver_id,
+            company_id=company.id,
+            status=driver_company_data.status,
+            rejection_reason=driver_company_data.rejection_reason,
+        )
 
-        application = await self._driver_company_repository.get_by_id(driver_id=driver.id, company_id=company.id)
+        if not updated:
+            application = await self._driver_company_repository.get_by_id(driver_id=driver_company_data.driver_id, company_id=company.id)
 
-        if not application:
-            raise HTTPException(status_code=s.HTTP_404_NOT_FOUND, detail="Drivers application for this company not found")
+            if not application:
+                raise HTTPException(status_code=s.HTTP_404_NOT_FOUND, detail="Drivers application for this company not found")
 
-        if not driver_company_data.status in ALLOWED_STATUS_TRANSITIONS.get(application.status):
             raise HTTPException(status_code=s.HTTP_400_BAD_REQUEST, detail=f"Can not update status from {application.status} to {driver_company_data.status}")
 
-        if driver_company_data.status == Status.REJECTED and not driver_company_data.rejection_reason:
+        return {
+            "detail": "Application status updated successfully",
+        }
+
+    async def bulk_update_application_status(
+            self,
+            user: UserDTO,
+            driver_ids: List[int],
+            status: Status,
+            rejection_reason: Optional[str] = None,
+    ) -> Dict:
+        company = await self._company_repository.get_by_user_id(user.id)
+
+        if not company:
+            raise HTTPException(status_code=s.HTTP_404_NOT_FOUND, detail="Company not found")
+
+        if status == Status.REJECTED and not rejection_reason:
             raise HTTPException(status_code=s.HTTP_400_BAD_REQUEST, detail="Can not update status to rejected without rejection reason")
 
-        await self._driver_company_repository.update(driver_id=driver.id, company_id=company.id, driver_company_data=driver_company_data.to_payload(exclude_none=True))
+        results = await self._driver_company_repository.bulk_update_status(
+            company_id=company.id,
+            driver_ids=driver_ids,
+            status=status,
+            rejection_reason=rejection_reason,
+        )
 
         return {
-            "detail": "Application status updated successfully",
+            "detail": "Application statuses processed",
+            "updated": sum(1 for result in results if result.updated),
+            "items": [result.to_payload(exclude_none=True) for result in results],
         }
 
 
@@ -169,20 +230,45 @@ class AdminCompanyController(IAdminCompanyController):
         self._company_repository = company_repository
 
     async def update_company_status(self, company_data: CompanyDTO) -> Dict:
-        company = await self._company_repository.get_by_id(company_data.id)
+        if company_data.status == Status.REJECTED and not company_data.rejection_reason:
+            raise HTTPException(status_code=s.HTTP_400_BAD_REQUEST, detail="Can not update status to rejected without rejection reason")
 
-        if not company:
-            raise HTTPException(status_code=s.HTTP_404_NOT_FOUND, detail="Company not found")
+        updated = await self._company_repository.update_status(
+            company_id=company_data.id,
+            status=company_data.status,
+            rejection_reason=company_data.rejection_reason,
+        )
+
+        if not updated:
+            company = await self._company_repository.get_by_id(company_data.id)
+
+            if not company:
+                raise HTTPException(status_code=s.HTTP_404_NOT_FOUND, detail="Company not found")
 
-        if not company_data.status in ALLOWED_STATUS_TRANSITIONS.get(company.status):
             raise HTTPException(status_code=s.HTTP_400_BAD_REQUEST, detail=f"Can not update status from {company.status} to {company_data.status}")
 
-        if company_data.status == Status.REJECTED and not company_data.rejection_reason:
+        return {
+            "detail": f"Company {company_data.id} status updated successfully",
+        }
+
+    async def bulk_update_company_status(
+            self,
+            company_ids: List[int],
+            status: Status,
+            rejection_reason: Optional[str] = None,
+    ) -> Dict:
+        if status == Status.REJECTED and not rejection_reason:
             raise HTTPException(status_code=s.HTTP_400_BAD_REQUEST, detail="Can not update status to rejected without rejection reason")
 
-        await self._company_repository.update(company_data.id, company_data.to_payload(exclude_none=True))
+        results = await self._company_repository.bulk_update_status(
+            company_ids=company_ids,
+            status=status,
+            rejection_reason=rejection_reason,
+        )
 
         return {
-            "detail": f"Company {company_data.id} status updated successfully",
+            "detail": "Company statuses processed",
+            "updated": sum(1 for result in results if result.updated),
+            "items": [result.to_payload(exclude_none=True) for result in results],
         }
 
@@ -17,11 +17,14 @@ class CompanyDTO(BaseDTOMixin):
     description: Optional[str] = None
     address: Optional[str] = None
     logo_url: Optional[str] = None
+    logo_thumb_url: Optional[str] = None
+    logo_medium_url: Optional[str] = None
     status: Optional[Status] = None
     created_at: Optional[datetime] = None
     updated_at: Optional[datetime] = None
     rejection_reason: Optional[str] = None
     logo_file: Optional[UploadFile] = None
+    logo_path: Optional[str] = None
 
 @dataclass
 class PaginationCompanyDTO(BaseDTOMixin, PaginationDTO):
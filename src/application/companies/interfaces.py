@@ -1,22 +1,32 @@
 from abc import ABC, abstractmethod
 from typing import Dict, Any, Optional, List
 
+from fastapi import Response
+
 from src.application.companies.dtos import CompanyDTO, PaginationCompanyDTO
 from src.application.drivers.dtos import PaginationDriverCompanyDTO, DriverCompanyDTO
 from src.application.users.dtos import UserDTO
-from src.domain.enums import Status
+from src.domain.base_dto import BulkStatusResultDTO
+from src.domain.enums import Status, SearchMode
 
 # TODO: get_applications, update_application_status
 
 class ICompanyController(ABC):
     @abstractmethod
-    async def create_company(self, user: UserDTO, company_data: CompanyDTO) -> Dict: ...
+    async def create_company(self, user: UserDTO, company_data: CompanyDTO, response: Response) -> Dict: ...
 
     @abstractmethod
     async def get_my_company(self, user_id: int) -> Dict: ...
 
     @abstractmethod
-    async def search_companies(self, user: UserDTO, text: str, status: Optional[Status], pagination: PaginationCompanyDTO) -> Dict: ...
+    async def search_companies(
+            self,
+            user: UserDTO,
+            text: str,
+            status: Optional[Status],
+            pagination: PaginationCompanyDTO,
+            mode: SearchMode = SearchMode.CONTAINS,
+    ) -> Dict: ...
 
     @abstractmethod
     async def get_company_by_id(self, user: UserDTO, company_id: int) -> Dict: ...
@@ -25,7 +35,7 @@ class ICompanyController(ABC):
     async def update_company(self, user: UserDTO, company_data: CompanyDTO) -> Dict: ...
 
     @abstractmethod
-    async def delete_company(self, user: UserDTO) -> Dict: ...
+    async def delete_company(self, user: UserDTO, response: Response) -> Dict: ...
 
     @abstractmethod
     async def get_applications(self, user: UserDTO, status: Optional[Status], pagination: PaginationDriverCompanyDTO) -> Dict: ...
@@ -33,10 +43,27 @@ class ICompanyController(ABC):
     @abstractmethod
     async def update_application_status(self, user: UserDTO, driver_company_data: DriverCompanyDTO) -> Dict: ...
 
+    @abstractmethod
+    async def bulk_update_application_status(
+            self,
+            user: UserDTO,
+            driver_ids: List[int],
+            status: Status,
+            rejection_reason: Optional[str] = None,
+    ) -> Dict: ...
+
 class IAdminCompanyController(ABC):
     @abstractmethod
     async def update_company_status(self, company_data: CompanyDTO) -> Dict: ...
 
+    @abstractmethod
+    async def bulk_update_company_status(
+            self,
+            company_ids: List[int],
+            status: Status,
+            rejection_reason: Optional[str] = None,
+    ) -> Dict: ...
+
 class ICompanyRepository(ABC):
     @abstractmethod
     async def get_by_user_id(self, user_id: int) -> Optional[CompanyDTO]: ...
@@ -45,7 +72,13 @@ class ICompanyRepository(ABC):
     async def get_by_id(self, company_id: int) -> Optional[CompanyDTO]: ...
 
     @abstractmethod
-    async def get_by_query_and_status(self, text: str, status: str, pagination: Dict[str, Any]) -> PaginationCompanyDTO: ...
+    async def get_by_query_and_status(
+            self,
+            text: str,
+            pagination: Dict[str, Any],
+            status: Optional[Status] = None,
+            mode: SearchMode = SearchMode.CONTAINS,
+    ) -> PaginationCompanyDTO: ...
 
     @abstractmethod
     async def add(self, company_data: Dict[str, Any]) -> Optional[CompanyDTO]: ...
@@ -53,5 +86,21 @@ class ICompanyRepository(ABC):
     @abstractmethod
     async def update(self, company_id: int, company_data: Dict[str, Any]) -> Optional[CompanyDTO]: ...
 
+    @abstractmethod
+    async def update_status(
+            self,
+            company_id: int,
+            status: Status,
+            rejection_reason: Optional[str] = None,
+    ) -> Optional[CompanyDTO]: ...
+
+    @abstractmethod
+    async def bulk_update_status(
+            self,
+            company_ids: List[int],
+            status: Status,
+            rejection_reason: Optional[str] = None,
+    ) -> List[BulkStatusResultDTO]: ...
+
     @abstractmethod
     async def delete(self, company_id: int) -> Optional[bool]: ...
\ No newline at end of file
@@ -1,4 +1,4 @@
-from sqlalchemy import String, Integer, ForeignKey, Enum, Text
+from sqlalchemy import String, Integer, ForeignKey, Enum, Text, Index
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from src.application.drivers.models import driver_company_table
@@ -9,6 +9,23 @@ from src.domain.enums import Status
 
 class Company(Base, TimestampMixin):
     __tablename__ = "companies"
+    __table_args__ = (
+        Index("ix_companies_created_at_id", "created_at", "id"),
+        Index("ix_companies_status_created_at_id", "status", "created_at", "id"),
+        Index("ix_companies_name_id", "name", "id"),
+        Index(
+            "ix_companies_name_trgm",
+            "name",
+            postgresql_using="gin",
+            postgresql_ops={"name": "gin_trgm_ops"},
+        ),
+        Index(
+            "ix_companies_description_trgm",
+            "description",
+            postgresql_using="gin",
+            postgresql_ops={"description": "gin_trgm_ops"},
+        ),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
 
@@ -22,6 +39,8 @@ class Company(Base, TimestampMixin):
     description: Mapped[str] = mapped_column(String, nullable=False)
     address: Mapped[str] = mapped_column(String, nullable=False)
     logo_url: Mapped[str] = mapped_column(String, nullable=False)
+    logo_thumb_url: Mapped[str] = mapped_column(String, nullable=True)
+    logo_medium_url: Mapped[str] = mapped_column(String, nullable=True)
 
     status: Mapped[Status] = mapped_column(
         Enum(Status),
@@ -6,8 +6,16 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from src.application.companies.dtos import CompanyDTO, PaginationCompanyDTO
 from src.application.companies.interfaces import ICompanyRepository
 from src.application.companies.models import Company
-from src.domain.enums import Status
+from src.domain.base_dto import BulkStatusResultDTO
+from src.domain.enums import Status, SearchMode
 from src.domain.interfaces import IUoW
+from src.domain.value_objects import ALLOWED_PREVIOUS_STATUSES
+from src.infrastructure.dbs.moderation import bulk_update_status
+from src.infrastructure.dbs.pagination import fetch_page
+
+
+def _escape_like(text: str) -> str:
+    return text.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
 
 
 class CompanyRepository(ICompanyRepository):
@@ -28,41 +36,54 @@ class CompanyRepository(ICompanyRepository):
         return CompanyDTO().to_application(orm) if orm else None
 
     async def get_by_query_and_status(
-        self, text: str, pagination: Dict[str, Any], status: Optional[Status] = None
+        self,
+        text: str,
+        pagination: Dict[str, Any],
+        status: Optional[Status] = None,
+        mode: SearchMode = SearchMode.CONTAINS,
     ) -> PaginationCompanyDTO:
-
-        page = pagination.get("page", 1)
-        per_page = pagination.get("per_page", 10)
-
-        conditions = [
-            or_(
-                Company.name.ilike(f"%{text}%"),
-                Company.description.ilike(f"%{text}%")
-            ),
-        ]
+        text = (text or "").strip()
+        pattern = _escape_like(text)
+
+        conditions = []
+        order_by = (Company.created_at, Company.id)
+        ranking = None
+
+        if text and mode == SearchMode.PREFIX:
+            conditions.append(Company.name.ilike(f"{pattern}%", escape="\\"))
+            order_by = (Company.name, Company.id)
+        elif text:
+            conditions.append(
+                or_(
+                    Company.name.ilike(f"%{pattern}%", escape="\\"),
+                    Company.description.ilike(f"%{pattern}%", escape="\\"),
+                )
+            )
+            ranking = func.greatest(
+                func.similarity(Company.name, text),
+                func.word_similarity(text, Company.description),
+            )
 
         if status is not None:
             conditions.append(Company.status == status)
 
-        count_query = select(func.count(Company.id)).where(*conditions)
-        total = (await self._session.execute(count_query)).scalar_one()
-
-        query = (
-            select(Company)
-            .where(*conditions)
-            .offset((page - 1) * per_page)
-            .limit(per_page)
+        page = await fetch_page(
+            self._session,
+            select(Company),
+            order_by=order_by,
+            pagination=pagination,
+            conditions=conditions,
+            ranking=ranking,
         )
 
-        result = await self._session.execute(query)
-        orm_list = result.scalars().all()
-
-        items = [CompanyDTO().to_application(orm) for orm in orm_list]
+        items = [CompanyDTO().to_application(orm) for orm in page.rows]
 
         return PaginationCompanyDTO(
-            page=page,
-            per_page=per_page,
-            total=total,
+            page=page.page,
+            per_page=page.per_page,
+            total=page.total,
+            total_estimated=page.total_estimated,
+            next_cursor=page.next_cursor,
             items=items
         )
 
@@ -88,6 +109,42 @@ class CompanyRepository(ICompanyRepository):
             orm = result.scalar_one_or_none()
             return CompanyDTO.to_application(orm) if orm else None
 
+    async def update_status(
+            self,
+            company_id: int,
+            status: Status,
+            rejection_reason: Optional[str] = None,
+    ) -> Optional[CompanyDTO]:
+        async with self._uow:
+            query = (
+                update(Company)
+                .where(
+                    Company.id == company_id,
+                    Company.status.in_(ALLOWED_PREVIOUS_STATUSES[status]),
+                )
+                .values(status=status, rejection_reason=rejection_reason)
+                .returning(Company)
+            )
+            result = await self._session.execute(query)
+            orm = result.scalar_one_or_none()
+            return CompanyDTO.to_application(orm) if orm else None
+
+    async def bulk_update_status(
+            self,
+            company_ids: List[int],
+            status: Status,
+            rejection_reason: Optional[str] = None,
+    ) -> List[BulkStatusResultDTO]:
+        async with self._uow:
+            return await bulk_update_status(
+                self._session,
+                Company.__table__,
+                Company.__table__.c.id,
+                company_ids,
+                status,
+                rejection_reason,
+            )
+
     async def delete(self, company_id: int) -> Optional[bool]:
         async with self._uow:
             query = delete(Company).where(Company.id == company_id).returning(Company.id)
@@ -1,17 +1,20 @@
+import asyncio
+from functools import partial
 from datetime import datetime, timezone, timedelta
-from typing import Dict, Optional
+from typing import Dict, Optional, List, Tuple
 
 from fastapi import HTTPException, status as s
+from starlette.responses import Response
 
 from src.application.companies.interfaces import ICompanyRepository
-from src.application.drivers.dtos import DriverDTO, DriverCompanyDTO, PaginationDriverCompanyDTO, PaginationDriverDTO
+from src.application.drivers.dtos import DriverDTO, PaginationDriverCompanyDTO, PaginationDriverDTO
 from src.application.drivers.interfaces import IDriverController, IDriverRepository, IDriverCompanyRepository, \
     IAdminDriverController
 from src.application.users.dtos import UserDTO
-from src.application.users.interfaces import IUserRepository
-from src.domain.enums import UserRoles, Status
-from src.domain.interfaces import IStorageService
-from src.domain.value_objects import ALLOWED_IMAGE_TYPES, ALLOWED_STATUS_TRANSITIONS
+from src.application.users.interfaces import IUserRepository, ITokenIssuer
+from src.domain.enums import UserRoles, Status, UploadFolder
+from src.domain.interfaces import IStorageService, IUoW, IStorageCleanup
+from src.domain.value_objects import APPLICATION_COOLDOWN
 
 
 class DriverController(IDriverController):
@@ -22,14 +25,44 @@ class DriverController(IDriverController):
             user_repository: IUserRepository,
             company_repository: ICompanyRepository,
             storage_service: IStorageService,
+            storage_cleanup: IStorageCleanup,
+            token_issuer: ITokenIssuer,
+            uow: IUoW,
     ):
         self._driver_repository = driver_repository
         self._driver_company_repository = driver_company_repository
         self._user_repository = user_repository
         self._company_repository = company_repository
         self._storage_service = storage_service
+        self._storage_cleanup = storage_cleanup
+        self._token_issuer = token_issuer
+        self._uow = uow
+
+    async def _store_photos(self, user_id: int, driver_data: DriverDTO) -> Tuple[Optional[str], Optional[str]]:
+        """Store the ID and licence photos concurrently; on failure, remove whichever this call uploaded."""
+        photos = (
+            (UploadFolder.IDS.value, driver_data.id_photo_file, driver_data.id_photo_path),
+            (UploadFolder.LICENSES.value, driver_data.license_photo_file, driver_data.license_photo_path),
+        )
+        results = await asyncio.gather(
+            *(self._storage_service.store_image(folder, user_id, file, path) for folder, file, path in photos),
+            return_exceptions=True,
+        )
+
+        errors = [result for result in results if isinstance(result, BaseException)]
+        if errors:
+            uploaded = [
+                result for result, (_, _, path) in zip(results, photos)
+                if isinstance(result, str) and not path
+            ]
+            await self._storage_cleanup.enqueue(uploaded)
+            raise errors[0]
 
-    async def create_driver_profile(self, driver_data: DriverDTO, user: UserDTO) -> Dict:
+        driver_data.id_photo_file = driver_data.id_photo_path = None
+        driver_data.license_photo_file = driver_data.license_photo_path = None
+        return results[0], results[1]
+
+    async def create_driver_profile(self, driver_data: DriverDTO, user: UserDTO, response: Response) -> Dict:
         if not user.role == UserRoles.PASSENGER:
             raise HTTPException(status_code=s.HTTP_403_FORBIDDEN, detail="To create a driver profile you must to be passenger")
 
@@ -38,20 +71,19 @@ class DriverController(IDriverController):
         if driver:
             raise HTTPException(status_code=s.HTTP_409_CONFLICT, detail="Driver profile already exists")
 
-        if driver_data.id_photo_file.content_type not in ALLOWED_IMAGE_TYPES or driver_data.licence_photo_file.content_type not in ALLOWED_IMAGE_TYPES:
-            raise HTTPException(status_code=s.HTTP_400_BAD_REQUEST, detail=f"Incorrect image type")
+        if not (driver_data.id_photo_file or driver_data.id_photo_path) or \
+                not (driver_data.license_photo_file or driver_data.license_photo_path):
+            raise HTTPException(status_code=s.HTTP_400_BAD_REQUEST, detail="ID and license photos are required")
 
-        id_photo_url = await self._storage_service.upload_file(driver_data.id_photo_file, 'ids')
-        driver_data.id_photo_url = id_photo_url
-        driver_data.id_photo_file = None
+        driver_data.id_photo_url, driver_data.license_photo_url = await self._store_photos(user.id, driver_data)
 
-        license_photo_url = await self._storage_service.upload_file(driver_data.license_photo_file, 'licenses')
-        driver_data.license_photo_url = license_photo_url
-        driver_data.licence_photo_file = None
+        async with self._uow:
+            created = await self._driver_repository.add(driver_data.to_payload(exclude_none=True))
 
-        created = await self._driver_repository.add(driver_data.to_payload(exclude_none=True))
+            updated_user = await self._user_repository.update(user.id, {"role": UserRoles.DRIVER})
 
-        await self._user_repository.update(user.id, {"role": UserRoles.DRIVER})
+        # The role change revoked the caller's tokens.
+        await self._token_issuer.issue(updated_user, response)
 
         return {
             "detail": "Driver profile created successfully",
@@ -87,42 +119,38 @@ class DriverController(IDriverController):
         if not driver_profile:
             raise HTTPException(status_code=s.HTTP_404_NOT_FOUND, detail="Driver profile not found")
 
-        if driver_data.id_photo_file:
-            if driver_data.id_photo_file.content_type not in ALLOWED_IMAGE_TYPES:
-                raise HTTPException(status_code=s.HTTP_400_BAD_REQUEST, detail=f"Incorrect image type")
-            id_photo_url = await self._storage_service.upload_file(driver_data.id_photo_file, 'ids')
+        id_photo_url, license_photo_url = await self._store_photos(user.id, driver_data)
+        replaced = []
+        if id_photo_url:
             driver_data.id_photo_url = id_photo_url
-            driver_data.id_photo_file = None
-
-            await self._storage_service.delete_file(driver_profile.id_photo_url)
-
-        if driver_data.license_photo_file:
-            if driver_data.license_photo_file.content_type not in ALLOWED_IMAGE_TYPES:
-                raise HTTPException(status_code=s.HTTP_400_BAD_REQUEST, detail=f"Incorrect image type")
-            license_photo_url = await self._storage_service.upload_file(driver_data.license_photo_file, 'ids')
+            replaced.append(driver_profile.id_photo_url)
+        if license_photo_url:
             driver_data.license_photo_url = license_photo_url
-            driver_data.license_photo_file = None
-
-            await self._storage_service.delete_file(driver_profile.license_photo_url)
-
+            replaced.append(driver_profile.license_photo_url)
 
         driver_data.status = Status.WAITING
 
-        updated = await self._driver_repository.update(driver_profile.id, driver_data.to_payload(exclude_none=True))
+        async with self._uow:
+            self._uow.after_commit(partial(self._storage_cleanup.enqueue, replaced))
+            updated = await self._driver_repository.update(driver_profile.id, driver_data.to_payload(exclude_none=True))
 
         return updated.to_payload(exclude_none=True)
 
-    async def delete_my_driver_profile(self, user: UserDTO) -> Dict:
+    async def delete_my_driver_profile(self, user: UserDTO, response: Response) -> Dict:
         driver_profile = await self._driver_repository.get_by_user_id(user.id)
 
         if not driver_profile:
             raise HTTPException(status_code=s.HTTP_404_NOT_FOUND, detail="Driver profile not found")
 
-        await self._storage_service.delete_files([driver_profile.id_photo_url, driver_profile.license_photo_url])
+        async with self._uow:
+            self._uow.after_commit(partial(
+                self._storage_cleanup.enqueue, [driver_profile.id_photo_url, driver_profile.license_photo_url]
+            ))
+            await self._driver_repository.delete(driver_profile.id)
 
-        await self._driver_repository.delete(driver_profile.id)
+            updated_user = await self._user_repository.update(user_id=user.id, user_data={"role": UserRoles.PASSENGER})
 
-        await self._user_repository.update(user_id=user.id, user_data={"role": UserRoles.PASSENGER})
+        await self._token_issuer.issue(updated_user, response)
 
         return {
             "detail": "Driver profile deleted successfully",
@@ -134,45 +162,29 @@ class DriverController(IDriverController):
         if not driver:
             raise HTTPException(status_code=s.HTTP_404_NOT_FOUND, detail="Driver profile not found")
 
-        company = await self._company_repository.get_by_id(company_id)
-
-        if not company:
-            raise HTTPException(status_code=s.HTTP_404_NOT_FOUND, detail="Company not found")
-
-        application = await self._driver_company_repository.get_by_id(driver_id=driver.id, company_id=company_id)
-
-        if application:
-            now = datetime.now(timezone.utc)
-            limit = application.updated_at + timedelta(days=30)
-
-            if now < limit:
-                remaining = limit - now
-                days = remaining.days
-                hours, remainder = divmod(remaining.seconds, 3600)
-                minutes, _ = divmod(remainder, 60)
-
-                raise HTTPException(
-                    status_code=s.HTTP_409_CONFLICT,
-                    detail=f"You already applied to this company, try again in {days} days, {hours} hours, {minutes} minutes"
-                )
-
-            else:
-                application.status = Status.WAITING
-                application.rejection_reason = None
-
-                await self._driver_company_repository.update(
-                    driver_id=driver.id,
-                    company_id=company_id,
-                    driver_company_data=application.to_payload(exclude_none=True)
-                )
-        else:
-            data = DriverCompanyDTO(
+        async with self._uow:
+            application = await self._driver_company_repository.upsert_application(
                 driver_id=driver.id,
                 company_id=company_id,
-                status=Status.WAITING,
+                cooldown=APPLICATION_COOLDOWN,
+            )
+            # Same transaction on the primary: a replica may not have the conflicting row yet.
+            existing = None if application else await self._driver_company_repository.get_by_id(
+                driver_id=driver.id, company_id=company_id
             )
 
-            await self._driver_company_repository.add(data.to_payload(exclude_none=True))
+        if not application:
+            if not existing:
+                raise HTTPException(status_code=s.HTTP_409_CONFLICT, detail="You already applied to this company")
+            remaining = max(existing.updated_at + APPLICATION_COOLDOWN - datetime.now(timezone.utc), timedelta())
+            days = remaining.days
+            hours, remainder = divmod(remaining.seconds, 3600)
+            minutes, _ = divmod(remainder, 60)
+
+            raise HTTPException(
+                status_code=s.HTTP_409_CONFLICT,
+                detail=f"You already applied to this company, try again in {days} days, {hours} hours, {minutes} minutes"
+            )
 
         return {
             "detail": "Application added successfully",
@@ -206,19 +218,44 @@ class AdminDriverController(IAdminDriverController):
         return result.to_payload(exclude_none=True)
 
     async def update_driver_profile_status(self, driver_data: DriverDTO) -> Dict:
-        driver = await self._driver_repository.get_by_id(driver_data.id)
+        if driver_data.status == Status.REJECTED and not driver_data.rejection_reason:
+            raise HTTPException(status_code=s.HTTP_400_BAD_REQUEST, detail="Cannot status to rejected without rejection reason")
 
-        if not driver:
-            raise HTTPException(status_code=s.HTTP_404_NOT_FOUND, detail="Driver profile not found")
+        updated = await self._driver_repository.update_status(
+            driver_id=driver_data.id,
+            status=driver_data.status,
+            rejection_reason=driver_data.rejection_reason,
+        )
+
+        if not updated:
+            driver = await self._driver_repository.get_by_id(driver_data.id)
+
+            if not driver:
+                raise HTTPException(status_code=s.HTTP_404_NOT_FOUND, detail="Driver profile not found")
 
-        if not driver_data.status in ALLOWED_STATUS_TRANSITIONS.get(driver.status):
             raise HTTPException(status_code=s.HTTP_400_BAD_REQUEST, detail=f"Cannot change status from {driver.status} to {driver_data.status}")
 
-        if driver_data.status == Status.REJECTED and not driver_data.rejection_reason:
+        return {
+            "detail": "Driver profile status updated successfully",
+        }
+
+    async def bulk_update_driver_profile_status(
+            self,
+            driver_ids: List[int],
+            status: Status,
+            rejection_reason: Optional[str] = None,
+    ) -> Dict:
+        if status == Status.REJECTED and not rejection_reason:
             raise HTTPException(status_code=s.HTTP_400_BAD_REQUEST, detail="Cannot status to rejected without rejection reason")
 
-        await self._driver_repository.update(driver_id=driver.id, driver_data=driver.to_payload(exclude_none=True))
+        results = await self._driver_repository.bulk_update_status(
+            driver_ids=driver_ids,
+            status=status,
+            rejection_reason=rejection_reason,
+        )
 
         return {
-            "detail": "Driver profile status updated successfully",
+            "detail": "Driver profile statuses processed",
+            "updated": sum(1 for result in results if result.updated),
+            "items": [result.to_payload(exclude_none=True) for result in results],
         }
\ No newline at end of file
@@ -33,6 +33,8 @@ class DriverDTO(BaseDTOMixin):
     updated_at: Optional[datetime] = None
     id_photo_file: Optional[UploadFile] = None
     license_photo_file: Optional[UploadFile] = None
+    id_photo_path: Optional[str] = None
+    license_photo_path: Optional[str] = None
 
 @dataclass
 class PaginationDriverDTO(BaseDTOMixin, PaginationDTO):
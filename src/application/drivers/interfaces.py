@@ -1,13 +1,17 @@
 from abc import ABC, abstractmethod
-from typing import Any, Dict, Optional
+from datetime import timedelta
+from typing import Any, Dict, Optional, List
+
+from fastapi import Response
 
 from src.application.drivers.dtos import DriverDTO, DriverCompanyDTO, PaginationDriverDTO, PaginationDriverCompanyDTO
 from src.application.users.dtos import UserDTO
+from src.domain.base_dto import BulkStatusResultDTO
 from src.domain.enums import Status
 
 class IDriverController(ABC):
     @abstractmethod
-    async def create_driver_profile(self, driver_data: DriverDTO, user: UserDTO) -> Dict: ...
+    async def create_driver_profile(self, driver_data: DriverDTO, user: UserDTO, response: Response) -> Dict: ...
 
     @abstractmethod
     async def get_my_driver_profile(self, user_id: int) -> Dict: ...
@@ -19,7 +23,7 @@ class IDriverController(ABC):
     async def update_driver_profile(self, user: UserDTO, driver_data: DriverDTO) -> Dict: ...
 
     @abstractmethod
-    async def delete_my_driver_profile(self, user: UserDTO) -> Dict: ...
+    async def delete_my_driver_profile(self, user: UserDTO, response: Response) -> Dict: ...
 
     @abstractmethod
     async def add_application(self, user: UserDTO, company_id: int) -> Dict: ...
@@ -34,6 +38,14 @@ class IAdminDriverController(ABC):
     @abstractmethod
     async def update_driver_profile_status(self, driver_data: DriverDTO) -> Dict: ...
 
+    @abstractmethod
+    async def bulk_update_driver_profile_status(
+            self,
+            driver_ids: List[int],
+            status: Status,
+            rejection_reason: Optional[str] = None,
+    ) -> Dict: ...
+
 class IDriverRepository(ABC):
     @abstractmethod
     async def get_by_user_id(self, user_id: int) -> Optional[DriverDTO]: ...
@@ -50,6 +62,22 @@ class IDriverRepository(ABC):
     @abstractmethod
     async def update(self, driver_id: int, driver_data: Dict[str, Any]) -> Optional[DriverDTO]: ...
 
+    @abstractmethod
+    async def update_status(
+            self,
+            driver_id: int,
+            status: Status,
+            rejection_reason: Optional[str] = None,
+    ) -> Optional[DriverDTO]: ...
+
+    @abstractmethod
+    async def bulk_update_status(
+            self,
+            driver_ids: List[int],
+            status: Status,
+            rejection_reason: Optional[str] = None,
+    ) -> List[BulkStatusResultDTO]: ...
+
     @abstractmethod
     async def delete(self, driver_id: int) -> Optional[bool]: ...
 
@@ -69,6 +97,14 @@ class IDriverCompanyRepository(ABC):
     @abstractmethod
     async def add(self, driver_company_data: Dict[str, Any]) -> Optional[DriverCompanyDTO]: ...
 
+    @abstractmethod
+    async def upsert_application(
+            self,
+            driver_id: int,
+            company_id: int,
+            cooldown: timedelta,
+    ) -> Optional[DriverCompanyDTO]: ...
+
     @abstractmethod
     async def update(
             self,
@@ -77,5 +113,23 @@ class IDriverCompanyRepository(ABC):
             driver_company_data: Dict[str, Any]
     ) -> Optional[DriverCompanyDTO]: ...
 
+    @abstractmethod
+    async def update_status(
+            self,
+            driver_id: int,
+            company_id: int,
+            status: Status,
+            rejection_reason: Optional[str] = None,
+    ) -> Optional[DriverCompanyDTO]: ...
+
+    @abstractmethod
+    async def bulk_update_status(
+            self,
+            company_id: int,
+            driver_ids: List[int],
+            status: Status,
+            rejection_reason: Optional[str] = None,
+    ) -> List[BulkStatusResultDTO]: ...
+
     @abstractmethod
     async def delete(self, driver_id: int, company_id: int) -> Optional[bool]: ...
\ No newline at end of file
@@ -1,7 +1,7 @@
 from datetime import date
 
 from sqlalchemy.dialects.postgresql import ENUM as PGEnum
-from sqlalchemy import String, Integer, ForeignKey, Enum, Text, Table, Column, Date, DateTime, func
+from sqlalchemy import String, Integer, ForeignKey, Enum, Text, Table, Column, Date, DateTime, func, Index
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from src.infrastructure.dbs.postgre import Base
 from src.domain.base_model import TimestampMixin
@@ -9,7 +9,7 @@ from src.domain.enums import Status
 
 
 status_enum = PGEnum(
-    'APPROVED', 'REJECTED', 'WAITING',
+    Status,
     name='status',
     create_type=False
 )
@@ -23,10 +23,16 @@ driver_company_table = Table(
     Column("rejection_reason", Text, nullable=True, default=None),
     Column("created_at", DateTime(timezone=True), server_default=func.now(), nullable=False),
     Column("updated_at", DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False),
+    Index("ix_driver_company_company_id_created_at_driver_id", "company_id", "created_at", "driver_id"),
+    Index("ix_driver_company_driver_id_created_at_company_id", "driver_id", "created_at", "company_id"),
 )
 
 class Driver(Base, TimestampMixin):
     __tablename__ = "drivers"
+    __table_args__ = (
+        Index("ix_drivers_created_at_id", "created_at", "id"),
+        Index("ix_drivers_status_created_at_id", "status", "created_at", "id"),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
     user_id: Mapped[int] = mapped_column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, unique=True)
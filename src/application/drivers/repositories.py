@@ -1,14 +1,25 @@
+from datetime import timedelta
+
 from fastapi import HTTPException, status as s
 from sqlalchemy import select, insert, update, delete, func
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.application.drivers.dtos import DriverDTO, PaginationDriverDTO, PaginationDriverCompanyDTO, DriverCompanyDTO
 from src.application.drivers.interfaces import IDriverRepository, IDriverCompanyRepository
 from src.application.drivers.models import Driver, driver_company_table
+from src.domain.base_dto import BulkStatusResultDTO
 from src.domain.enums import Status
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, List
 
 from src.domain.interfaces import IUoW
+from src.domain.value_objects import ALLOWED_PREVIOUS_STATUSES
+from src.infrastructure.dbs.moderation import bulk_update_status
+from src.infrastructure.dbs.pagination import fetch_page
+
+FOREIGN_KEY_VIOLATION = "23503"
+COMPANY_FOREIGN_KEY = "driver_company_company_id_fkey"
 
 
 class DriverRepository(IDriverRepository):
@@ -29,24 +40,29 @@ class DriverRepository(IDriverRepository):
         return DriverDTO().to_application(orm) if orm else None
 
     async def get(self, status: Optional[Status], pagination: Dict[str, Any]) -> PaginationDriverDTO:
-        page = pagination.get("page", 1)
-        per_page = pagination.get("per_page", 10)
-
         conditions = []
 
         if status:
-            conditions.append(Driver.status == status.value)
-
-        count_query = select(func.count()).select_from(Driver).where(**conditions)
-        total = (await self._session.execute(count_query)).scalar_one()
-
-        query = select(Driver).where(**conditions).offset((page - 1) * per_page).limit(per_page)
-        result = await self._session.execute(query)
-        orm_list = result.scalars().all()
+            conditions.append(Driver.status == status)
+
+        page = await fetch_page(
+            self._session,
+            select(Driver),
+            order_by=(Driver.created_at, Driver.id),
+            pagination=pagination,
+            conditions=conditions,
+        )
 
-        items = [DriverDTO().to_application(orm) for orm in orm_list]
+        items = [DriverDTO().to_application(orm) for orm in page.rows]
 
-        return PaginationDriverDTO(page=page, per_page=per_page, total=total, items=items)
+        return PaginationDriverDTO(
+            page=page.page,
+            per_page=page.per_page,
+            total=page.total,
+            total_estimated=page.total_estimated,
+            next_cursor=page.next_cursor,
+            items=items,
+        )
 
     async def add(self, driver_data: Dict[str, Any]) -> Optional[DriverDTO]:
         async with self._uow:
@@ -65,6 +81,42 @@ class DriverRepository(IDriverRepository):
             orm = result.scalar_one_or_none()
             return DriverDTO.to_application(orm) if orm else None
 
+    async def update_status(
+            self,
+            driver_id: int,
+            status: Status,
+            rejection_reason: Optional[str] = None,
+    ) -> Optional[DriverDTO]:
+        async with self._uow:
+            query = (
+                update(Driver)
+                .where(
+                    Driver.id == driver_id,
+                    Driver.status.in_(ALLOWED_PREVIOUS_STATUSES[status]),
+                )
+                .values(status=status, rejection_reason=rejection_reason)
+                .returning(Driver)
+            )
+            result = await self._session.execute(query)
+            orm = result.scalar_one_or_none()
+            return DriverDTO.to_application(orm) if orm else None
+
+    async def bulk_update_status(
+            self,
+            driver_ids: List[int],
+            status: Status,
+            rejection_reason: Optional[str] = None,
+    ) -> List[BulkStatusResultDTO]:
+        async with self._uow:
+            return await bulk_update_status(
+                self._session,
+                Driver.__table__,
+                Driver.__table__.c.id,
+                driver_ids,
+                status,
+                rejection_reason,
+            )
+
     async def delete(self, driver_id: int) -> Optional[bool]:
         async with self._uow:
             query = delete(Driver).where(Driver.id == driver_id).returning(Driver.id)
@@ -84,8 +136,8 @@ class DriverCompanyRepository(IDriverCompanyRepository):
             driver_company_table.c.company_id == company_id
         )
         result = await self._session.execute(query)
-        orm = result.scalar_one_or_none()
-        return DriverCompanyDTO().to_application(orm) if orm else None
+        row = result.mappings().one_or_none()
+        return DriverCompanyDTO(**row) if row else None
 
     async def get(
             self,
@@ -95,9 +147,6 @@ class DriverCompanyRepository(IDriverCompanyRepository):
             pagination: Dict[str, Any]
     ) -> PaginationDriverCompanyDTO:
 
-        page = pagination.get("page", 1)
-        per_page = pagination.get("per_page", 10)
-
         conditions = []
 
         if driver_id:
@@ -110,30 +159,39 @@ class DriverCompanyRepository(IDriverCompanyRepository):
             raise HTTPException(status_code=s.HTTP_400_BAD_REQUEST, detail="Invalid request")
 
         if status:
-            conditions.append(driver_company_table.c.status == status.value)
+            conditions.append(driver_company_table.c.status == status)
 
-        count_stmt = (
-            select(func.count())
-            .select_from(driver_company_table)
-            .where(*conditions)
-        )
-        total = (await self._session.execute(count_stmt)).scalar_one()
+        # Lead with the filtered id so the keyset seek matches its composite index.
+        if company_id:
+            order_by = (
+                driver_company_table.c.company_id,
+                driver_company_table.c.created_at,
+                driver_company_table.c.driver_id,
+            )
+        else:
+            order_by = (
+                driver_company_table.c.driver_id,
+                driver_company_table.c.created_at,
+                driver_company_table.c.company_id,
+            )
 
-        stmt = (
-            select(driver_company_table)
-            .where(*conditions)
-            .offset((page - 1) * per_page)
-            .limit(per_page)
+        page = await fetch_page(
+            self._session,
+            select(driver_company_table),
+            order_by=order_by,
+            pagination=pagination,
+            conditions=conditions,
+            mappings=True,
         )
 
-        result = await self._session.execute(stmt)
-        rows = result.mappings().all()
-        items = [DriverCompanyDTO(**row) for row in rows]
+        items = [DriverCompanyDTO(**row) for row in page.rows]
 
         return PaginationDriverCompanyDTO(
-            page=page,
-            per_page=per_page,
-            total=total,
+            page=page.page,
+            per_page=page.per_page,
+            total=page.total,
+            total_estimated=page.total_estimated,
+            next_cursor=page.next_cursor,
             items=items
         )
     async def add(self, driver_company_data: Dict[str, Any]) -> Optional[DriverCompanyDTO]:
@@ -142,6 +200,42 @@ class DriverCompanyRepository(IDriverCompanyRepository):
             await self._session.execute(stmt)
             return DriverCompanyDTO(**driver_company_data)
 
+    async def upsert_application(
+            self,
+            driver_id: int,
+            company_id: int,
+            cooldown: timedelta,
+    ) -> Optional[DriverCompanyDTO]:
+        stmt = pg_insert(driver_company_table).values(
+            driver_id=driver_id,
+            company_id=company_id,
+            status=Status.WAITING,
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[driver_company_table.c.driver_id, driver_company_table.c.company_id],
+            set_={
+                "status": Status.WAITING,
+                "rejection_reason": None,
+                "updated_at": func.now(),
+            },
+            where=driver_company_table.c.updated_at < func.now() - cooldown,
+        ).returning(*driver_company_table.c)
+
+        try:
+            async with self._uow:
+                result = await self._session.execute(stmt)
+                row = result.mappings().one_or_none()
+        except IntegrityError as e:
+            cause = e.orig.__cause__
+            if (
+                getattr(e.orig, "sqlstate", None) == FOREIGN_KEY_VIOLATION
+                and getattr(cause, "constraint_name", None) == COMPANY_FOREIGN_KEY
+            ):
+                raise HTTPException(status_code=s.HTTP_404_NOT_FOUND, detail="Company not found")
+            raise
+
+        return DriverCompanyDTO(**row) if row else None
+
     async def update(
         self,
         driver_id: int,
@@ -164,6 +258,46 @@ class DriverCompanyRepository(IDriverCompanyRepository):
             await self._session.execute(stmt)
             return DriverCompanyDTO(driver_id=driver_id, company_id=company_id, **driver_company_data)
 
+    async def update_status(
+            self,
+            driver_id: int,
+            company_id: int,
+            status: Status,
+            rejection_reason: Optional[str] = None,
+    ) -> Optional[DriverCompanyDTO]:
+        async with self._uow:
+            stmt = (
+                update(driver_company_table)
+                .where(
+                    driver_company_table.c.driver_id == driver_id,
+                    driver_company_table.c.company_id == company_id,
+                    driver_company_table.c.status.in_(ALLOWED_PREVIOUS_STATUSES[status]),
+                )
+                .values(status=status, rejection_reason=rejection_reason)
+                .returning(*driver_company_table.c)
+            )
+            result = await self._session.execute(stmt)
+            row = result.mappings().one_or_none()
+            return DriverCompanyDTO(**row) if row else None
+
+    async def bulk_update_status(
+            self,
+            company_id: int,
+            driver_ids: List[int],
+            status: Status,
+            rejection_reason: Optional[str] = None,
+    ) -> List[BulkStatusResultDTO]:
+        async with self._uow:
+            return await bulk_update_status(
+                self._session,
+                driver_company_table,
+                driver_company_table.c.driver_id,
+                driver_ids,
+                status,
+                rejection_reason,
+                conditions=[driver_company_table.c.company_id == company_id],
+            )
+
     async def delete(self, driver_id: int, company_id: int) -> Optional[bool]:
         async with self._uow:
             stmt = delete(driver_company_table).where(
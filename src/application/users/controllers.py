@@ -1,13 +1,14 @@
-from typing import Dict
+from functools import partial
+from typing import AsyncIterator, Dict, Optional
 
 from fastapi import HTTPException, status as s
 from starlette.responses import Response
 
 from src.application.users.dtos import UserDTO
-from src.application.users.interfaces import IUserController, IUserRepository, IEmailOtpService
-from src.domain.enums import UserRoles
-from src.domain.interfaces import IJWTService, IHashService, IStorageService
-from src.domain.value_objects import ALLOWED_IMAGE_TYPES
+from src.application.users.interfaces import IUserController, IUserRepository, IEmailOtpService, \
+    ITokenIssuer
+from src.domain.enums import UserRoles, UploadFolder
+from src.domain.interfaces import IJWTService, IHashService, IStorageService, IStorageCleanup, IUoW
 
 
 class UserController(IUserController):
@@ -18,12 +19,18 @@ class UserController(IUserController):
             jwt_service: IJWTService,
             hash_service: IHashService,
             storage_service: IStorageService,
+            storage_cleanup: IStorageCleanup,
+            token_issuer: ITokenIssuer,
+            uow: IUoW,
     ):
         self._user_repository = user_repository
         self._email_otp_service = email_otp_service
         self._jwt_service = jwt_service
         self._hash_service = hash_service
         self._storage_service = storage_service
+        self._storage_cleanup = storage_cleanup
+        self._token_issuer = token_issuer
+        self._uow = uow
 
     async def send_otp(self, email: str) -> Dict:
         await self._email_otp_service.send_otp(email)
@@ -38,19 +45,11 @@ class UserController(IUserController):
 
         await self._email_otp_service.verify_otp(user_data.email, code)
 
-        user_data.password = self._hash_service.hash_password(user_data.password)
+        user_data.password = await self._hash_service.hash_password(user_data.password)
 
         created = await self._user_repository.add(user_data.to_payload(exclude_none=True))
 
-        payload = {
-            "user_id": created.id,
-        }
-
-        access_token = self._jwt_service.encode_token(data=payload)
-        refresh_token = self._jwt_service.encode_token(data=payload, is_access_token=False)
-
-        response.set_cookie(key="access_token", value=access_token, httponly=True)
-        response.set_cookie(key="refresh_token", value=refresh_token, httponly=True)
+        await self._token_issuer.issue(created, response)
 
         return {
             "detail": "OTP verified and user created successfully",
@@ -63,20 +62,16 @@ class UserController(IUserController):
         if user is None:
             raise HTTPException(status_code=s.HTTP_404_NOT_FOUND, detail=f"User with {user_data.email} not found")
 
-        password_check = self._hash_service.verify_password(user_data.password, user.password)
+        password_check = await self._hash_service.verify_password(user_data.password, user.password)
 
         if not password_check:
             raise HTTPException(status_code=s.HTTP_400_BAD_REQUEST, detail=f"Incorrect credentials")
 
-        payload = {
-            "user_id": user.id,
-        }
-
-        access_token = self._jwt_service.encode_token(data=payload)
-        refresh_token = self._jwt_service.encode_token(data=payload, is_access_token=False)
+        if self._hash_service.needs_rehash(user.password):
+            new_hash = await self._hash_service.hash_password(user_data.password)
+            await self._user_repository.update(user.id, {"password": new_hash})
 
-        response.set_cookie(key="access_token", value=access_token, httponly=True)
-        response.set_cookie(key="refresh_token", value=refresh_token, httponly=True)
+        await self._token_issuer.issue(user, response)
 
         return {
             "detail": "Logged in successfully",
@@ -96,13 +91,13 @@ class UserController(IUserController):
         return user.to_payload(exclude_none=True)
 
     async def change_password(self, user_data: UserDTO, code: str) -> Dict:
-        user = await self._user_repository.get_by_email(user_data.email)
+        user = await self._user_repository.get_by_email(user_data.email, use_primary=True)
         if user is None:
             raise HTTPException(status_code=s.HTTP_404_NOT_FOUND, detail=f"User with email {user_data.email} not found")
 
         await self._email_otp_service.verify_otp(user_data.email, code)
 
-        user_data.password = self._hash_service.hash_password(user_data.new_password)
+        user_data.password = await self._hash_service.hash_password(user_data.new_password)
         user_data.new_password = None
 
         await self._user_repository.update(user_id=user.id, user_data=user_data.to_payload(exclude_none=True))
@@ -114,40 +109,47 @@ class UserController(IUserController):
 
     async def update(self, user: UserDTO, user_data: UserDTO) -> Dict:
         if user_data.new_password:
-            check_password = self._hash_service.verify_password(user_data.password or "", user.password)
+            # The cached current user carries no password hash.
+            stored = await self._user_repository.get_by_id(user.id, use_primary=True)
+            if not stored:
+                raise HTTPException(status_code=s.HTTP_404_NOT_FOUND, detail="User not found")
+            check_password = await self._hash_service.verify_password(user_data.password or "", stored.password)
 
             if not check_password:
                 raise HTTPException(status_code=s.HTTP_400_BAD_REQUEST, detail=f"Incorrect password")
 
-            user_data.password = self._hash_service.hash_password(user_data.new_password)
+            user_data.password = await self._hash_service.hash_password(user_data.new_password)
             user_data.new_password = None
         else:
             user_data.password = None
             user_data.new_password = None
 
         no_ava = False
+        replaced = []
 
-        if user_data.avatar_file:
-            if user_data.avatar_file.content_type not in ALLOWED_IMAGE_TYPES:
-                raise HTTPException(status_code=s.HTTP_400_BAD_REQUEST, detail=f"Incorrect image type")
-
-            ava_url = await self._storage_service.upload_file(user_data.avatar_file, 'avatars')
+        if user_data.avatar_file or user_data.avatar_path:
+            ava_url = await self._storage_service.store_image(
+                UploadFolder.AVATARS.value, user.id, user_data.avatar_file, user_data.avatar_path
+            )
+            variants = self._storage_service.variant_urls(ava_url)
             user_data.avatar_url = ava_url
-            user_data.avatar_file = None
+            user_data.avatar_thumb_url = variants["thumb"]
+            user_data.avatar_medium_url = variants["medium"]
+            user_data.avatar_file = user_data.avatar_path = None
 
-            if user.avatar_url:
-                await self._storage_service.delete_file(user.avatar_url)
-        elif not user_data.avatar_url and not user_data.avatar_file:
-            if user.avatar_url:
-                await self._storage_service.delete_file(user.avatar_url)
+            replaced = [user.avatar_url, user.avatar_thumb_url, user.avatar_medium_url]
+        elif not user_data.avatar_url:
+            replaced = [user.avatar_url, user.avatar_thumb_url, user.avatar_medium_url]
             no_ava = True
 
         to_update = user_data.to_payload(exclude_none=True)
         if no_ava:
-            to_update["avatar_url"] = None
+            to_update.update(avatar_url=None, avatar_thumb_url=None, avatar_medium_url=None)
 
 
-        new_user = await self._user_repository.update(user.id, to_update)
+        async with self._uow:
+            self._uow.after_commit(partial(self._storage_cleanup.enqueue, replaced))
+            new_user = await self._user_repository.update(user.id, to_update)
 
         return new_user.to_payload(exclude_none=True)
 
@@ -158,17 +160,31 @@ class UserController(IUserController):
             "detail": "User deleted successfully",
         }
 
+    async def create_upload(self, user: UserDTO, folder: UploadFolder, content_type: str) -> Dict:
+        return await self._storage_service.create_upload(folder.value, user.id, content_type)
+
+    async def stream_upload(
+            self,
+            user: UserDTO,
+            folder: UploadFolder,
+            content_type: str,
+            content_length: Optional[int],
+            chunks: AsyncIterator[bytes],
+    ) -> Dict:
+        file_path = await self._storage_service.upload_stream(
+            chunks, folder.value, user.id, content_type, content_length
+        )
+        return {"file_path": file_path}
+
     async def refresh_token(self, refresh_token: str, response: Response) -> Dict:
         decode_token = self._jwt_service.decode_token(refresh_token)
-        payload = {
-            "user_id": decode_token.get("user_id"),
-        }
 
-        access_token = self._jwt_service.encode_token(data=payload)
-        refresh_token = self._jwt_service.encode_token(data=payload, is_access_token=False)
+        # Re-read the user so the new tokens carry the current role and version.
+        user = await self._user_repository.get_by_id(decode_token.get("user_id"))
+        if user is None:
+            raise HTTPException(status_code=s.HTTP_401_UNAUTHORIZED, detail="Invalid refresh token")
 
-        response.set_cookie(key="access_token", value=access_token, httponly=True)
-        response.set_cookie(key="refresh_token", value=refresh_token, httponly=True)
+        await self._token_issuer.issue(user, response)
 
         return {
             "detail": "Token updated successfully",
@@ -18,6 +18,9 @@ class UserDTO(BaseDTOMixin):
     new_password: Optional[str] = None
     role: Optional[UserRoles] = None
     avatar_url: Optional[str] = None
+    avatar_thumb_url: Optional[str] = None
+    avatar_medium_url: Optional[str] = None
+    avatar_path: Optional[str] = None
     created_at: Optional[datetime] = None
     updated_at: Optional[datetime] = None
     avatar_file: Optional[UploadFile] = None
\ No newline at end of file
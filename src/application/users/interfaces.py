@@ -1,9 +1,10 @@
 from abc import ABC, abstractmethod
-from typing import Dict, Any, Optional, Protocol
+from typing import Dict, Any, Optional, Protocol, AsyncIterator
 
 from fastapi import Response
 
 from src.application.users.dtos import UserDTO
+from src.domain.enums import UploadFolder
 
 
 class IUserController(ABC):
@@ -31,12 +32,25 @@ class IUserController(ABC):
     @abstractmethod
     async def refresh_token(self, refresh_token: str, response: Response) -> Dict: ...
 
+    @abstractmethod
+    async def create_upload(self, user: UserDTO, folder: UploadFolder, content_type: str) -> Dict: ...
+
+    @abstractmethod
+    async def stream_upload(
+            self,
+            user: UserDTO,
+            folder: UploadFolder,
+            content_type: str,
+            content_length: Optional[int],
+            chunks: AsyncIterator[bytes],
+    ) -> Dict: ...
+
 class IUserRepository(ABC):
     @abstractmethod
-    async def get_by_id(self, user_id: int) -> Optional[UserDTO]: ...
+    async def get_by_id(self, user_id: int, use_primary: bool = False) -> Optional[UserDTO]: ...
 
     @abstractmethod
-    async def get_by_email(self, email: str) -> Optional[UserDTO]: ...
+    async def get_by_email(self, email: str, use_primary: bool = False) -> Optional[UserDTO]: ...
 
     @abstractmethod
     async def add(self, user_data: Dict[str, Any]) -> Optional[UserDTO]: ...
@@ -50,4 +64,25 @@ class IUserRepository(ABC):
 class IEmailOtpService(Protocol):
     async def send_otp(self, email: str) -> None: ...
 
-    async def verify_otp(self, email: str, code: str) -> None: ...
\ No newline at end of file
+    async def verify_otp(self, email: str, code: str) -> None: ...
+
+class IUserCache(Protocol):
+    async def get(self, user_id: int) -> Optional[UserDTO]: ...
+
+    async def generation(self, user_id: int) -> Optional[str]: ...
+
+    async def set(self, user: UserDTO, generation: Optional[str]) -> None: ...
+
+    async def invalidate(self, user_id: int) -> None: ...
+
+
+class ITokenVersionService(Protocol):
+    async def get(self, user_id: int) -> Optional[int]: ...
+
+    async def current(self, user_id: int) -> Optional[int]: ...
+
+    async def bump(self, user_id: int) -> None: ...
+
+
+class ITokenIssuer(Protocol):
+    async def issue(self, user: UserDTO, response: Response) -> None: ...
@@ -16,6 +16,8 @@ class User(Base, TimestampMixin):
     password: Mapped[str] = mapped_column(String, nullable=False)
     role: Mapped[UserRoles] = mapped_column(Enum(UserRoles), nullable=False, default=UserRoles.PASSENGER)
     avatar_url: Mapped[str] = mapped_column(String, nullable=True)
+    avatar_thumb_url: Mapped[str] = mapped_column(String, nullable=True)
+    avatar_medium_url: Mapped[str] = mapped_column(String, nullable=True)
 
     company = relationship("Company", back_populates="owner", uselist=False, cascade="all, delete")
     driver = relationship("Driver", back_populates="user", uselist=False, cascade="all, delete")
\ No newline at end of file
@@ -1,28 +1,63 @@
+import logging
 from typing import Optional, Any, Dict
 
+from fastapi import HTTPException
 from sqlalchemy import select, insert, update, delete
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.application.users.dtos import UserDTO
-from src.application.users.interfaces import IUserRepository
+from src.application.users.interfaces import IUserRepository, IUserCache, ITokenVersionService
 from src.application.users.models import User
 from src.domain.interfaces import IUoW
+from src.infrastructure.dbs.postgre import primary_reads
+from src.infrastructure.metrics import metrics
+
+logger = logging.getLogger(__name__)
 
 
 class UserRepository(IUserRepository):
-    def __init__(self, session: AsyncSession, uow: IUoW):
+    def __init__(
+            self,
+            session: AsyncSession,
+            uow: IUoW,
+            user_cache: Optional[IUserCache] = None,
+            token_versions: Optional[ITokenVersionService] = None,
+    ):
         self._session = session
         self._uow = uow
+        self._user_cache = user_cache
+        self._token_versions = token_versions
+
+    async def _revoke_tokens(self, user_id: int) -> None:
+        # Runs before the commit: if revocation fails, the change is rolled back.
+        if self._token_versions is not None:
+            await self._token_versions.bump(user_id)
+
+    def _invalidate_after_commit(self, user_id: int, revoke_tokens: bool = False) -> None:
+        async def invalidate():
+            if self._user_cache is not None:
+                await self._user_cache.invalidate(user_id)
+            if revoke_tokens and self._token_versions is not None:
+                # Revoke tokens refreshed between the first bump and the commit.
+                try:
+                    await self._token_versions.bump(user_id)
+                except HTTPException:
+                    metrics.incr("token_version.post_commit_bump_failed")
+                    logger.warning("Could not re-revoke tokens of user %s after commit", user_id)
 
-    async def get_by_id(self, user_id: int) -> Optional[UserDTO]:
+        self._uow.after_commit(invalidate)
+
+    async def get_by_id(self, user_id: int, use_primary: bool = False) -> Optional[UserDTO]:
         query = select(User).where(User.id == user_id)
-        result = await self._session.execute(query)
+        with primary_reads(self._session, use_primary):
+            result = await self._session.execute(query)
         orm = result.scalar_one_or_none()
         return UserDTO.to_application(orm) if orm else None
 
-    async def get_by_email(self, email: str) -> Optional[UserDTO]:
+    async def get_by_email(self, email: str, use_primary: bool = False) -> Optional[UserDTO]:
         query = select(User).where(User.email == email)
-        result = await self._session.execute(query)
+        with primary_reads(self._session, use_primary):
+            result = await self._session.execute(query)
         orm = result.scalar_one_or_none()
         return UserDTO.to_application(orm) if orm else None
 
@@ -46,6 +81,9 @@ class UserRepository(IUserRepository):
             )
             result = await self._session.execute(query)
             orm = result.scalar_one_or_none()
+            if "role" in user_data:
+                await self._revoke_tokens(user_id)
+            self._invalidate_after_commit(user_id, revoke_tokens="role" in user_data)
             return UserDTO.to_application(orm) if orm else None
 
     async def delete(self, user_id: int) -> Optional[bool]:
@@ -53,4 +91,6 @@ class UserRepository(IUserRepository):
             query = delete(User).where(User.id == user_id).returning(User.id)
             result = await self._session.execute(query)
             delete_id = result.scalar_one_or_none()
-            return delete_id is not None
\ No newline at end of file
+            await self._revoke_tokens(user_id)
+            self._invalidate_after_commit(user_id, revoke_tokens=True)
+            return delete_id is not None
@@ -1,42 +1,310 @@
-import random
-import string
+import json
+import secrets
+import time
+from dataclasses import asdict
+from datetime import datetime
+from typing import Any, Dict, List, Optional
 
-from fastapi import HTTPException, status as s
-from redis.asyncio import Redis
+from fastapi import HTTPException, Response, status as s
+from redis.exceptions import RedisError
 
-from src.domain.interfaces import IEmailService
+from src.application.users.dtos import UserDTO
+from src.application.users.interfaces import ITokenVersionService
+from src.domain.enums import UserRoles
+from src.domain.interfaces import IEmailService, IJWTService
+from src.infrastructure.cache import TTLCache
+from src.infrastructure.dbs.redis import RedisConnection
+from src.infrastructure.metrics import metrics
+
+
+# Reserve the OTP slot if none is pending, else return the pending code's TTL.
+ISSUE_OTP_SCRIPT = """
+if redis.call('SET', KEYS[1], ARGV[1], 'NX', 'EX', ARGV[2]) then
+    redis.call('DEL', KEYS[2])
+    return -1
+end
+return redis.call('TTL', KEYS[1])
+"""
+
+# 1 consumed, 0 mismatch, -1 no pending code, -2 mismatch that exhausted the attempts.
+VERIFY_OTP_SCRIPT = """
+local stored = redis.call('GET', KEYS[1])
+if not stored then
+    return -1
+end
+if stored == ARGV[1] then
+    redis.call('DEL', KEYS[1], KEYS[2])
+    return 1
+end
+local attempts = redis.call('INCR', KEYS[2])
+if attempts == 1 then
+    redis.call('EXPIRE', KEYS[2], math.max(redis.call('TTL', KEYS[1]), 1))
+end
+if attempts >= tonumber(ARGV[2]) then
+    redis.call('DEL', KEYS[1], KEYS[2])
+    return -2
+end
+return 0
+"""
+
+# Drop the code only if it is still the one we issued.
+RELEASE_OTP_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
 
 
 class EmailOtpService:
-    def __init__(self, email_service: IEmailService, redis: Redis, otp_ttl: int = 300):
+    def __init__(
+            self,
+            email_service: IEmailService,
+            redis: RedisConnection,
+            otp_ttl: int = 300,
+            max_attempts: int = 5,
+    ):
         self.email_service = email_service
         self.redis = redis
         self.otp_ttl = otp_ttl
+        self.max_attempts = max_attempts
+
+    @staticmethod
+    def _keys(email: str) -> List[str]:
+        # Hash-tagged by email so both keys share a cluster slot.
+        return [f"otp:{{{email}}}", f"otp_attempts:{{{email}}}"]
 
     async def send_otp(self, email: str) -> None:
-        redis_key = f"otp:{email}"
-        existed_key = await self.redis.get(redis_key)
-        if existed_key:
-            ttl = await self.redis.ttl(redis_key)
+        client = await self.redis.connect()
+        keys = self._keys(email)
+        otp = f"{secrets.randbelow(10 ** 6):06d}"
+
+        ttl = await client.eval(ISSUE_OTP_SCRIPT, len(keys), *keys, otp, self.otp_ttl)
+        if ttl != -1:
             raise HTTPException(
                 status_code=s.HTTP_400_BAD_REQUEST,
                 detail=f"OTP code already sent. Try again in {ttl} seconds."
             )
-        otp = ''.join(random.choices(string.digits, k=6))
-        await self.email_service.send_email(
-            to_email=email,
-            subject="Nomad Trip OTP Code",
-            body=f"OTP code: {otp}",
-        )
 
-        await self.redis.set(redis_key, ex=self.otp_ttl, value=otp)
-        print(await self.redis.get(redis_key))
+        try:
+            await self.email_service.send_email(
+                to_email=email,
+                subject="Nomad Trip OTP Code",
+                body=f"OTP code: {otp}",
+            )
+        except Exception:
+            await client.eval(RELEASE_OTP_SCRIPT, 1, keys[0], otp)
+            raise
 
     async def verify_otp(self, email: str, code: str) -> None:
-        redis_key = f"otp:{email}"
-        stored_otp = await self.redis.get(redis_key)
+        client = await self.redis.connect()
+        keys = self._keys(email)
 
-        if not stored_otp or stored_otp != code:
+        result = await client.eval(VERIFY_OTP_SCRIPT, len(keys), *keys, code, self.max_attempts)
+        if result == -2:
+            metrics.incr("otp.attempts_exhausted")
+            raise HTTPException(
+                status_code=s.HTTP_429_TOO_MANY_REQUESTS,
+                detail="Too many incorrect attempts. Request a new OTP code."
+            )
+        if result != 1:
             raise HTTPException(status_code=s.HTTP_404_NOT_FOUND, detail="Incorrect or expired OTP")
 
-        await self.redis.delete(redis_key)
+
+# Cache the user only if no invalidation happened since the caller read the generation.
+SET_USER_SCRIPT = """
+if (redis.call('GET', KEYS[2]) or '0') ~= ARGV[1] then
+    return 0
+end
+redis.call('SET', KEYS[1], ARGV[2], 'EX', ARGV[3])
+return 1
+"""
+
+
+class UserCacheService:
+    """Per-process TTL LRU in front of Redis; ``set`` skips rows loaded before a newer invalidation."""
+
+    CACHED_FIELDS = ("id", "first_name", "last_name", "email", "role",
+                     "avatar_url", "avatar_thumb_url", "avatar_medium_url", "created_at", "updated_at")
+
+    def __init__(
+            self,
+            redis: RedisConnection,
+            ttl: int = 300,
+            local_ttl: int = 5,
+            local_maxsize: int = 10_000,
+    ):
+        self.redis = redis
+        self.ttl = ttl
+        self._local: TTLCache[Dict[str, Any]] = TTLCache(ttl=local_ttl, maxsize=local_maxsize)
+
+    @staticmethod
+    def _key(user_id: int) -> str:
+        return f"user:{{{user_id}}}"
+
+    @staticmethod
+    def _generation_key(user_id: int) -> str:
+        return f"user:{{{user_id}}}:gen"
+
+    @classmethod
+    def _dump(cls, user: UserDTO) -> Dict[str, Any]:
+        data = {field: value for field, value in asdict(user).items() if field in cls.CACHED_FIELDS}
+        data["role"] = user.role.value if user.role else None
+        for field in ("created_at", "updated_at"):
+            data[field] = data[field].isoformat() if data[field] else None
+        return data
+
+    @staticmethod
+    def _load(data: Dict[str, Any]) -> UserDTO:
+        # Always build a fresh DTO: callers mutate the user they get back.
+        data = dict(data)
+        data["role"] = UserRoles(data["role"]) if data["role"] else None
+        for field in ("created_at", "updated_at"):
+            data[field] = datetime.fromisoformat(data[field]) if data[field] else None
+        return UserDTO(**data)
+
+    async def get(self, user_id: int) -> Optional[UserDTO]:
+        data = self._local.get(user_id)
+        if data is not None:
+            metrics.incr("user_cache.local.hit")
+            return self._load(data)
+
+        try:
+            client = await self.redis.connect()
+            raw = await client.get(self._key(user_id))
+        except RedisError:
+            metrics.incr("user_cache.redis.error")
+            raw = None
+
+        if raw is None:
+            metrics.incr("user_cache.miss")
+            return None
+
+        metrics.incr("user_cache.redis.hit")
+        data = json.loads(raw)
+        self._local.set(user_id, data)
+        return self._load(data)
+
+    async def generation(self, user_id: int) -> Optional[str]:
+        try:
+            client = await self.redis.connect()
+            return await client.get(self._generation_key(user_id)) or "0"
+        except RedisError:
+            metrics.incr("user_cache.redis.error")
+            return None
+
+    async def set(self, user: UserDTO, generation: Optional[str]) -> None:
+        data = self._dump(user)
+        if generation is None:
+            # Redis is down: only the short-lived local entry bounds staleness.
+            self._local.set(user.id, data)
+            return
+
+        try:
+            client = await self.redis.connect()
+            stored = await client.eval(
+                SET_USER_SCRIPT, 2, self._key(user.id), self._generation_key(user.id),
+                generation, json.dumps(data), self.ttl,
+            )
+        except RedisError:
+            metrics.incr("user_cache.redis.error")
+            return
+
+        if stored:
+            self._local.set(user.id, data)
+        else:
+            metrics.incr("user_cache.stale_set")
+
+    async def invalidate(self, user_id: int) -> None:
+        self._local.delete(user_id)
+        metrics.incr("user_cache.invalidations")
+        try:
+            async with self.redis.pipeline() as pipe:
+                pipe.delete(self._key(user_id))
+                pipe.incr(self._generation_key(user_id))
+                # Outlives any read that started before the bump.
+                pipe.expire(self._generation_key(user_id), self.ttl)
+                await pipe.execute()
+        except RedisError:
+            metrics.incr("user_cache.redis.error")
+
+
+# Microsecond timestamps that only move forward, so a flushed key never reuses a version.
+BUMP_TOKEN_VERSION_SCRIPT = """
+local version = tonumber(ARGV[1])
+local current = tonumber(redis.call('GET', KEYS[1]) or '0')
+if version <= current then
+    version = current + 1
+end
+redis.call('SET', KEYS[1], version)
+return version
+"""
+
+CURRENT_TOKEN_VERSION_SCRIPT = """
+redis.call('SET', KEYS[1], ARGV[1], 'NX')
+return redis.call('GET', KEYS[1])
+"""
+
+
+class TokenVersionService:
+    """Per-user ``ver`` claim: ``bump`` revokes older tokens, ``get`` returns None when unknown."""
+
+    def __init__(self, redis: RedisConnection):
+        self.redis = redis
+
+    @staticmethod
+    def _key(user_id: int) -> str:
+        return f"token_version:{user_id}"
+
+    async def get(self, user_id: int) -> Optional[int]:
+        try:
+            client = await self.redis.connect()
+            version = await client.get(self._key(user_id))
+        except RedisError:
+            metrics.incr("token_version.redis.error")
+            return None
+        return int(version) if version is not None else None
+
+    async def current(self, user_id: int) -> Optional[int]:
+        try:
+            client = await self.redis.connect()
+            version = await client.eval(CURRENT_TOKEN_VERSION_SCRIPT, 1, self._key(user_id), time.time_ns() // 1000)
+        except RedisError:
+            metrics.incr("token_version.redis.error")
+            return None
+        return int(version)
+
+    async def bump(self, user_id: int) -> None:
+        try:
+            client = await self.redis.connect()
+            await client.eval(BUMP_TOKEN_VERSION_SCRIPT, 1, self._key(user_id), time.time_ns() // 1000)
+        except RedisError:
+            metrics.incr("token_version.redis.error")
+            raise HTTPException(
+                status_code=s.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Could not revoke existing sessions, try again later",
+            )
+        metrics.incr("token_version.bumps")
+
+
+class TokenIssuer:
+    def __init__(self, jwt_service: IJWTService, token_versions: ITokenVersionService):
+        self._jwt_service = jwt_service
+        self._token_versions = token_versions
+
+    async def issue(self, user: UserDTO, response: Response) -> None:
+        payload = {
+            "user_id": user.id,
+        }
+
+        # Without a known version the token stays claim-less and guards fall back to the DB.
+        version = await self._token_versions.current(user.id)
+        if version is not None:
+            payload["role"] = user.role.value
+            payload["ver"] = version
+
+        access_token = self._jwt_service.encode_token(data=payload)
+        refresh_token = self._jwt_service.encode_token(data=payload, is_access_token=False)
+
+        response.set_cookie(key="access_token", value=access_token, httponly=True)
+        response.set_cookie(key="refresh_token", value=refresh_token, httponly=True)
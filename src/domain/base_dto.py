@@ -1,6 +1,8 @@
 from dataclasses import asdict, is_dataclass, dataclass
 from typing import Optional, Literal, List
 
+from src.domain.enums import CountMode, Status
+
 
 class BaseDTOMixin:
     @classmethod
@@ -30,4 +32,16 @@ class PaginationDTO:
     page: Optional[int] = None
     per_page: Optional[int] = None
     total: Optional[int] = None
-    items: Optional[List[BaseDTOMixin]] = None
\ No newline at end of file
+    total_estimated: Optional[bool] = None
+    count_mode: Optional[CountMode] = None
+    cursor: Optional[str] = None
+    next_cursor: Optional[str] = None
+    items: Optional[List[BaseDTOMixin]] = None
+
+
+@dataclass
+class BulkStatusResultDTO(BaseDTOMixin):
+    id: Optional[int] = None
+    updated: Optional[bool] = None
+    previous_status: Optional[Status] = None
+    detail: Optional[str] = None
\ No newline at end of file
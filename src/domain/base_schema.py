@@ -4,6 +4,9 @@ from typing import Any, Optional, Literal, List
 from fastapi import Form, Query
 from pydantic import BaseModel, Field
 
+from src.domain.enums import CountMode, Status
+from src.domain.value_objects import BULK_MODERATION_LIMIT
+
 
 class BaseSchema(BaseModel):
     @classmethod
@@ -63,4 +66,27 @@ class SortSchema(BaseSchema):
 class PaginationSchema(BaseSchema):
     page: int = 1
     per_page: int = 10
-    total: Optional[int] = None
\ No newline at end of file
+    total: Optional[int] = None
+    total_estimated: Optional[bool] = None
+    count_mode: Optional[CountMode] = None
+    cursor: Optional[str] = None
+    next_cursor: Optional[str] = None
+
+
+class BulkStatusUpdateSchema(BaseModel):
+    ids: List[int] = Field(min_length=1, max_length=BULK_MODERATION_LIMIT)
+    status: Status
+    rejection_reason: Optional[str] = None
+
+
+class BulkStatusResultSchema(BaseModel):
+    id: int
+    updated: bool
+    previous_status: Optional[Status] = None
+    detail: str
+
+
+class BulkStatusResponseSchema(BaseModel):
+    detail: str
+    updated: int
+    items: List[BulkStatusResultSchema]
\ No newline at end of file
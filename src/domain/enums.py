@@ -9,4 +9,22 @@ class UserRoles(str, Enum):
 class Status(str, Enum):
     APPROVED = "approved"
     REJECTED = "rejected"
-    WAITING = "waiting"
\ No newline at end of file
+    WAITING = "waiting"
+
+class CountMode(str, Enum):
+    EXACT = "exact"
+    WINDOW = "window"
+    CACHED = "cached"
+    ESTIMATE = "estimate"
+
+
+class SearchMode(str, Enum):
+    CONTAINS = "contains"
+    PREFIX = "prefix"
+
+
+class UploadFolder(str, Enum):
+    AVATARS = "avatars"
+    LOGOS = "logos"
+    IDS = "ids"
+    LICENSES = "licenses"
@@ -1,4 +1,4 @@
-from typing import Protocol, Optional, Any, List
+from typing import Protocol, Optional, Any, List, Callable, Awaitable, AsyncIterator, Dict, Sequence
 
 from fastapi import UploadFile
 
@@ -24,18 +24,50 @@ class IEmailService(Protocol):
     ) -> None: ...
 
 class IHashService(Protocol):
-    @staticmethod
-    def hash_password(password: str) -> str: ...
+    async def hash_password(self, password: str) -> str: ...
 
-    @staticmethod
-    def verify_password(password: str, hashed_password: str) -> bool: ...
+    async def verify_password(self, password: str, hashed_password: str) -> bool: ...
+
+    def needs_rehash(self, hashed_password: str) -> bool: ...
 
 class IUoW(Protocol):
-    ...
+    def after_commit(self, callback: Callable[[], Awaitable[None]]) -> None: ...
+
+    async def __aenter__(self) -> "IUoW": ...
+
+    async def __aexit__(self, exc_type, exc, tb) -> None: ...
+
+class IStorageCleanup(Protocol):
+    async def enqueue(self, file_paths: Sequence[Optional[str]]) -> None: ...
+
+    async def pin(self, path: str) -> bool: ...
 
 class IStorageService(Protocol):
     async def upload_file(self, file: UploadFile, folder: Optional[str] = None) -> str: ...
 
+    async def create_upload(self, folder: str, owner_id: int, content_type: str) -> dict: ...
+
+    async def confirm_upload(self, file_path: str, folder: str, owner_id: int) -> str: ...
+
+    async def store_image(
+        self,
+        folder: str,
+        owner_id: int,
+        file: Optional[UploadFile] = None,
+        file_path: Optional[str] = None,
+    ) -> Optional[str]: ...
+
+    def variant_urls(self, file_path: str) -> Dict[str, str]: ...
+
+    async def upload_stream(
+        self,
+        chunks: AsyncIterator[bytes],
+        folder: str,
+        owner_id: int,
+        content_type: str,
+        content_length: Optional[int] = None,
+    ) -> str: ...
+
     async def upload_files(self, files: List[UploadFile], folder: Optional[str] = None) -> List[str]: ...
 
     async def delete_file(self, file_path: str) -> None: ...
@@ -51,6 +51,17 @@ RESPONSE_405 = {
     }
 }
 
+RESPONSE_408 = {
+    "description": "Request Timeout",
+    "content": {
+        "application/json": {
+            "example": {
+                "detail": "Timed out waiting for the upload body"
+            }
+        }
+    }
+}
+
 RESPONSE_409 = {
     "description": "Conflict",
     "content": {
@@ -62,6 +73,28 @@ RESPONSE_409 = {
     }
 }
 
+RESPONSE_413 = {
+    "description": "Content Too Large",
+    "content": {
+        "application/json": {
+            "example": {
+                "detail": "File is larger than 10485760 bytes"
+            }
+        }
+    }
+}
+
+RESPONSE_429 = {
+    "description": "Too Many Requests",
+    "content": {
+        "application/json": {
+            "example": {
+                "detail": "Too many requests. Try again in 30 seconds."
+            }
+        }
+    }
+}
+
 RESPONSE_500 = {
     "description": "Internal Server Error",
     "content": {
@@ -1,9 +1,42 @@
-from src.domain.enums import Status
+from datetime import timedelta
+
+from src.domain.enums import Status, UploadFolder
 
 ALLOWED_IMAGE_TYPES = ["image/jpeg", "image/png", "image/webp", "image/gif"]
 
+MAX_IMAGE_SIZE = 10 * 1024 * 1024
+
+# Leading bytes of each allowed image type; WEBP is RIFF....WEBP, hence the offset.
+IMAGE_SIGNATURES = {
+    "image/jpeg": [(0, b"\xff\xd8\xff")],
+    "image/png": [(0, b"\x89PNG\r\n\x1a\n")],
+    "image/webp": [(0, b"RIFF"), (8, b"WEBP")],
+    "image/gif": [(0, b"GIF8")],
+}
+
+IMAGE_SIGNATURE_LENGTH = 12
+
+# WebP renditions generated on ingestion: name -> longest side in pixels.
+IMAGE_VARIANTS = {
+    "thumb": 160,
+    "medium": 640,
+}
+
+IMAGE_VARIANT_FOLDERS = {UploadFolder.AVATARS.value, UploadFolder.LOGOS.value}
+
+PRESIGNED_UPLOAD_TTL = timedelta(minutes=15)
+
 ALLOWED_STATUS_TRANSITIONS = {
     Status.WAITING: {Status.APPROVED, Status.REJECTED},
     Status.APPROVED: {Status.REJECTED},
     Status.REJECTED: {Status.APPROVED},
-}
\ No newline at end of file
+}
+
+ALLOWED_PREVIOUS_STATUSES = {
+    target: {source for source, targets in ALLOWED_STATUS_TRANSITIONS.items() if target in targets}
+    for target in Status
+}
+
+APPLICATION_COOLDOWN = timedelta(days=30)
+
+BULK_MODERATION_LIMIT = 500
\ No newline at end of file
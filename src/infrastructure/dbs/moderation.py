@@ -0,0 +1,75 @@
+from typing import List, Optional, Sequence
+
+from sqlalchemy import Integer, Table, column, select, update, values
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql.elements import ColumnElement
+
+from src.domain.base_dto import BulkStatusResultDTO
+from src.domain.enums import Status
+from src.domain.value_objects import ALLOWED_PREVIOUS_STATUSES
+
+
+async def bulk_update_status(
+        session: AsyncSession,
+        target: Table,
+        key: ColumnElement,
+        ids: Sequence[int],
+        status: Status,
+        rejection_reason: Optional[str] = None,
+        conditions: Sequence[ColumnElement] = (),
+) -> List[BulkStatusResultDTO]:
+    ids = list(dict.fromkeys(ids))
+    requested = select(
+        values(column("id", Integer), name="input_values").data([(item,) for item in ids])
+    ).cte("requested")
+
+    updated = (
+        update(target)
+        .where(
+            key == requested.c.id,
+            target.c.status.in_(ALLOWED_PREVIOUS_STATUSES[status]),
+            *conditions,
+        )
+        .values(status=status, rejection_reason=rejection_reason)
+        .returning(key.label("id"))
+        .cte("updated")
+    )
+
+    existing = select(key.label("id"), target.c.status).where(key.in_(ids), *conditions).subquery("existing")
+
+    query = (
+        select(
+            requested.c.id,
+            existing.c.status.label("previous_status"),
+            updated.c.id.is_not(None).label("updated"),
+        )
+        .select_from(requested)
+        .outerjoin(existing, existing.c.id == requested.c.id)
+        .outerjoin(updated, updated.c.id == requested.c.id)
+        .add_cte(updated)
+    )
+
+    result = await session.execute(query)
+    rows = {row["id"]: row for row in result.mappings().all()}
+
+    items = []
+    for item in ids:
+        row = rows.get(item)
+        applied = bool(row and row["updated"])
+        previous_status = row["previous_status"] if row else None
+        if applied:
+            detail = "Status updated"
+        elif previous_status is None:
+            detail = "Not found"
+        else:
+            detail = f"Can not update status from {previous_status} to {status}"
+
+        items.append(
+            BulkStatusResultDTO(
+                id=item,
+                updated=applied,
+                previous_status=previous_status,
+                detail=detail,
+            )
+        )
+    return items
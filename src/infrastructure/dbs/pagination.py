@@ -0,0 +1,189 @@
+import base64
+import binascii
+import json
+from dataclasses import dataclass
+from datetime import date, datetime
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple
+
+from fastapi import HTTPException, status as s
+from sqlalchemy import BigInteger, Select, cast, func, literal, select, tuple_
+from sqlalchemy.dialects.postgresql import REGCLASS
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql import column, table
+from sqlalchemy.sql.elements import ColumnElement
+
+from src.domain.enums import CountMode
+from src.infrastructure.cache import TTLCache
+from src.infrastructure.metrics import metrics
+
+TOTAL_LABEL = "_total"
+
+pg_class = table("pg_class", column("oid"), column("reltuples"))
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    raw = json.dumps(
+        [v.isoformat() if isinstance(v, (datetime, date)) else v for v in values],
+        separators=(",", ":"),
+    )
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, order_by: Sequence[ColumnElement]) -> List[Any]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        values = json.loads(raw)
+        if not isinstance(values, list) or len(values) != len(order_by):
+            raise ValueError("cursor length mismatch")
+
+        decoded = []
+        for column, value in zip(order_by, values):
+            python_type = column.type.python_type
+            if python_type is datetime:
+                value = datetime.fromisoformat(value)
+            elif python_type is date:
+                value = date.fromisoformat(value)
+            decoded.append(value)
+        return decoded
+    except (ValueError, TypeError, binascii.Error, NotImplementedError):
+        raise HTTPException(status_code=s.HTTP_400_BAD_REQUEST, detail="Invalid pagination cursor")
+
+
+def paginate(
+        query: Select,
+        order_by: Sequence[ColumnElement],
+        pagination: Dict[str, Any],
+) -> Tuple[Select, Optional[int], int]:
+    page = pagination.get("page", 1)
+    per_page = pagination.get("per_page", 10)
+    cursor = pagination.get("cursor")
+
+    query = query.order_by(*order_by).limit(per_page)
+
+    if cursor:
+        query = query.where(tuple_(*order_by) > tuple_(*decode_cursor(cursor, order_by)))
+        return query, None, per_page
+
+    return query.offset((page - 1) * per_page), page, per_page
+
+
+def next_cursor(rows: Sequence[Any], order_by: Sequence[ColumnElement], per_page: int) -> Optional[str]:
+    if not rows or len(rows) < per_page:
+        return None
+
+    last = rows[-1]
+    if isinstance(last, Mapping):
+        return encode_cursor([last[column.key] for column in order_by])
+    return encode_cursor([getattr(last, column.key) for column in order_by])
+
+
+class TotalCountCache(TTLCache[int]):
+    @staticmethod
+    def key(statement: Select) -> str:
+        compiled = statement.compile()
+        return f"{compiled}|{sorted(compiled.params.items(), key=lambda item: item[0])!r}"
+
+
+total_count_cache = TotalCountCache(ttl=30)
+
+
+@dataclass
+class Page:
+    rows: List[Any]
+    page: Optional[int]
+    per_page: int
+    total: Optional[int]
+    total_estimated: bool
+    next_cursor: Optional[str]
+
+
+def estimate_statement(target) -> Select:
+    return select(func.greatest(cast(pg_class.c.reltuples, BigInteger), 0)).where(
+        pg_class.c.oid == cast(literal(target.name), REGCLASS)
+    )
+
+
+async def fetch_page(
+        session: AsyncSession,
+        query: Select,
+        order_by: Sequence[ColumnElement],
+        pagination: Dict[str, Any],
+        conditions: Sequence[ColumnElement] = (),
+        mappings: bool = False,
+        ranking: Optional[ColumnElement] = None,
+) -> Page:
+    """Fetch one page plus its total; cursor pages skip the total unless ``count_mode`` asks for one."""
+    target = order_by[0].table
+    cursor = pagination.get("cursor")
+    mode = pagination.get("count_mode")
+    if mode is not None:
+        mode = CountMode(mode)
+    elif not cursor:
+        mode = CountMode.EXACT
+    count_stmt = select(func.count()).select_from(target).where(*conditions)
+
+    if mode == CountMode.ESTIMATE and conditions:
+        mode = CountMode.CACHED
+
+    total = None
+    total_estimated = False
+    total_stmt = None
+    query = query.where(*conditions)
+
+    if mode == CountMode.EXACT:
+        total = (await session.execute(count_stmt)).scalar_one()
+    elif mode == CountMode.CACHED:
+        key = TotalCountCache.key(count_stmt)
+        total = total_count_cache.get(key)
+        if total is None:
+            metrics.incr("pagination.count_cache.miss")
+            total = (await session.execute(count_stmt)).scalar_one()
+            total_count_cache.set(key, total)
+        else:
+            metrics.incr("pagination.count_cache.hit")
+            total_estimated = True
+    elif mode == CountMode.ESTIMATE:
+        total_stmt = estimate_statement(target)
+        total_estimated = True
+        query = query.add_columns(total_stmt.scalar_subquery().label(TOTAL_LABEL))
+    elif mode == CountMode.WINDOW and cursor:
+        total_stmt = count_stmt
+        query = query.add_columns(count_stmt.scalar_subquery().label(TOTAL_LABEL))
+    elif mode == CountMode.WINDOW:
+        total_stmt = count_stmt
+        query = query.add_columns(func.count().over().label(TOTAL_LABEL))
+
+    ranked = ranking is not None and not cursor
+    if ranked:
+        query = query.order_by(ranking.desc())
+
+    query, page, per_page = paginate(query, order_by, pagination)
+    result = await session.execute(query)
+
+    if mappings:
+        rows = [dict(row) for row in result.mappings().all()]
+        if total_stmt is not None:
+            for row in rows:
+                total = row.pop(TOTAL_LABEL)
+    elif total_stmt is not None:
+        fetched = result.all()
+        rows = [row[0] for row in fetched]
+        if fetched:
+            total = fetched[0][-1]
+    else:
+        rows = list(result.scalars().all())
+
+    if total_stmt is not None and not rows:
+        if page == 1 and mode == CountMode.WINDOW:
+            total = 0
+        else:
+            total = (await session.execute(total_stmt)).scalar_one_or_none() or 0
+
+    return Page(
+        rows=rows,
+        page=page,
+        per_page=per_page,
+        total=total,
+        total_estimated=total_estimated,
+        next_cursor=None if ranked else next_cursor(rows, order_by, per_page),
+    )
@@ -1,15 +1,116 @@
-from sqlalchemy import NullPool
+import time
+from contextlib import contextmanager
+from typing import Iterator, Literal, Optional
+
+from sqlalchemy import NullPool, Select, event
 from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
-from sqlalchemy.orm import DeclarativeBase
+from sqlalchemy.orm import DeclarativeBase, Session
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from src.infrastructure.metrics import metrics
+
+
+class InstrumentedQueuePool(AsyncAdaptedQueuePool):
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            metrics.observe("db.pool.wait", time.perf_counter() - started)
+
+
+def _register_pool_metrics(engine: AsyncEngine) -> None:
+    pool = engine.sync_engine.pool
+
+    @event.listens_for(pool, "connect")
+    def _on_connect(dbapi_connection, connection_record):
+        metrics.incr("db.pool.connects")
+
+    @event.listens_for(pool, "checkout")
+    def _on_checkout(dbapi_connection, connection_record, connection_proxy):
+        metrics.incr("db.pool.checkouts")
+        metrics.gauge("db.pool.checked_out", pool.checkedout())
+
+    @event.listens_for(pool, "checkin")
+    def _on_checkin(dbapi_connection, connection_record):
+        metrics.incr("db.pool.checkins")
+        metrics.gauge("db.pool.checked_out", pool.checkedout())
+
+
+def create_engine(
+        db_url: str,
+        echo: bool,
+        pool_mode: Literal["queue", "null"] = "queue",
+        pool_size: int = 10,
+        max_overflow: int = 10,
+        pool_pre_ping: bool = True,
+        pool_recycle: int = 1800,
+        pool_timeout: int = 30,
+) -> AsyncEngine:
+    if pool_mode == "null":
+        return create_async_engine(url=db_url, echo=echo, poolclass=NullPool)
+
+    engine = create_async_engine(
+        url=db_url,
+        echo=echo,
+        poolclass=InstrumentedQueuePool,
+        pool_size=pool_size,
+        max_overflow=max_overflow,
+        pool_pre_ping=pool_pre_ping,
+        pool_recycle=pool_recycle,
+        pool_timeout=pool_timeout,
+    )
+    _register_pool_metrics(engine)
+    return engine
+
+
+def create_replica_engine(db_url: Optional[str], echo: bool, **pool_options) -> Optional[AsyncEngine]:
+    if not db_url:
+        return None
+    return create_engine(db_url=db_url, echo=echo, **pool_options)
+
+
+class RoutingSession(Session):
+    """Sends plain SELECTs to the replica unless the session is pinned to the primary."""
+
+    def get_bind(self, mapper=None, clause=None, **kwargs):
+        replica: Optional[AsyncEngine] = self.info.get("replica_engine")
+
+        if (
+            replica is not None
+            and not self.info.get("use_primary")
+            and not self._flushing
+            and isinstance(clause, Select)
+            and clause._for_update_arg is None
+        ):
+            metrics.incr("db.session.replica_reads")
+            return replica.sync_engine
+
+        return super().get_bind(mapper=mapper, clause=clause, **kwargs)
 
 
-def create_engine(db_url: str, echo: bool) -> AsyncEngine:
-    return create_async_engine(url=db_url, echo=echo, poolclass=NullPool)
+@contextmanager
+def primary_reads(session: AsyncSession, enabled: bool = True) -> Iterator[AsyncSession]:
+    previous = session.info.get("use_primary", False)
+    session.info["use_primary"] = previous or enabled
+    try:
+        yield session
+    finally:
+        session.info["use_primary"] = previous
 
 
-def create_session_factory(engine: AsyncEngine) -> async_sessionmaker[AsyncSession]:
-    return async_sessionmaker(bind=engine, expire_on_commit=False, autoflush=False)
+def create_session_factory(
+        engine: AsyncEngine,
+        replica_engine: Optional[AsyncEngine] = None,
+) -> async_sessionmaker[AsyncSession]:
+    return async_sessionmaker(
+        bind=engine,
+        sync_session_class=RoutingSession,
+        info={"replica_engine": replica_engine},
+        expire_on_commit=False,
+        autoflush=False,
+    )
 
 
 class Base(DeclarativeBase):
-    ...
\ No newline at end of file
+    ...
@@ -1,9 +1,65 @@
 from __future__ import annotations
 
 import inspect
-from typing import Optional
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, List, Optional, Tuple, Union
+from urllib.parse import unquote, urlparse
 
 import redis.asyncio as redis
+from redis.asyncio.client import Pipeline
+from redis.asyncio.cluster import RedisCluster
+from redis.asyncio.sentinel import Sentinel
+from redis.utils import HIREDIS_AVAILABLE
+
+from src.infrastructure.metrics import metrics
+
+
+class _CommandMetrics:
+    async def execute_command(self, *args, **options):
+        started = time.perf_counter()
+        try:
+            return await super().execute_command(*args, **options)
+        finally:
+            metrics.observe(f"redis.cmd.{str(args[0]).lower()}", time.perf_counter() - started)
+
+
+class InstrumentedPipeline(Pipeline):
+    async def execute(self, raise_on_error: bool = True):
+        started = time.perf_counter()
+        try:
+            return await super().execute(raise_on_error=raise_on_error)
+        finally:
+            metrics.observe("redis.pipeline", time.perf_counter() - started)
+
+
+class InstrumentedRedis(_CommandMetrics, redis.Redis):
+    def pipeline(self, transaction: bool = True, shard_hint: Optional[str] = None) -> Pipeline:
+        return InstrumentedPipeline(self.connection_pool, self.response_callbacks, transaction, shard_hint)
+
+
+class InstrumentedRedisCluster(_CommandMetrics, RedisCluster):
+    ...
+
+
+RedisClient = Union[InstrumentedRedis, InstrumentedRedisCluster]
+
+
+def _sentinel_url(url: str) -> Tuple[List[Tuple[str, int]], str, int, Optional[str]]:
+    # redis+sentinel://[:password@]host1:26379,host2:26379/<service>[/<db>]
+    parsed = urlparse(url)
+    netloc = parsed.netloc.rsplit("@", 1)
+    password = unquote(netloc[0].split(":", 1)[-1]) if len(netloc) == 2 else None
+
+    sentinels = []
+    for node in netloc[-1].split(","):
+        host, _, port = node.partition(":")
+        sentinels.append((host, int(port or 26379)))
+
+    path = [part for part in parsed.path.split("/") if part]
+    if not path:
+        raise ValueError("Sentinel URL must name the master service: redis+sentinel://host:port/<service>")
+    return sentinels, path[0], int(path[1]) if len(path) > 1 else 0, password
 
 
 class RedisConnection:
@@ -14,21 +70,81 @@ class RedisConnection:
             db: int = 0,
             url: Optional[str] = None,
             decode_responses: bool = True,
+            max_connections: int = 50,
+            pool_timeout: float = 5,
+            socket_timeout: float = 5,
+            socket_connect_timeout: float = 5,
+            health_check_interval: int = 30,
     ):
         self.url = url or f"redis://{host}:{port}/{db}"
         self.decode_responses = decode_responses
-        self._client: Optional[redis.Redis] = None
+        self.max_connections = max_connections
+        self.pool_timeout = pool_timeout
+        self.socket_timeout = socket_timeout
+        self.socket_connect_timeout = socket_connect_timeout
+        self.health_check_interval = health_check_interval
+        self._client: Optional[RedisClient] = None
 
-    async def connect(self) -> redis.Redis:
-        if self._client is None:
-            self._client = redis.Redis.from_url(
-                self.url,
-                encoding="utf-8",
-                decode_responses=self.decode_responses,
+    def _options(self) -> dict:
+        return {
+            "encoding": "utf-8",
+            "decode_responses": self.decode_responses,
+            "socket_timeout": self.socket_timeout,
+            "socket_connect_timeout": self.socket_connect_timeout,
+            "health_check_interval": self.health_check_interval,
+            "retry_on_timeout": True,
+        }
+
+    def _create_client(self) -> RedisClient:
+        options = self._options()
+
+        if self.url.startswith("redis+sentinel://"):
+            sentinels, service, db, password = _sentinel_url(self.url)
+            sentinel = Sentinel(
+                sentinels,
+                sentinel_kwargs={"socket_timeout": self.socket_timeout, "password": password},
+                password=password,
+                db=db,
+                max_connections=self.max_connections,
+                **options,
             )
-            await self._client.ping()
+            return sentinel.master_for(service, redis_class=InstrumentedRedis)
+
+        if self.url.startswith("redis+cluster://"):
+            options.pop("health_check_interval")
+            options.pop("retry_on_timeout")
+            return InstrumentedRedisCluster.from_url(
+                self.url.replace("redis+cluster://", "redis://", 1),
+                max_connections=self.max_connections,
+                **options,
+            )
+
+        pool = redis.BlockingConnectionPool.from_url(
+            self.url,
+            max_connections=self.max_connections,
+            timeout=self.pool_timeout,
+            **options,
+        )
+        return InstrumentedRedis(connection_pool=pool)
+
+    async def connect(self) -> RedisClient:
+        if self._client is None:
+            client = self._client = self._create_client()
+            metrics.gauge("redis.hiredis", int(HIREDIS_AVAILABLE))
+            try:
+                await client.ping()
+            except Exception:
+                self._client = None
+                await client.aclose()
+                raise
         return self._client
 
+    @asynccontextmanager
+    async def pipeline(self, transaction: bool = True) -> AsyncIterator[Pipeline]:
+        client = await self.connect()
+        async with client.pipeline(transaction=transaction) as pipe:
+            yield pipe
+
     async def disconnect(self) -> None:
         if not self._client:
             return
@@ -49,8 +165,8 @@ class RedisConnection:
 
         self._client = None
 
-    async def __aenter__(self) -> redis.Redis:
+    async def __aenter__(self) -> RedisClient:
         return await self.connect()
 
     async def __aexit__(self, exc_type, exc, tb) -> None:
-        await self.disconnect()
\ No newline at end of file
+        await self.disconnect()
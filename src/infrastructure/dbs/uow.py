@@ -1,15 +1,34 @@
+from typing import Awaitable, Callable, List
+
 from sqlalchemy.ext.asyncio import AsyncSession
 
 
 class UoW:
+    """Nested blocks join the outermost one, which commits and then runs ``after_commit`` callbacks."""
+
     def __init__(self, session: AsyncSession):
         self._session = session
+        self._depth = 0
+        self._after_commit: List[Callable[[], Awaitable[None]]] = []
+
+    def after_commit(self, callback: Callable[[], Awaitable[None]]) -> None:
+        self._after_commit.append(callback)
 
     async def __aenter__(self):
+        self._session.info["use_primary"] = True
+        self._depth += 1
         return self
 
     async def __aexit__(self, exc_type, exc, tb):
-        if exc_type is None:
-            await self._session.commit()
-        else:
-            await self._session.rollback()
\ No newline at end of file
+        self._depth -= 1
+        if self._depth > 0:
+            return
+
+        callbacks, self._after_commit = self._after_commit, []
+        if exc_type is not None:
+            await self._session.rollback()
+            return
+
+        await self._session.commit()
+        for callback in callbacks:
+            await callback()
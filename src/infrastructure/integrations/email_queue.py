@@ -0,0 +1,203 @@
+import asyncio
+import json
+import logging
+import random
+import time
+import uuid
+from dataclasses import asdict, dataclass
+from typing import Any, Awaitable, Dict, List, Optional, Protocol, Sequence, Tuple
+
+from redis.exceptions import RedisError, ResponseError
+
+from src.infrastructure.dbs.redis import RedisConnection
+from src.infrastructure.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+# Requeue due retries; ZREM guards the XADD so two workers never requeue the same one.
+REQUEUE_DUE_SCRIPT = """
+local due = redis.call('ZRANGEBYSCORE', KEYS[1], '-inf', ARGV[1], 'LIMIT', 0, tonumber(ARGV[2]))
+local moved = 0
+for _, payload in ipairs(due) do
+    if redis.call('ZREM', KEYS[1], payload) == 1 then
+        redis.call('XADD', KEYS[2], 'MAXLEN', '~', ARGV[3], '*', 'payload', payload)
+        moved = moved + 1
+    end
+end
+return moved
+"""
+
+
+@dataclass
+class OutgoingEmail:
+    to_email: str
+    subject: str
+    body: str
+    html: bool = False
+
+
+class EmailSender(Protocol):
+    def send_batch(self, emails: Sequence[OutgoingEmail]) -> Awaitable[List[Optional[Exception]]]: ...
+
+
+class EmailQueue:
+    def __init__(self, redis: RedisConnection, prefix: str = "email", maxlen: int = 100_000):
+        self.redis = redis
+        self.stream = f"{{{prefix}}}:outbox"
+        self.retry_key = f"{{{prefix}}}:retry"
+        self.dead_letter_stream = f"{{{prefix}}}:dead"
+        self.maxlen = maxlen
+
+    async def enqueue(self, to_email: str, subject: str, body: str, html: bool = False) -> str:
+        message_ids = await self.enqueue_many([OutgoingEmail(to_email, subject, body, html)])
+        return message_ids[0]
+
+    async def enqueue_many(self, emails: Sequence[OutgoingEmail]) -> List[str]:
+        async with self.redis.pipeline(transaction=False) as pipe:
+            for email in emails:
+                payload = {"id": uuid.uuid4().hex, **asdict(email), "attempts": 0}
+                pipe.xadd(self.stream, {"payload": json.dumps(payload)}, maxlen=self.maxlen, approximate=True)
+            message_ids = await pipe.execute()
+        metrics.incr("email.enqueued", len(message_ids))
+        return message_ids
+
+
+class EmailWorker:
+    def __init__(
+            self,
+            queue: EmailQueue,
+            sender: EmailSender,
+            group: str = "email-workers",
+            consumer: Optional[str] = None,
+            batch_size: int = 50,
+            max_attempts: int = 5,
+            retry_base_delay: float = 2,
+            retry_max_delay: float = 300,
+            claim_idle: int = 60_000,
+            block: int = 5_000,
+    ):
+        self.queue = queue
+        self.sender = sender
+        self.group = group
+        self.consumer = consumer or f"worker-{uuid.uuid4().hex[:8]}"
+        self.batch_size = batch_size
+        self.max_attempts = max_attempts
+        self.retry_base_delay = retry_base_delay
+        self.retry_max_delay = retry_max_delay
+        self.claim_idle = claim_idle
+        self.block = block
+        self._stopping = asyncio.Event()
+
+    def stop(self) -> None:
+        self._stopping.set()
+
+    def backoff(self, attempts: int) -> float:
+        delay = min(self.retry_max_delay, self.retry_base_delay * 2 ** (attempts - 1))
+        return delay * random.uniform(0.5, 1.0)
+
+    async def ensure_group(self) -> None:
+        client = await self.queue.redis.connect()
+        try:
+            await client.xgroup_create(self.queue.stream, self.group, id="0", mkstream=True)
+        except ResponseError as e:
+            if "BUSYGROUP" not in str(e):
+                raise
+
+    async def requeue_due(self) -> int:
+        client = await self.queue.redis.connect()
+        return await client.eval(
+            REQUEUE_DUE_SCRIPT, 2, self.queue.retry_key, self.queue.stream,
+            time.time(), self.batch_size, self.queue.maxlen,
+        )
+
+    async def read_batch(self) -> List[Tuple[str, Dict[str, Any]]]:
+        client = await self.queue.redis.connect()
+
+        _, claimed, *_ = await client.xautoclaim(
+            self.queue.stream, self.group, self.consumer,
+            min_idle_time=self.claim_idle, start_id="0-0", count=self.batch_size,
+        )
+        # Entries deleted while pending come back as (id, None).
+        claimed = [(message_id, fields) for message_id, fields in claimed if fields]
+        if claimed:
+            return claimed
+
+        response = await client.xreadgroup(
+            self.group, self.consumer, {self.queue.stream: ">"}, count=self.batch_size, block=self.block
+        )
+        return response[0][1] if response else []
+
+    @staticmethod
+    def parse(fields: Dict[str, Any]) -> Tuple[Dict[str, Any], OutgoingEmail]:
+        try:
+            payload = json.loads(fields["payload"])
+            email = OutgoingEmail(
+                to_email=payload["to_email"],
+                subject=payload["subject"],
+                body=payload["body"],
+                html=payload["html"],
+            )
+            payload["attempts"] = int(payload["attempts"])
+        except (KeyError, TypeError, ValueError) as e:
+            raise ValueError(f"Malformed email payload: {e!r}")
+        return payload, email
+
+    async def handle_batch(self, messages: Sequence[Tuple[str, Dict[str, Any]]]) -> None:
+        valid = []
+        async with self.queue.redis.pipeline() as pipe:
+            for message_id, fields in messages:
+                try:
+                    valid.append((message_id, *self.parse(fields)))
+                except ValueError as e:
+                    # Retrying cannot fix it; keep the raw entry for inspection and move on.
+                    logger.error("Dead-lettering malformed email %s: %s", message_id, e)
+                    metrics.incr("email.malformed")
+                    pipe.xadd(self.queue.dead_letter_stream, {"payload": str(fields.get("payload")), "error": str(e)[:500]})
+                    pipe.xack(self.queue.stream, self.group, message_id)
+                    pipe.xdel(self.queue.stream, message_id)
+            if len(valid) < len(messages):
+                await pipe.execute()
+
+        if not valid:
+            return
+
+        with metrics.timer("email.send_batch"):
+            errors = await self.sender.send_batch([email for _, _, email in valid])
+
+        async with self.queue.redis.pipeline() as pipe:
+            for (message_id, payload, _), error in zip(valid, errors):
+                if error is None:
+                    metrics.incr("email.sent")
+                else:
+                    payload["attempts"] += 1
+                    payload["error"] = str(error)[:500]
+                    if payload["attempts"] >= self.max_attempts:
+                        logger.error("Dead-lettering email %s to %s: %s", payload["id"], payload["to_email"], error)
+                        metrics.incr("email.dead_lettered")
+                        pipe.xadd(self.queue.dead_letter_stream, {"payload": json.dumps(payload)})
+                    else:
+                        logger.warning("Email %s failed (attempt %s): %s", payload["id"], payload["attempts"], error)
+                        metrics.incr("email.retried")
+                        due = time.time() + self.backoff(payload["attempts"])
+                        pipe.zadd(self.queue.retry_key, {json.dumps(payload): due})
+                pipe.xack(self.queue.stream, self.group, message_id)
+                pipe.xdel(self.queue.stream, message_id)
+            await pipe.execute()
+
+    async def run(self) -> None:
+        await self.ensure_group()
+        logger.info("Email worker %s consuming %s", self.consumer, self.queue.stream)
+
+        while not self._stopping.is_set():
+            try:
+                await self.requeue_due()
+                messages = await self.read_batch()
+                if messages:
+                    await self.handle_batch(messages)
+            except RedisError as e:
+                logger.warning("Email worker Redis error: %s", e)
+                await asyncio.sleep(1)
+            except Exception:
+                # The batch stays pending and is reclaimed after claim_idle.
+                logger.exception("Email worker failed to handle a batch")
+                await asyncio.sleep(1)
@@ -1,20 +1,51 @@
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, List, Optional, Sequence
+
 import aiosmtplib
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 
 from fastapi import HTTPException
+from redis.exceptions import RedisError
 
+from src.infrastructure.integrations.email_queue import EmailQueue, OutgoingEmail
+from src.infrastructure.metrics import metrics
 
-class EmailService:
-    def __init__(self, smtp_host: str, smtp_port: int, username: str, password: str, from_email: str):
+
+class _PooledConnection:
+    def __init__(self, client: aiosmtplib.SMTP):
+        self.client = client
+        self.last_used = time.monotonic()
+
+
+class SMTPPool:
+    def __init__(
+            self,
+            smtp_host: str,
+            smtp_port: int,
+            username: str,
+            password: str,
+            from_email: str,
+            start_tls: Optional[bool] = True,
+            timeout: float = 30,
+            size: int = 4,
+            health_check_interval: float = 30,
+    ):
         self.smtp_host = smtp_host
         self.smtp_port = smtp_port
         self.username = username
         self.password = password
         self.from_email = from_email
+        self.start_tls = start_tls
+        self.timeout = timeout
+        self.size = size
+        self.health_check_interval = health_check_interval
+        self._idle: List[_PooledConnection] = []
+        self._slots: Optional[asyncio.Semaphore] = None
 
-    async def send_email(self, to_email: str, subject: str, body: str, html: bool = False):
-        """Асинхронная отправка письма."""
+    def build_message(self, to_email: str, subject: str, body: str, html: bool = False) -> MIMEMultipart:
         msg = MIMEMultipart("alternative")
         msg["From"] = self.from_email
         msg["To"] = to_email
@@ -22,16 +53,112 @@ class EmailService:
 
         mime_type = "html" if html else "plain"
         msg.attach(MIMEText(body, mime_type))
+        return msg
+
+    async def _open(self) -> aiosmtplib.SMTP:
+        client = aiosmtplib.SMTP(
+            hostname=self.smtp_host,
+            port=self.smtp_port,
+            username=self.username or None,
+            password=self.password or None,
+            start_tls=self.start_tls,
+            timeout=self.timeout,
+        )
+        await client.connect()
+        metrics.incr("smtp.connects")
+        return client
 
+    @staticmethod
+    def _discard(connection: _PooledConnection) -> None:
+        if connection.client.is_connected:
+            connection.client.close()
+
+    async def _healthy(self, connection: _PooledConnection) -> bool:
+        if not connection.client.is_connected:
+            return False
+        if time.monotonic() - connection.last_used < self.health_check_interval:
+            return True
         try:
-            await aiosmtplib.send(
-                msg,
-                hostname=self.smtp_host,
-                port=self.smtp_port,
-                start_tls=True,
-                username=self.username,
-                password=self.password,
-            )
-        except aiosmtplib.SMTPException as e:
-            raise HTTPException(status_code=500, detail=f"Email sending error: {e}")
+            await connection.client.noop()
+            return True
+        except aiosmtplib.SMTPException:
+            metrics.incr("smtp.health_check_failures")
+            return False
+
+    @asynccontextmanager
+    async def session(self) -> AsyncIterator[_PooledConnection]:
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.size)
+
+        async with self._slots:
+            connection = None
+            while self._idle and connection is None:
+                candidate = self._idle.pop()
+                if await self._healthy(candidate):
+                    connection = candidate
+                else:
+                    self._discard(candidate)
+            if connection is None:
+                connection = _PooledConnection(await self._open())
+
+            try:
+                yield connection
+            except BaseException:
+                self._discard(connection)
+                raise
+
+            connection.last_used = time.monotonic()
+            self._idle.append(connection)
 
+    async def _send_message(self, connection: _PooledConnection, email: OutgoingEmail) -> None:
+        msg = self.build_message(email.to_email, email.subject, email.body, email.html)
+        try:
+            await connection.client.send_message(msg)
+        except aiosmtplib.SMTPServerDisconnected:
+            metrics.incr("smtp.reconnects")
+            connection.client = await self._open()
+            await connection.client.send_message(msg)
+
+    async def send(self, to_email: str, subject: str, body: str, html: bool = False) -> None:
+        async with self.session() as connection:
+            await self._send_message(connection, OutgoingEmail(to_email, subject, body, html))
+
+    async def send_batch(self, emails: Sequence[OutgoingEmail]) -> List[Optional[Exception]]:
+        errors: List[Optional[Exception]] = []
+        try:
+            async with self.session() as connection:
+                for email in emails:
+                    try:
+                        await self._send_message(connection, email)
+                        errors.append(None)
+                    except (aiosmtplib.SMTPServerDisconnected, aiosmtplib.SMTPConnectError, OSError) as e:
+                        # The reconnect itself failed: the server is gone for the rest of the batch.
+                        errors.extend([e] * (len(emails) - len(errors)))
+                        break
+                    except aiosmtplib.SMTPException as e:
+                        errors.append(e)
+        except (aiosmtplib.SMTPException, OSError) as e:
+            errors.extend([e] * (len(emails) - len(errors)))
+        return errors
+
+    async def close(self) -> None:
+        idle, self._idle = self._idle, []
+        for connection in idle:
+            try:
+                await connection.client.quit()
+            except aiosmtplib.SMTPException:
+                self._discard(connection)
+
+
+class EmailService:
+    def __init__(self, queue: EmailQueue):
+        self.queue = queue
+
+    async def send_email(self, to_email: str, subject: str, body: str, html: bool = False):
+        await self.send_batch([OutgoingEmail(to_email=to_email, subject=subject, body=body, html=html)])
+
+    async def send_batch(self, emails: Sequence[OutgoingEmail]) -> None:
+        try:
+            await self.queue.enqueue_many(emails)
+        except RedisError as e:
+            raise HTTPException(status_code=500, detail=f"Email sending error: {e}")
@@ -1,17 +1,62 @@
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Optional, TypeVar
+
 import bcrypt
+from fastapi import HTTPException, status as s
+
+from src.infrastructure.metrics import metrics
+
+T = TypeVar("T")
+
 
 class HashService:
+    def __init__(self, rounds: int = 12, max_workers: int = 4, max_queue: int = 100):
+        self.rounds = rounds
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="bcrypt")
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._waiting = 0
+
+    async def _run(self, func: Callable[..., T], *args) -> T:
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.max_workers)
+
+        if self._slots.locked() and self._waiting >= self.max_queue:
+            metrics.incr("hash.rejected")
+            raise HTTPException(status_code=s.HTTP_503_SERVICE_UNAVAILABLE, detail="Server is busy, try again later")
+
+        self._waiting += 1
+        metrics.gauge("hash.queue_depth", self._waiting)
+        started = time.perf_counter()
+        try:
+            await self._slots.acquire()
+        finally:
+            self._waiting -= 1
+            metrics.gauge("hash.queue_depth", self._waiting)
+        metrics.observe("hash.queue_wait", time.perf_counter() - started)
+
+        try:
+            with metrics.timer("hash.duration"):
+                return await asyncio.get_running_loop().run_in_executor(self._executor, func, *args)
+        finally:
+            self._slots.release()
+
+    async def hash_password(self, password: str) -> str:
+        hashed = await self._run(bcrypt.hashpw, password.encode("utf-8"), bcrypt.gensalt(self.rounds))
+        return hashed.decode("utf-8")
+
+    async def verify_password(self, password: str, hashed_password: str) -> bool:
+        return await self._run(bcrypt.checkpw, password.encode("utf-8"), hashed_password.encode("utf-8"))
+
+    def needs_rehash(self, hashed_password: str) -> bool:
+        # "$2b$12$<salt+hash>": the second field is the cost factor.
+        try:
+            return int(hashed_password.split("$")[2]) != self.rounds
+        except (IndexError, ValueError):
+            return True
 
-    @staticmethod
-    def hash_password(password: str) -> str:
-        return bcrypt.hashpw(
-            password.encode("utf-8"),
-            bcrypt.gensalt(),
-        ).decode("utf-8")
-
-    @staticmethod
-    def verify_password(password: str, hashed_password: str) -> bool:
-        return bcrypt.checkpw(
-            password.encode("utf-8"),
-            hashed_password.encode("utf-8")
-        )
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False)
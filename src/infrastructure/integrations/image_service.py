@@ -0,0 +1,211 @@
+import asyncio
+import hashlib
+import io
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Optional, Tuple, TypeVar
+
+from fastapi import HTTPException, status as s
+from minio import Minio
+from minio.error import S3Error
+from PIL import Image, ImageOps, UnidentifiedImageError
+
+from src.domain.value_objects import IMAGE_SIGNATURE_LENGTH, IMAGE_VARIANTS
+from src.infrastructure.metrics import metrics
+
+IMAGE_FORMATS = {
+    "JPEG": "image/jpeg",
+    "PNG": "image/png",
+    "WEBP": "image/webp",
+    "GIF": "image/gif",
+}
+
+T = TypeVar("T")
+
+
+@dataclass(frozen=True)
+class StorageLocation:
+    """Bucket that pool workers read uploads from and write results to; picklable, unlike a client."""
+    endpoint: str
+    access_key: str
+    secret_key: str
+    bucket: str
+    secure: bool = False
+    region: str = "us-east-1"
+
+
+# One client per worker process and location.
+_clients: Dict[StorageLocation, Minio] = {}
+
+
+def _client(location: StorageLocation) -> Minio:
+    client = _clients.get(location)
+    if client is None:
+        client = _clients[location] = Minio(
+            endpoint=location.endpoint,
+            access_key=location.access_key,
+            secret_key=location.secret_key,
+            secure=location.secure,
+            region=location.region,
+        )
+    return client
+
+
+def variant_key(key: str, name: str) -> str:
+    return f"{os.path.splitext(key)[0]}.{name}.webp"
+
+
+@dataclass
+class ProcessedImage:
+    content_type: str
+    original: bytes
+    variants: Dict[str, bytes] = field(default_factory=dict)
+
+
+# Metadata Pillow would otherwise copy from ``Image.info`` into a re-encoded file.
+METADATA_KEYS = ("exif", "xmp", "XML:com.adobe.xmp", "comment", "extension")
+
+
+def _encode(image: Image.Image, image_format: str, **options) -> bytes:
+    buffer = io.BytesIO()
+    image.save(buffer, format=image_format, **options)
+    return buffer.getvalue()
+
+
+def _encode_frames(source: Image.Image, image_format: str, icc_profile: Optional[bytes]) -> bytes:
+    for key in METADATA_KEYS:
+        source.info.pop(key, None)
+    options = {"save_all": True, "loop": source.info.get("loop", 0)}
+    if image_format == "GIF":
+        options["comment"] = b""
+    else:
+        options["exif"] = b""
+        options["icc_profile"] = icc_profile
+    if image_format == "WEBP":
+        options.update(xmp=b"", quality=90)
+    return _encode(source, image_format, **options)
+
+
+def process_image(data: bytes, variant_sizes: Dict[str, int], max_pixels: int) -> ProcessedImage:
+    try:
+        with Image.open(io.BytesIO(data)) as source:
+            content_type = IMAGE_FORMATS.get(source.format)
+            if content_type is None:
+                raise ValueError(f"Unsupported image format: {source.format}")
+            if source.width * source.height > max_pixels:
+                raise ValueError("Image dimensions are too large")
+
+            source.load()
+            # Bake the EXIF orientation into the pixels before the EXIF block is dropped.
+            image = ImageOps.exif_transpose(source)
+            icc_profile = source.info.get("icc_profile")
+
+            if getattr(source, "is_animated", False) or source.format == "GIF":
+                original = _encode_frames(source, source.format, icc_profile)
+                source.seek(0)
+            elif source.format == "JPEG":
+                original = _encode(image, "JPEG", quality=90, optimize=True, icc_profile=icc_profile)
+            elif source.format == "PNG":
+                original = _encode(image, "PNG", optimize=True, icc_profile=icc_profile)
+            else:
+                original = _encode(image, "WEBP", quality=90, icc_profile=icc_profile)
+
+            variants = {}
+            if variant_sizes:
+                base = image.convert("RGBA" if image.has_transparency_data else "RGB")
+                for name, size in variant_sizes.items():
+                    variant = base.copy()
+                    variant.thumbnail((size, size), Image.Resampling.LANCZOS)
+                    variants[name] = _encode(variant, "WEBP", quality=80, method=4)
+    except (UnidentifiedImageError, Image.DecompressionBombError, OSError, SyntaxError):
+        raise ValueError("File is not a valid image")
+
+    return ProcessedImage(content_type=content_type, original=original, variants=variants)
+
+
+def digest_object(location: StorageLocation, key: str) -> Tuple[str, bytes]:
+    hasher = hashlib.sha256()
+    head = b""
+    try:
+        response = _client(location).get_object(location.bucket, key)
+        try:
+            for chunk in response.stream(64 * 1024):
+                if len(head) < IMAGE_SIGNATURE_LENGTH:
+                    head += chunk[:IMAGE_SIGNATURE_LENGTH - len(head)]
+                hasher.update(chunk)
+        finally:
+            response.close()
+            response.release_conn()
+    except S3Error as e:
+        # S3Error does not survive pickling back to the API process.
+        raise RuntimeError(f"MinIO read failed: {e}")
+    return hasher.hexdigest(), head
+
+
+def ingest_object(
+        location: StorageLocation,
+        source_key: str,
+        dest_key: str,
+        variant_sizes: Dict[str, int],
+        max_pixels: int,
+) -> str:
+    client = _client(location)
+    try:
+        response = client.get_object(location.bucket, source_key)
+        try:
+            data = response.read()
+        finally:
+            response.close()
+            response.release_conn()
+
+        processed = process_image(data, variant_sizes, max_pixels)
+        for name, blob in processed.variants.items():
+            client.put_object(location.bucket, variant_key(dest_key, name), io.BytesIO(blob), len(blob), "image/webp")
+        client.put_object(
+            location.bucket, dest_key, io.BytesIO(processed.original), len(processed.original), processed.content_type
+        )
+    except S3Error as e:
+        raise RuntimeError(f"MinIO ingestion failed: {e}")
+    return processed.content_type
+
+
+class ImageService:
+    def __init__(self, max_workers: int = 2, max_pixels: int = 40_000_000):
+        self.max_workers = max_workers
+        self.max_pixels = max_pixels
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    def _pool(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            # Spawned, not forked: the API process has running threads and an event loop.
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return self._executor
+
+    async def _run(self, operation: str, func: Callable[..., T], *args: Any) -> T:
+        try:
+            with metrics.timer(f"image.{operation}"):
+                return await asyncio.get_running_loop().run_in_executor(self._pool(), func, *args)
+        except ValueError as e:
+            metrics.incr("image.rejected")
+            raise HTTPException(status_code=s.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    async def process(self, data: bytes, with_variants: bool = False) -> ProcessedImage:
+        variant_sizes = IMAGE_VARIANTS if with_variants else {}
+        return await self._run("process", process_image, data, variant_sizes, self.max_pixels)
+
+    async def digest(self, location: StorageLocation, key: str) -> Tuple[str, bytes]:
+        return await self._run("digest", digest_object, location, key)
+
+    async def ingest(self, location: StorageLocation, source_key: str, dest_key: str, with_variants: bool = False) -> str:
+        variant_sizes = IMAGE_VARIANTS if with_variants else {}
+        return await self._run("ingest", ingest_object, location, source_key, dest_key, variant_sizes, self.max_pixels)
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
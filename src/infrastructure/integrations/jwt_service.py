@@ -1,14 +1,87 @@
+import hashlib
+import time
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Dict, Optional, Protocol, Type
 
 from fastapi import HTTPException, status
-from jose import jwt, JWTError, ExpiredSignatureError
+
+from src.infrastructure.cache import TTLCache
+from src.infrastructure.metrics import metrics
+
+
+class ExpiredTokenError(Exception):
+    ...
+
+
+class InvalidTokenError(Exception):
+    ...
+
+
+class JWTBackend(Protocol):
+    def encode(self, claims: dict, key: str, algorithm: str) -> str: ...
+
+    def decode(self, token: str, key: str, algorithm: str) -> dict: ...
+
+
+class JoseBackend:
+    def __init__(self):
+        from jose import jwt, JWTError, ExpiredSignatureError
+
+        self._jwt = jwt
+        self._error = JWTError
+        self._expired = ExpiredSignatureError
+
+    def encode(self, claims: dict, key: str, algorithm: str) -> str:
+        return self._jwt.encode(claims, key, algorithm=algorithm)
+
+    def decode(self, token: str, key: str, algorithm: str) -> dict:
+        try:
+            return self._jwt.decode(token, key, algorithms=[algorithm])
+        except self._expired:
+            raise ExpiredTokenError
+        except self._error:
+            raise InvalidTokenError
+
+
+class PyJWTBackend:
+    def __init__(self):
+        import jwt
+
+        self._jwt = jwt
+
+    def encode(self, claims: dict, key: str, algorithm: str) -> str:
+        return self._jwt.encode(claims, key, algorithm=algorithm)
+
+    def decode(self, token: str, key: str, algorithm: str) -> dict:
+        try:
+            return self._jwt.decode(token, key, algorithms=[algorithm])
+        except self._jwt.ExpiredSignatureError:
+            raise ExpiredTokenError
+        except self._jwt.InvalidTokenError:
+            raise InvalidTokenError
+
+
+JWT_BACKENDS: Dict[str, Type[JWTBackend]] = {
+    "jose": JoseBackend,
+    "pyjwt": PyJWTBackend,
+}
+
 
 class JWTService:
-    def __init__(self, secret_key: str, algorithm: str, access_token_expire_minutes: int):
+    def __init__(
+            self,
+            secret_key: str,
+            algorithm: str,
+            access_token_expire_minutes: int,
+            backend: str = "jose",
+            cache_size: int = 10_000,
+    ):
         self.secret_key = secret_key
         self.algorithm = algorithm
         self.access_token_expire_minutes = access_token_expire_minutes
+        self.backend = JWT_BACKENDS[backend]()
+        # Verified payloads keyed by token digest; each entry lives until the token's exp.
+        self._verified: Optional[TTLCache[dict]] = TTLCache(ttl=0, maxsize=cache_size) if cache_size else None
 
     def encode_token(self, data: dict, expires_delta: Optional[int] = None, is_access_token: bool = True) -> str:
         to_encode = data.copy()
@@ -17,20 +90,32 @@ class JWTService:
         else:
             expire = datetime.utcnow() + timedelta(minutes=expires_delta or self.access_token_expire_minutes * 24 * 7)
         to_encode.update({"exp": int(expire.timestamp())})
-        encoded_jwt = jwt.encode(to_encode, self.secret_key, algorithm=self.algorithm)
+        encoded_jwt = self.backend.encode(to_encode, self.secret_key, self.algorithm)
         return encoded_jwt
 
     def decode_token(self, token: str) -> dict:
+        digest = hashlib.sha256(token.encode("utf-8")).digest() if self._verified is not None else None
+        if digest is not None:
+            payload = self._verified.get(digest)
+            if payload is not None:
+                metrics.incr("jwt.cache.hit")
+                return dict(payload)
+            metrics.incr("jwt.cache.miss")
+
         try:
-            payload = jwt.decode(token, self.secret_key, algorithms=[self.algorithm])
-            return payload
-        except ExpiredSignatureError:
+            payload = self.backend.decode(token, self.secret_key, self.algorithm)
+        except ExpiredTokenError:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Token has expired",
             )
-        except JWTError:
+        except InvalidTokenError:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Invalid token",
-            )
\ No newline at end of file
+            )
+
+        ttl = payload.get("exp", 0) - time.time()
+        if digest is not None and ttl > 0:
+            self._verified.set(digest, dict(payload), ttl=ttl)
+        return payload
@@ -1,37 +1,425 @@
+import functools
+import hashlib
+import io
 import os
 import uuid
 import asyncio
-from typing import List, Optional
-from fastapi import UploadFile
+import mimetypes
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import Any, AsyncIterator, BinaryIO, Callable, Dict, List, Optional, Tuple, TypeVar
+from fastapi import HTTPException, UploadFile, status as s
 from minio import Minio
+from minio.datatypes import PostPolicy
+from minio.deleteobjects import DeleteObject
 from minio.error import S3Error
+import urllib3
+
+from src.domain.interfaces import IStorageCleanup
+from src.domain.value_objects import ALLOWED_IMAGE_TYPES, MAX_IMAGE_SIZE, PRESIGNED_UPLOAD_TTL, IMAGE_SIGNATURES, \
+    IMAGE_SIGNATURE_LENGTH, IMAGE_VARIANTS, IMAGE_VARIANT_FOLDERS
+from src.infrastructure.integrations.image_service import ImageService, StorageLocation, variant_key
+from src.infrastructure.metrics import metrics
+
+T = TypeVar("T")
+
+
+class StorageDeleteError(Exception):
+    def __init__(self, errors: Dict[str, str]):
+        self.errors = errors
+        super().__init__(f"Some files could not be deleted: {errors}")
+
+
+class _StreamReader:
+    def __init__(self, chunks: AsyncIterator[bytes], loop: asyncio.AbstractEventLoop, read_timeout: Optional[float] = None):
+        self._chunks = chunks
+        self._loop = loop
+        self._read_timeout = read_timeout
+        self._buffer = bytearray()
+        self._eof = False
+
+    async def _next_chunk(self) -> Optional[bytes]:
+        try:
+            return await asyncio.wait_for(self._chunks.__anext__(), self._read_timeout)
+        except StopAsyncIteration:
+            return None
+        except asyncio.TimeoutError:
+            metrics.incr("storage.stream.timeouts")
+            raise HTTPException(status_code=s.HTTP_408_REQUEST_TIMEOUT, detail="Timed out waiting for the upload body")
+
+    def read(self, size: int = -1) -> bytes:
+        while not self._eof and (size < 0 or len(self._buffer) < size):
+            chunk = asyncio.run_coroutine_threadsafe(self._next_chunk(), self._loop).result()
+            if chunk is None:
+                self._eof = True
+            else:
+                self._buffer += chunk
+
+        if size < 0 or size > len(self._buffer):
+            size = len(self._buffer)
+        data = bytes(self._buffer[:size])
+        del self._buffer[:size]
+        return data
+
+
+def _matches_signature(content_type: str, head: bytes) -> bool:
+    return all(head[offset:offset + len(magic)] == magic for offset, magic in IMAGE_SIGNATURES[content_type])
+
+
+def _image_extension(head: bytes) -> Optional[str]:
+    for content_type in IMAGE_SIGNATURES:
+        if _matches_signature(content_type, head):
+            return mimetypes.guess_extension(content_type) or ""
+    return None
 
 
 class MinioService:
-    def __init__(self, endpoint: str, access_key: str, secret_key: str, bucket: str):
+    def __init__(
+            self,
+            endpoint: str,
+            access_key: str,
+            secret_key: str,
+            bucket: str,
+            secure: bool = False,
+            pool_size: int = 16,
+            connect_timeout: float = 5,
+            read_timeout: float = 60,
+            max_retries: int = 3,
+            public_endpoint: Optional[str] = None,
+            region: str = "us-east-1",
+            upload_concurrency: int = 4,
+            part_size: int = 5 * 1024 * 1024,
+            stream_concurrency: int = 4,
+            stream_read_timeout: float = 30,
+            image_service: Optional[ImageService] = None,
+            content_addressed: bool = False,
+            cleanup: Optional[IStorageCleanup] = None,
+    ):
+        self._http_client = urllib3.PoolManager(
+            num_pools=2,
+            maxsize=pool_size,
+            block=True,
+            timeout=urllib3.Timeout(connect=connect_timeout, read=read_timeout),
+            retries=urllib3.Retry(total=max_retries, backoff_factor=0.2, status_forcelist=[500, 502, 503, 504]),
+        )
         self.client = Minio(
             endpoint=endpoint,
             access_key=access_key,
             secret_key=secret_key,
-            secure=False
+            secure=secure,
+            http_client=self._http_client,
+            region=region,
+        )
+        self._stream_http_client = urllib3.PoolManager(
+            num_pools=1,
+            maxsize=stream_concurrency,
+            block=True,
+            timeout=urllib3.Timeout(connect=connect_timeout, read=read_timeout),
+        )
+        self._stream_client = Minio(
+            endpoint=endpoint,
+            access_key=access_key,
+            secret_key=secret_key,
+            secure=secure,
+            http_client=self._stream_http_client,
+            region=region,
+        )
+        # Presigned URLs are signed for the host clients will actually reach.
+        self.public_endpoint = public_endpoint or endpoint
+        self.secure = secure
+        self._signer = Minio(
+            endpoint=self.public_endpoint,
+            access_key=access_key,
+            secret_key=secret_key,
+            secure=secure,
+            region=region,
         )
         self.bucket = bucket
+        self.location = StorageLocation(endpoint, access_key, secret_key, bucket, secure, region)
+        self.upload_concurrency = upload_concurrency
+        self.part_size = part_size
+        self.images = image_service or ImageService()
+        # Shared keys are only deleted through the reference-checked cleanup queue.
+        if content_addressed and cleanup is None:
+            raise ValueError("Content-addressed storage needs the cleanup queue")
+        self.content_addressed = content_addressed
+        self.cleanup = cleanup
+        self.stream_read_timeout = stream_read_timeout
+        self._executor = ThreadPoolExecutor(max_workers=pool_size, thread_name_prefix="minio")
+        self._stream_executor = ThreadPoolExecutor(max_workers=stream_concurrency, thread_name_prefix="minio-stream")
+
+    async def _call(
+            self,
+            operation: str,
+            func: Callable[..., T],
+            *args: Any,
+            executor: Optional[ThreadPoolExecutor] = None,
+    ) -> T:
+        with metrics.timer(f"storage.{operation}"):
+            return await asyncio.get_running_loop().run_in_executor(executor or self._executor, func, *args)
+
+    async def ensure_bucket(self) -> None:
+        if not await self._call("bucket_exists", self.client.bucket_exists, self.bucket):
+            await self._call("make_bucket", self.client.make_bucket, self.bucket)
+
+    def _key(self, file_path: str) -> str:
+        if file_path.startswith(f"/{self.bucket}/"):
+            return file_path[len(self.bucket) + 2:]
+        return file_path
+
+    async def create_upload(self, folder: str, owner_id: int, content_type: str) -> dict:
+        if content_type not in ALLOWED_IMAGE_TYPES:
+            raise HTTPException(status_code=s.HTTP_400_BAD_REQUEST, detail="Incorrect image type")
+
+        ext = mimetypes.guess_extension(content_type) or ""
+        key = f"{folder}/{owner_id}/{uuid.uuid4().hex}{ext}"
+        expires_at = datetime.now(timezone.utc) + PRESIGNED_UPLOAD_TTL
+
+        policy = PostPolicy(self.bucket, expires_at)
+        policy.add_equals_condition("key", key)
+        policy.add_equals_condition("Content-Type", content_type)
+        policy.add_content_length_range_condition(1, MAX_IMAGE_SIZE)
+
+        fields = self._signer.presigned_post_policy(policy)
+        put_url = self._signer.presigned_put_object(self.bucket, key, expires=PRESIGNED_UPLOAD_TTL)
+        scheme = "https" if self.secure else "http"
+
+        return {
+            "file_path": f"/{self.bucket}/{key}",
+            "post_url": f"{scheme}://{self.public_endpoint}/{self.bucket}",
+            "post_fields": {**fields, "key": key, "Content-Type": content_type},
+            "put_url": put_url,
+            "content_type": content_type,
+            "max_size": MAX_IMAGE_SIZE,
+            "expires_at": expires_at,
+        }
 
-        if not self.client.bucket_exists(bucket):
-            self.client.make_bucket(bucket)
+    async def confirm_upload(self, file_path: str, folder: str, owner_id: int) -> str:
+        key = self._key(file_path)
+        if not key.startswith(f"{folder}/{owner_id}/") or ".." in key.split("/"):
+            raise HTTPException(status_code=s.HTTP_400_BAD_REQUEST, detail="Upload does not belong to this user or folder")
+
+        try:
+            stat = await self._call("stat_object", self.client.stat_object, self.bucket, key)
+        except S3Error as e:
+            if e.code in ("NoSuchKey", "NoSuchObject"):
+                raise HTTPException(status_code=s.HTTP_404_NOT_FOUND, detail="Uploaded file not found")
+            raise Exception(f"MinIO stat failed: {e}")
+
+        # Client-chosen on the presigned PUT; store_image checks the actual content.
+        if stat.content_type not in ALLOWED_IMAGE_TYPES or not 0 < stat.size <= MAX_IMAGE_SIZE:
+            await self.delete_file(key)
+            raise HTTPException(status_code=s.HTTP_400_BAD_REQUEST, detail="Uploaded file has an incorrect type or size")
+
+        return f"/{self.bucket}/{key}"
+
+    def variant_urls(self, file_path: str) -> Dict[str, str]:
+        key = self._key(file_path)
+        return {name: f"/{self.bucket}/{variant_key(key, name)}" for name in IMAGE_VARIANTS}
+
+    async def _put_bytes(self, key: str, data: bytes, content_type: str) -> None:
+        try:
+            await self._call("put_object", self.client.put_object, self.bucket, key, io.BytesIO(data), len(data), content_type)
+        except S3Error as e:
+            raise Exception(f"MinIO upload failed: {e}")
+
+    async def _exists(self, key: str) -> bool:
+        try:
+            await self._call("stat_object", self.client.stat_object, self.bucket, key)
+        except S3Error as e:
+            if e.code in ("NoSuchKey", "NoSuchObject"):
+                return False
+            raise Exception(f"MinIO stat failed: {e}")
+        return True
+
+    def _deduplicates(self, folder: Optional[str]) -> bool:
+        return self.content_addressed and folder in IMAGE_VARIANT_FOLDERS
+
+    async def _content_key(self, prefix: str, digest: str, ext: str = "", with_variants: bool = False) -> Optional[str]:
+        """Shared key for ``digest``, pinned against cleanup; ``None`` while cleanup is deleting it."""
+        key = f"{prefix}cas/{digest}{ext}"
+        paths = [f"/{self.bucket}/{key}"]
+        if with_variants:
+            paths += self.variant_urls(key).values()
+        for path in paths:
+            if not await self.cleanup.pin(path):
+                metrics.incr("storage.dedup.contended")
+                return None
+        return key
+
+    @staticmethod
+    def _digest(data: BinaryIO) -> str:
+        hasher = hashlib.sha256()
+        data.seek(0)
+        for chunk in iter(lambda: data.read(64 * 1024), b""):
+            hasher.update(chunk)
+        data.seek(0)
+        return hasher.hexdigest()
+
+    @staticmethod
+    async def _read_image(file: UploadFile) -> Tuple[bytes, str]:
+        hasher = hashlib.sha256()
+        chunks = []
+        size = 0
+        while chunk := await file.read(64 * 1024):
+            size += len(chunk)
+            if size > MAX_IMAGE_SIZE:
+                raise HTTPException(status_code=s.HTTP_413_CONTENT_TOO_LARGE, detail=f"File is larger than {MAX_IMAGE_SIZE} bytes")
+            hasher.update(chunk)
+            chunks.append(chunk)
+        return b"".join(chunks), hasher.hexdigest()
+
+    async def store_image(
+            self,
+            folder: str,
+            owner_id: int,
+            file: Optional[UploadFile] = None,
+            file_path: Optional[str] = None,
+    ) -> Optional[str]:
+        with_variants = folder in IMAGE_VARIANT_FOLDERS
+        dedup = self._deduplicates(folder)
+        if file_path:
+            upload_key = self._key(await self.confirm_upload(file_path, folder, owner_id))
+            data = None
+            digest, head = await self.images.digest(self.location, upload_key) if dedup else (None, b"")
+        elif file:
+            if file.content_type not in ALLOWED_IMAGE_TYPES:
+                raise HTTPException(status_code=s.HTTP_400_BAD_REQUEST, detail="Incorrect image type")
+            data, digest = await self._read_image(file)
+            head = data[:IMAGE_SIGNATURE_LENGTH]
+            upload_key = None
+        else:
+            return None
+
+        key = None
+        # Not a recognisable image: skip dedup and let processing reject it.
+        ext = _image_extension(head) if dedup else None
+        if ext is not None:
+            key = await self._content_key(f"{folder}/", digest, ext, with_variants=with_variants)
+            if key and await self._exists(key):
+                metrics.incr("storage.dedup.hit")
+                if upload_key:
+                    await self.cleanup.enqueue([f"/{self.bucket}/{upload_key}"])
+                return f"/{self.bucket}/{key}"
+            metrics.incr("storage.dedup.miss")
+
+        if upload_key:
+            key = key or upload_key
+            try:
+                await self.images.ingest(self.location, upload_key, key, with_variants=with_variants)
+            except HTTPException:
+                await self.delete_file(upload_key)
+                raise
+        else:
+            processed = await self.images.process(data, with_variants=with_variants)
+            if key is None:
+                ext = mimetypes.guess_extension(processed.content_type) or ""
+                key = f"{folder}/{owner_id}/{uuid.uuid4().hex}{ext}"
+
+            # The original goes up last: once it exists, a content key counts as complete.
+            await asyncio.gather(*(
+                self._put_bytes(variant_key(key, name), blob, "image/webp")
+                for name, blob in processed.variants.items()
+            ))
+            await self._put_bytes(key, processed.original, processed.content_type)
+
+        if upload_key and upload_key != key:
+            await self.cleanup.enqueue([f"/{self.bucket}/{upload_key}"])
+
+        return f"/{self.bucket}/{key}"
+
+    @staticmethod
+    async def _checked_image(chunks: AsyncIterator[bytes], content_type: str, max_size: int) -> AsyncIterator[bytes]:
+        size = 0
+        head = b""
+        checked = False
+
+        async for chunk in chunks:
+            if not chunk:
+                continue
+            size += len(chunk)
+            if size > max_size:
+                metrics.incr("storage.stream.rejected")
+                raise HTTPException(status_code=s.HTTP_413_CONTENT_TOO_LARGE, detail=f"File is larger than {max_size} bytes")
+
+            if not checked:
+                head += chunk
+                if len(head) < IMAGE_SIGNATURE_LENGTH:
+                    continue
+                if not _matches_signature(content_type, head):
+                    metrics.incr("storage.stream.rejected")
+                    raise HTTPException(status_code=s.HTTP_400_BAD_REQUEST, detail="File content does not match its type")
+                checked = True
+                chunk, head = head, b""
+
+            yield chunk
+
+        if not checked:
+            if not head or not _matches_signature(content_type, head):
+                raise HTTPException(status_code=s.HTTP_400_BAD_REQUEST, detail="File content does not match its type")
+            yield head
+
+    async def upload_stream(
+            self,
+            chunks: AsyncIterator[bytes],
+            folder: str,
+            owner_id: int,
+            content_type: str,
+            content_length: Optional[int] = None,
+            max_size: int = MAX_IMAGE_SIZE,
+    ) -> str:
+        if content_type not in ALLOWED_IMAGE_TYPES:
+            raise HTTPException(status_code=s.HTTP_400_BAD_REQUEST, detail="Incorrect image type")
+        if content_length is not None and content_length > max_size:
+            metrics.incr("storage.stream.rejected")
+            raise HTTPException(status_code=s.HTTP_413_CONTENT_TOO_LARGE, detail=f"File is larger than {max_size} bytes")
+
+        ext = mimetypes.guess_extension(content_type) or ""
+        key = f"{folder}/{owner_id}/{uuid.uuid4().hex}{ext}"
+        reader = _StreamReader(
+            self._checked_image(chunks, content_type, max_size), asyncio.get_running_loop(), self.stream_read_timeout
+        )
+
+        try:
+            put_object = functools.partial(self._stream_client.put_object, part_size=self.part_size, num_parallel_uploads=1)
+            await self._call(
+                "put_object_stream", put_object, self.bucket, key, reader, -1, content_type,
+                executor=self._stream_executor,
+            )
+        except S3Error as e:
+            raise Exception(f"MinIO upload failed: {e}")
+
+        return f"/{self.bucket}/{key}"
+
+    def shutdown(self) -> None:
+        self.images.shutdown()
+        self._executor.shutdown(wait=False)
+        self._stream_executor.shutdown(wait=False)
+        self._http_client.clear()
+        self._stream_http_client.clear()
 
     async def upload_file(self, file: UploadFile, folder: Optional[str] = None) -> str:
         _, ext = os.path.splitext(file.filename)
-        unique_name = f"{uuid.uuid4().hex}{ext}"
+        prefix = f"{folder}/" if folder else ""
 
-        file_path = f"{folder}/{unique_name}" if folder else unique_name
+        file_path = None
+        if self._deduplicates(folder):
+            digest = await self._call("hash", self._digest, file.file)
+            file_path = await self._content_key(prefix, digest, ext)
+            if file_path and await self._exists(file_path):
+                metrics.incr("storage.dedup.hit")
+                return f"/{self.bucket}/{file_path}"
+            metrics.incr("storage.dedup.miss")
+        if file_path is None:
+            file_path = f"{prefix}{uuid.uuid4().hex}{ext}"
 
         file.file.seek(0, os.SEEK_END)
         file_size = file.file.tell()
         file.file.seek(0)
 
         try:
-            await asyncio.to_thread(
+            await self._call(
+                "put_object",
                 self.client.put_object,
                 self.bucket,
                 file_path,
@@ -45,26 +433,64 @@ class MinioService:
         return f"/{self.bucket}/{file_path}"
 
     async def upload_files(self, files: List[UploadFile], folder: Optional[str] = None) -> List[str]:
-        return [await self.upload_file(file, folder) for file in files]
+        semaphore = asyncio.Semaphore(self.upload_concurrency)
+
+        async def upload(file: UploadFile) -> str:
+            async with semaphore:
+                return await self.upload_file(file, folder)
+
+        results = await asyncio.gather(*(upload(file) for file in files), return_exceptions=True)
+
+        errors = [result for result in results if isinstance(result, BaseException)]
+        if errors:
+            uploaded = [result for result in results if isinstance(result, str)]
+            if self._deduplicates(folder):
+                await self.cleanup.enqueue(uploaded)
+            elif uploaded:
+                try:
+                    await self.delete_files(uploaded)
+                except StorageDeleteError:
+                    pass
+            raise errors[0]
+
+        return results
+
+    async def list_files(self, prefix: Optional[str] = None, older_than: Optional[datetime] = None) -> List[str]:
+        def collect() -> List[str]:
+            return [
+                f"/{self.bucket}/{obj.object_name}"
+                for obj in self.client.list_objects(self.bucket, prefix=prefix, recursive=True)
+                if older_than is None or obj.last_modified < older_than
+            ]
+
+        return await self._call("list_objects", collect)
 
     async def delete_file(self, file_path: str) -> None:
-        key = file_path
-        if file_path.startswith(f"/{self.bucket}/"):
-            key = file_path[len(self.bucket) + 2:]
+        key = self._key(file_path)
 
         try:
-            await asyncio.to_thread(self.client.remove_object, self.bucket, key)
+            await self._call("remove_object", self.client.remove_object, self.bucket, key)
         except S3Error as e:
             raise Exception(f"Failed to delete file from MinIO: {e}")
 
     async def delete_files(self, file_paths: List[str]) -> None:
-        errors = []
+        paths = {self._key(path): path for path in file_paths if path}
+        if not paths:
+            return
 
-        for path in file_paths:
-            try:
-                await self.delete_file(path)
-            except Exception as e:
-                errors.append(str(e))
+        def remove() -> Dict[str, str]:
+            objects = [DeleteObject(key) for key in paths]
+            # remove_objects is lazy and yields only the failures.
+            return {
+                paths.get(error.name, error.name): f"{error.code}: {error.message}"
+                for error in self.client.remove_objects(self.bucket, objects)
+            }
+
+        try:
+            errors = await self._call("remove_objects", remove)
+        except S3Error as e:
+            errors = {path: str(e) for path in paths.values()}
 
         if errors:
-            raise Exception(f"Some files could not be deleted: {errors}")
+            metrics.incr("storage.delete_failures", len(errors))
+            raise StorageDeleteError(errors)
@@ -0,0 +1,203 @@
+import asyncio
+import logging
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import List, Optional, Sequence, Set
+
+from redis.exceptions import RedisError
+from sqlalchemy import select, union
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from sqlalchemy.orm import InstrumentedAttribute
+
+from src.domain.enums import UploadFolder
+from src.infrastructure.dbs.redis import RedisConnection
+from src.infrastructure.integrations.minio_service import MinioService, StorageDeleteError
+from src.infrastructure.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+# Reserve a path for reuse unless cleanup is already deleting it.
+PIN_SCRIPT = """
+if redis.call('EXISTS', KEYS[2]) == 1 then
+    return 0
+end
+redis.call('SET', KEYS[1], 1, 'EX', ARGV[1])
+return 1
+"""
+
+# Mark a path as being deleted unless a request has pinned it for reuse.
+CLAIM_SCRIPT = """
+if redis.call('EXISTS', KEYS[1]) == 1 then
+    return 0
+end
+redis.call('SET', KEYS[2], 1, 'EX', ARGV[1])
+return 1
+"""
+
+
+class StorageCleanupQueue:
+    """Paths waiting for deletion; ``pin`` keeps a reused path from being claimed."""
+
+    def __init__(self, redis: RedisConnection, key: str = "storage:cleanup", pin_ttl: int = 600, claim_ttl: int = 300):
+        self.redis = redis
+        self.key = key
+        self.pin_ttl = pin_ttl
+        self.claim_ttl = claim_ttl
+
+    def _pin_key(self, path: str) -> str:
+        return f"{self.key}:pin:{{{path}}}"
+
+    def _tombstone_key(self, path: str) -> str:
+        return f"{self.key}:deleting:{{{path}}}"
+
+    async def pin(self, path: str) -> bool:
+        """Keep ``path`` from being deleted for ``pin_ttl``; ``False`` while it is being deleted."""
+        client = await self.redis.connect()
+        return bool(await client.eval(PIN_SCRIPT, 2, self._pin_key(path), self._tombstone_key(path), self.pin_ttl))
+
+    async def claim(self, paths: Sequence[str]) -> List[str]:
+        """The subset of ``paths`` nobody has pinned, marked as being deleted until ``release``."""
+        if not paths:
+            return []
+        async with self.redis.pipeline(transaction=False) as pipe:
+            for path in paths:
+                pipe.eval(CLAIM_SCRIPT, 2, self._pin_key(path), self._tombstone_key(path), self.claim_ttl)
+            claimed = await pipe.execute()
+        return [path for path, ok in zip(paths, claimed) if ok]
+
+    async def release(self, paths: Sequence[str]) -> None:
+        if paths:
+            async with self.redis.pipeline(transaction=False) as pipe:
+                for path in paths:
+                    pipe.delete(self._tombstone_key(path))
+                await pipe.execute()
+
+    async def enqueue(self, file_paths: Sequence[Optional[str]]) -> None:
+        paths = [path for path in file_paths if path]
+        if not paths:
+            return
+
+        try:
+            client = await self.redis.connect()
+            await client.sadd(self.key, *paths)
+        except RedisError as e:
+            # The commit already happened; the reconciler picks these up later.
+            logger.warning("Could not queue %s objects for cleanup: %s", len(paths), e)
+            return
+        metrics.incr("storage.cleanup.enqueued", len(paths))
+
+    async def pop_batch(self, count: int) -> List[str]:
+        client = await self.redis.connect()
+        return await client.spop(self.key, count) or []
+
+
+class StorageCleanupWorker:
+    def __init__(
+            self,
+            queue: StorageCleanupQueue,
+            storage: MinioService,
+            session_factory: async_sessionmaker[AsyncSession],
+            referenced_columns: Sequence[InstrumentedAttribute],
+            batch_size: int = 1000,
+            interval: float = 5,
+            reconcile_interval: int = 3600,
+            orphan_grace: int = 86400,
+    ):
+        self.queue = queue
+        self.storage = storage
+        self.session_factory = session_factory
+        self.referenced_columns = referenced_columns
+        self.batch_size = batch_size
+        self.interval = interval
+        self.reconcile_interval = reconcile_interval
+        self.orphan_grace = orphan_grace
+        self.lock_key = f"{queue.key}:reconcile-lock"
+        self.worker_id = uuid.uuid4().hex
+        self._stopping = asyncio.Event()
+
+    def stop(self) -> None:
+        self._stopping.set()
+
+    async def drain(self) -> int:
+        removed = 0
+        while True:
+            paths = await self.queue.pop_batch(self.batch_size)
+            if not paths:
+                return removed
+
+            # Pinned paths are being attached right now; the reconciler revisits them if that fails.
+            claimed = await self.queue.claim(paths)
+            try:
+                referenced = await self.referenced_paths(claimed)
+                unused = [path for path in claimed if path not in referenced]
+                metrics.incr("storage.cleanup.kept", len(paths) - len(unused))
+                await self.storage.delete_files(unused)
+            except StorageDeleteError as e:
+                logger.warning("Could not delete %s objects, retrying later: %s", len(e.errors), e.errors)
+                await self.queue.enqueue(list(e.errors))
+                removed += len(unused) - len(e.errors)
+                metrics.incr("storage.cleanup.removed", len(unused) - len(e.errors))
+                # Failed paths are back in the set; leave them for the next round.
+                return removed
+            except Exception:
+                await self.queue.enqueue(claimed)
+                raise
+            finally:
+                await self.queue.release(claimed)
+
+            removed += len(unused)
+            metrics.incr("storage.cleanup.removed", len(unused))
+
+    async def referenced_paths(self, paths: Optional[Sequence[str]] = None) -> Set[str]:
+        if paths is not None and not paths:
+            return set()
+
+        query = union(*(
+            select(column.label("path")).where(column.in_(paths) if paths is not None else column.isnot(None))
+            for column in self.referenced_columns
+        ))
+        async with self.session_factory() as session:
+            # A lagging replica could miss a freshly attached file.
+            session.info["use_primary"] = True
+            result = await session.stream_scalars(query)
+            return {path async for path in result}
+
+    async def reconcile(self) -> int:
+        client = await self.queue.redis.connect()
+        if not await client.set(self.lock_key, self.worker_id, nx=True, ex=self.reconcile_interval):
+            return 0
+
+        with metrics.timer("storage.reconcile"):
+            cutoff = datetime.now(timezone.utc) - timedelta(seconds=self.orphan_grace)
+            # List before reading references, so a file attached in between is still seen as referenced.
+            stored = []
+            for folder in UploadFolder:
+                stored += await self.storage.list_files(f"{folder.value}/", older_than=cutoff)
+            referenced = await self.referenced_paths()
+
+            orphans = [path for path in stored if path not in referenced]
+            for start in range(0, len(orphans), self.batch_size):
+                await self.queue.enqueue(orphans[start:start + self.batch_size])
+
+        metrics.incr("storage.orphans", len(orphans))
+        logger.info("Reconciled %s stored objects, queued %s orphans", len(stored), len(orphans))
+        return len(orphans)
+
+    async def run(self) -> None:
+        logger.info("Storage cleanup worker %s draining %s", self.worker_id, self.queue.key)
+        next_reconcile = time.monotonic()
+
+        while not self._stopping.is_set():
+            try:
+                if time.monotonic() >= next_reconcile:
+                    next_reconcile = time.monotonic() + self.reconcile_interval
+                    await self.reconcile()
+                await self.drain()
+            except Exception:
+                logger.exception("Storage cleanup failed")
+
+            try:
+                await asyncio.wait_for(self._stopping.wait(), timeout=self.interval)
+            except asyncio.TimeoutError:
+                pass
@@ -0,0 +1,91 @@
+from dataclasses import dataclass
+from typing import Dict, Optional, Sequence, Tuple
+
+from redis.exceptions import RedisError
+
+from src.infrastructure.dbs.redis import RedisConnection
+from src.infrastructure.metrics import metrics
+
+# Admit only if every bucket in KEYS holds a token, then take one from each.
+TOKEN_BUCKET_SCRIPT = """
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+local ttl = math.ceil(capacity / rate) + 1
+
+local levels = {}
+local wait = 0
+for i, key in ipairs(KEYS) do
+    local bucket = redis.call('HMGET', key, 'tokens', 'ts')
+    local tokens = tonumber(bucket[1]) or capacity
+    local ts = tonumber(bucket[2]) or now
+    tokens = math.min(capacity, tokens + math.max(0, now - ts) * rate)
+    levels[i] = tokens
+    if tokens < 1 then
+        wait = math.max(wait, (1 - tokens) / rate)
+    end
+end
+
+local allowed = wait == 0 and 1 or 0
+local remaining = capacity
+for i, key in ipairs(KEYS) do
+    local tokens = levels[i] - allowed
+    remaining = math.min(remaining, tokens)
+    redis.call('HSET', key, 'tokens', tostring(tokens), 'ts', tostring(now))
+    redis.call('EXPIRE', key, ttl)
+end
+
+return {allowed, math.ceil(wait), math.floor(remaining)}
+"""
+
+
+@dataclass(frozen=True)
+class RateLimitRule:
+    capacity: int
+    period: float
+
+    @property
+    def rate(self) -> float:
+        return self.capacity / self.period
+
+
+@dataclass
+class RateLimitResult:
+    allowed: bool
+    retry_after: int
+    remaining: int
+
+
+class RateLimiter:
+    def __init__(
+            self,
+            redis: RedisConnection,
+            rules: Dict[str, Tuple[int, float]],
+            enabled: bool = True,
+            prefix: str = "rate",
+    ):
+        self.redis = redis
+        self.rules = {name: RateLimitRule(*rule) for name, rule in rules.items()}
+        self.enabled = enabled
+        self.prefix = prefix
+        self._script = None
+
+    async def hit(self, name: str, identities: Sequence[str]) -> Optional[RateLimitResult]:
+        rule = self.rules.get(name)
+        if not self.enabled or rule is None or not identities:
+            return None
+
+        keys = [f"{self.prefix}:{{{name}}}:{identity}" for identity in identities]
+        try:
+            client = await self.redis.connect()
+            if self._script is None:
+                self._script = client.register_script(TOKEN_BUCKET_SCRIPT)
+            allowed, retry_after, remaining = await self._script(keys=keys, args=[rule.capacity, rule.rate])
+        except RedisError:
+            metrics.incr("rate_limit.redis.error")
+            return RateLimitResult(allowed=True, retry_after=0, remaining=rule.capacity)
+
+        if not allowed:
+            metrics.incr(f"rate_limit.{name}.rejected")
+        return RateLimitResult(allowed=bool(allowed), retry_after=int(retry_after), remaining=int(remaining))
@@ -8,10 +8,12 @@ from src.application.drivers.controllers import DriverController, AdminDriverCon
 from src.application.drivers.interfaces import IDriverRepository, IDriverCompanyRepository, IDriverController, \
     IAdminDriverController
 from src.application.users.controllers import UserController
-from src.application.users.interfaces import IUserRepository, IUserController, IEmailOtpService
-from src.domain.interfaces import IJWTService, IHashService, IStorageService
+from src.application.users.interfaces import IUserRepository, IUserController, IEmailOtpService, \
+    ITokenIssuer
+from src.domain.interfaces import IJWTService, IHashService, IStorageService, IUoW, IStorageCleanup
 from src.presentation.v1.depends.repositories import get_user_repository, get_company_repository, get_driver_repository, \
     get_driver_company_repository
+from src.presentation.v1.depends.session import get_uow
 
 
 @inject
@@ -21,6 +23,9 @@ async def get_user_controller(
         jwt_service: IJWTService = Depends(Provide[Container.jwt_service]),
         hash_service: IHashService = Depends(Provide[Container.hash_service]),
         storage_service: IStorageService = Depends(Provide[Container.minio_service]),
+        storage_cleanup: IStorageCleanup = Depends(Provide[Container.storage_cleanup]),
+        token_issuer: ITokenIssuer = Depends(Provide[Container.token_issuer]),
+        uow: IUoW = Depends(get_uow),
 ) -> IUserController:
     return UserController(
         user_repository=user_repository,
@@ -28,6 +33,9 @@ async def get_user_controller(
         jwt_service=jwt_service,
         hash_service=hash_service,
         storage_service=storage_service,
+        storage_cleanup=storage_cleanup,
+        token_issuer=token_issuer,
+        uow=uow,
     )
 
 @inject
@@ -37,6 +45,9 @@ async def get_company_controller(
         driver_company_repository: IDriverCompanyRepository = Depends(get_driver_company_repository),
         driver_repository: IDriverRepository = Depends(get_driver_repository),
         storage_service: IStorageService = Depends(Provide[Container.minio_service]),
+        storage_cleanup: IStorageCleanup = Depends(Provide[Container.storage_cleanup]),
+        token_issuer: ITokenIssuer = Depends(Provide[Container.token_issuer]),
+        uow: IUoW = Depends(get_uow),
 ) -> ICompanyController:
     return CompanyController(
         company_repository=company_repository,
@@ -44,6 +55,9 @@ async def get_company_controller(
         driver_repository=driver_repository,
         driver_company_repository=driver_company_repository,
         storage_service=storage_service,
+        storage_cleanup=storage_cleanup,
+        token_issuer=token_issuer,
+        uow=uow,
     )
 
 async def get_admin_company_controller(
@@ -60,6 +74,9 @@ async def get_driver_controller(
         user_repository: IUserRepository = Depends(get_user_repository),
         company_repository: ICompanyRepository = Depends(get_company_repository),
         storage_service: IStorageService = Depends(Provide[Container.minio_service]),
+        storage_cleanup: IStorageCleanup = Depends(Provide[Container.storage_cleanup]),
+        token_issuer: ITokenIssuer = Depends(Provide[Container.token_issuer]),
+        uow: IUoW = Depends(get_uow),
 ) -> IDriverController:
     return DriverController(
         driver_repository=driver_repository,
@@ -67,6 +84,9 @@ async def get_driver_controller(
         user_repository=user_repository,
         company_repository=company_repository,
         storage_service=storage_service,
+        storage_cleanup=storage_cleanup,
+        token_issuer=token_issuer,
+        uow=uow,
     )
 
 async def get_admin_driver_controller(
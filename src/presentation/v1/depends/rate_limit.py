@@ -0,0 +1,109 @@
+import ipaddress
+import json
+from typing import List, Optional
+
+from dependency_injector.wiring import inject, Provide
+from fastapi import Depends, HTTPException, Request, Response, status
+from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
+
+from src.app.container import Container
+from src.domain.interfaces import IJWTService
+from src.infrastructure.rate_limiter import RateLimiter
+
+optional_bearer = HTTPBearer(auto_error=False)
+
+trusted_proxies = [
+    ipaddress.ip_network(proxy, strict=False) for proxy in Container.settings.RATE_LIMIT_TRUSTED_PROXIES
+]
+
+
+@inject
+async def get_rate_limiter(
+        limiter: RateLimiter = Depends(Provide[Container.rate_limiter]),
+) -> RateLimiter:
+    return limiter
+
+
+@inject
+async def get_jwt_service(
+        jwt_service: IJWTService = Depends(Provide[Container.jwt_service]),
+) -> IJWTService:
+    return jwt_service
+
+
+def _client_ip(request: Request) -> Optional[str]:
+    if request.client is None:
+        return None
+
+    host = request.client.host
+    try:
+        trusted = any(ipaddress.ip_address(host) in proxy for proxy in trusted_proxies)
+    except ValueError:
+        trusted = False
+    if not trusted:
+        return host
+
+    # Walk the chain from the nearest hop and take the first address we do not trust.
+    forwarded = request.headers.get(Container.settings.RATE_LIMIT_FORWARDED_HEADER, "")
+    for hop in reversed([hop.strip() for hop in forwarded.split(",") if hop.strip()]):
+        try:
+            address = ipaddress.ip_address(hop)
+        except ValueError:
+            return host
+        if not any(address in proxy for proxy in trusted_proxies):
+            return hop
+    return host
+
+
+def _token_user_id(token: Optional[HTTPAuthorizationCredentials], jwt_service: IJWTService) -> Optional[int]:
+    if token is None or token.scheme.lower() != "bearer":
+        return None
+    try:
+        return jwt_service.decode_token(token.credentials).get("user_id")
+    except HTTPException:
+        return None
+
+
+async def _body_email(request: Request) -> Optional[str]:
+    # FastAPI has already read and cached the body for the endpoint's own params.
+    try:
+        body = await request.json()
+    except (json.JSONDecodeError, UnicodeDecodeError):
+        return None
+
+    email = body.get("email") if isinstance(body, dict) else body
+    return email.strip().lower() if isinstance(email, str) else None
+
+
+def rate_limit(name: str):
+    async def dependency(
+            request: Request,
+            response: Response,
+            limiter: RateLimiter = Depends(get_rate_limiter),
+            token: Optional[HTTPAuthorizationCredentials] = Depends(optional_bearer),
+            jwt_service: IJWTService = Depends(get_jwt_service),
+    ) -> None:
+        identities: List[str] = []
+        ip = _client_ip(request)
+        if ip:
+            identities.append(f"ip:{ip}")
+        user_id = _token_user_id(token, jwt_service)
+        if user_id is not None:
+            identities.append(f"user:{user_id}")
+        email = await _body_email(request)
+        if email:
+            identities.append(f"email:{email}")
+
+        result = await limiter.hit(name, identities)
+        if result is None:
+            return
+
+        if not result.allowed:
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail=f"Too many requests. Try again in {result.retry_after} seconds.",
+                headers={"Retry-After": str(result.retry_after)},
+            )
+        response.headers["X-RateLimit-Remaining"] = str(result.remaining)
+
+    return dependency
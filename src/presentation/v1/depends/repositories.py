@@ -1,3 +1,4 @@
+from dependency_injector.wiring import inject, Provide
 from fastapi import Depends
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -5,17 +6,21 @@ from src.application.companies.interfaces import ICompanyRepository
 from src.application.companies.repositories import CompanyRepository
 from src.application.drivers.interfaces import IDriverRepository, IDriverCompanyRepository
 from src.application.drivers.repositories import DriverRepository, DriverCompanyRepository
-from src.application.users.interfaces import IUserRepository
+from src.app.container import Container
+from src.application.users.interfaces import IUserRepository, IUserCache, ITokenVersionService
 from src.application.users.repositories import UserRepository
 from src.domain.interfaces import IUoW
 from src.presentation.v1.depends.session import get_session, get_uow
 
 
+@inject
 async def get_user_repository(
         session: AsyncSession = Depends(get_session),
-        uow: IUoW = Depends(get_uow)
+        uow: IUoW = Depends(get_uow),
+        user_cache: IUserCache = Depends(Provide[Container.user_cache]),
+        token_versions: ITokenVersionService = Depends(Provide[Container.token_versions]),
 ) -> IUserRepository:
-    return UserRepository(session, uow)
+    return UserRepository(session, uow, user_cache, token_versions)
 
 async def get_company_repository(
         session: AsyncSession = Depends(get_session),
@@ -6,19 +6,23 @@ from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 
 from src.app.container import Container
-from src.application.users.interfaces import IUserRepository
+from src.application.users.dtos import UserDTO
+from src.application.users.interfaces import IUserRepository, IUserCache, ITokenVersionService
 from src.domain.enums import UserRoles
 from src.domain.interfaces import IJWTService
+from src.infrastructure.metrics import metrics
 from src.presentation.v1.depends.repositories import get_user_repository
 
 http_bearer = HTTPBearer()
 
+
 @inject
-async def get_current_user(
+async def get_token_payload(
         token: Optional[HTTPAuthorizationCredentials] = Depends(http_bearer),
         jwt_service: IJWTService = Depends(Provide[Container.jwt_service]),
-        user_repo: IUserRepository = Depends(get_user_repository),
-):
+        token_versions: ITokenVersionService = Depends(Provide[Container.token_versions]),
+) -> dict:
+    """Decoded access token, with ``verified_claims`` set when its role claim can be trusted."""
     if token is None or not token.credentials:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Unauthorized")
 
@@ -30,14 +34,53 @@ async def get_current_user(
     if datetime.utcnow() >= datetime.utcfromtimestamp(exp):
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Unauthorized")
 
-    user = await user_repo.get_by_id(payload['user_id'])
-    if not user:
-        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid access token")
+    payload["verified_claims"] = False
+    if "role" in payload and "ver" in payload:
+        version = await token_versions.get(payload['user_id'])
+        if version is not None:
+            if version != payload['ver']:
+                metrics.incr("auth.token_revoked")
+                raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Token has been revoked")
+            payload["verified_claims"] = True
+
+    return payload
+
+
+@inject
+async def get_current_user(
+        payload: dict = Depends(get_token_payload),
+        user_repo: IUserRepository = Depends(get_user_repository),
+        user_cache: IUserCache = Depends(Provide[Container.user_cache]),
+):
+    user = await user_cache.get(payload['user_id'])
+    if user is None:
+        generation = await user_cache.generation(payload['user_id'])
+        # Primary read: a lagging replica would refill the cache with the pre-update row.
+        user = await user_repo.get_by_id(payload['user_id'], use_primary=True)
+        if not user:
+            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid access token")
+        await user_cache.set(user, generation)
 
     return user
 
+
+@inject
+async def get_token_user(
+        payload: dict = Depends(get_token_payload),
+        user_repo: IUserRepository = Depends(get_user_repository),
+        user_cache: IUserCache = Depends(Provide[Container.user_cache]),
+) -> UserDTO:
+    """Identity for role guards: taken from verified claims, loaded like ``get_current_user`` otherwise."""
+    if payload["verified_claims"]:
+        metrics.incr("auth.claims_authorized")
+        return UserDTO(id=payload['user_id'], role=UserRoles(payload['role']))
+
+    metrics.incr("auth.db_authorized")
+    return await get_current_user(payload=payload, user_repo=user_repo, user_cache=user_cache)
+
+
 async def is_admin(
-        user = Depends(get_current_user)
+        user = Depends(get_token_user)
 ):
     if user.role != UserRoles.ADMIN:
         raise HTTPException(
@@ -47,7 +90,7 @@ async def is_admin(
     return user
 
 async def is_company(
-        user = Depends(get_current_user)
+        user = Depends(get_token_user)
 ):
     if user.role != UserRoles.COMPANY:
         raise HTTPException(
@@ -57,7 +100,7 @@ async def is_company(
     return user
 
 async def is_driver(
-        user = Depends(get_current_user)
+        user = Depends(get_token_user)
 ):
     if user.role != UserRoles.DRIVER:
         raise HTTPException(
@@ -1,5 +1,9 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, Depends, Query, status as s
 
+from src.application.users.dtos import UserDTO
+from src.domain.responses import *
+from src.infrastructure.metrics import metrics
+from src.presentation.v1.depends.security import is_admin
 from . import company_router, driver_router
 
 router = APIRouter(
@@ -8,4 +12,20 @@ router = APIRouter(
 )
 
 router.include_router(company_router.admin_router)
-router.include_router(driver_router.admin_router)
\ No newline at end of file
+router.include_router(driver_router.admin_router)
+
+
+@router.get(
+    '/metrics',
+    status_code=s.HTTP_200_OK,
+    responses={
+        s.HTTP_401_UNAUTHORIZED: RESPONSE_401,
+        s.HTTP_403_FORBIDDEN: RESPONSE_403,
+    }
+)
+async def get_metrics(
+        prefix: str = Query(""),
+        user: UserDTO = Depends(is_admin),
+):
+    """Counters, gauges and timings of the worker process that serves the request."""
+    return metrics.snapshot(prefix)
@@ -1,13 +1,13 @@
 from typing import Annotated, Optional
 
-from fastapi import APIRouter, status as s, Depends, UploadFile, File, Query, Body
+from fastapi import APIRouter, status as s, Depends, UploadFile, File, Query, Body, Response
 
 from src.application.companies.dtos import CompanyDTO, PaginationCompanyDTO
 from src.application.companies.interfaces import ICompanyController, IAdminCompanyController
 from src.application.drivers.dtos import PaginationDriverCompanyDTO, DriverCompanyDTO
 from src.application.users.dtos import UserDTO
-from src.domain.base_schema import PaginationSchema
-from src.domain.enums import Status
+from src.domain.base_schema import PaginationSchema, BulkStatusUpdateSchema, BulkStatusResponseSchema
+from src.domain.enums import Status, SearchMode
 from src.domain.responses import *
 from src.presentation.v1.depends.controllers import get_company_controller, get_admin_company_controller
 from src.presentation.v1.depends.security import get_current_user, is_admin, is_company
@@ -45,11 +45,16 @@ admin_router = APIRouter(
 )
 async def create_company(
         controller: Annotated[ICompanyController, Depends(get_company_controller)],
-        logo: UploadFile = File(),
+        response: Response,
+        logo: UploadFile = File(None),
         body: CreateCompanySchema = Depends(CreateCompanySchema.as_form()),
         user: UserDTO = Depends(get_current_user),
 ):
-    return await controller.create_company(CompanyDTO(**body.dict(), owner_id=user.id, logo_file=logo))
+    return await controller.create_company(
+        user=user,
+        company_data=CompanyDTO(**body.dict(), owner_id=user.id, logo_file=logo),
+        response=response,
+    )
 
 @router.get(
     '',
@@ -80,9 +85,16 @@ async def search_companies(
         user: UserDTO = Depends(get_current_user),
         query: str = Query(''),
         status: Optional[Status] = Query(None),
+        mode: SearchMode = Query(SearchMode.CONTAINS),
         pagination: PaginationCompanySchema = Depends(PaginationSchema.as_query()),
 ):
-    return await controller.search_companies(user=user, text=query, status=status, pagination=PaginationCompanyDTO(**pagination.dict()))
+    return await controller.search_companies(
+        user=user,
+        text=query,
+        status=status,
+        pagination=PaginationCompanyDTO(**pagination.dict()),
+        mode=mode,
+    )
 
 @router.get(
     '/application',
@@ -102,6 +114,29 @@ async def get_company_applications(
 ):
     return await controller.get_applications(user=user, status=status, pagination=PaginationDriverCompanyDTO(**pagination.dict()))
 
+@router.patch(
+    '/application/bulk',
+    status_code=s.HTTP_200_OK,
+    response_model=BulkStatusResponseSchema,
+    responses={
+        s.HTTP_400_BAD_REQUEST: RESPONSE_400,
+        s.HTTP_401_UNAUTHORIZED: RESPONSE_401,
+        s.HTTP_403_FORBIDDEN: RESPONSE_403,
+        s.HTTP_404_NOT_FOUND: RESPONSE_404,
+    }
+)
+async def bulk_update_application_status(
+        body: BulkStatusUpdateSchema,
+        controller: Annotated[ICompanyController, Depends(get_company_controller)],
+        user: UserDTO = Depends(is_company),
+):
+    return await controller.bulk_update_application_status(
+        user=user,
+        driver_ids=body.ids,
+        status=body.status,
+        rejection_reason=body.rejection_reason,
+    )
+
 @router.patch(
     '/application/{driver_id}',
     status_code=s.HTTP_200_OK,
@@ -189,9 +224,31 @@ async def update_company(
 )
 async def delete_company(
         controller: Annotated[ICompanyController, Depends(get_company_controller)],
+        response: Response,
         user: UserDTO = Depends(is_company),
 ):
-    return await controller.delete_company(user=user)
+    return await controller.delete_company(user=user, response=response)
+
+@admin_router.patch(
+    '/bulk',
+    status_code=s.HTTP_200_OK,
+    response_model=BulkStatusResponseSchema,
+    responses={
+        s.HTTP_400_BAD_REQUEST: RESPONSE_400,
+        s.HTTP_401_UNAUTHORIZED: RESPONSE_401,
+        s.HTTP_403_FORBIDDEN: RESPONSE_403,
+    }
+)
+async def bulk_update_company_status(
+        body: BulkStatusUpdateSchema,
+        controller: Annotated[IAdminCompanyController, Depends(get_admin_company_controller)],
+        user: UserDTO = Depends(is_admin),
+):
+    return await controller.bulk_update_company_status(
+        company_ids=body.ids,
+        status=body.status,
+        rejection_reason=body.rejection_reason,
+    )
 
 @admin_router.patch(
     '/{company_id}',
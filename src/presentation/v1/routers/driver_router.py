@@ -1,11 +1,11 @@
 from typing import Annotated, Optional
 
-from fastapi import APIRouter, status as s, Depends, UploadFile, File, Body, Query
+from fastapi import APIRouter, status as s, Depends, UploadFile, File, Body, Query, Response
 
 from src.application.drivers.dtos import DriverDTO, PaginationDriverCompanyDTO, PaginationDriverDTO
 from src.application.drivers.interfaces import IDriverController, IAdminDriverController
 from src.application.users.dtos import UserDTO
-from src.domain.base_schema import PaginationSchema
+from src.domain.base_schema import PaginationSchema, BulkStatusUpdateSchema, BulkStatusResponseSchema
 from src.domain.enums import Status
 from src.domain.responses import *
 from src.presentation.v1.depends.controllers import get_driver_controller, get_admin_driver_controller
@@ -46,8 +46,9 @@ admin_router = APIRouter(
 )
 async def create_driver_profile(
         controller: Annotated[IDriverController, Depends(get_driver_controller)],
-        license_photo_file: UploadFile = File(),
-        id_photo_file: UploadFile = File(),
+        response: Response,
+        license_photo_file: UploadFile = File(None),
+        id_photo_file: UploadFile = File(None),
         body: CreateDriverSchema = Depends(CreateDriverSchema.as_form()),
         user: UserDTO = Depends(get_current_user),
 ):
@@ -58,7 +59,8 @@ async def create_driver_profile(
             user_id=user.id,
             id_photo_file=id_photo_file,
             license_photo_file=license_photo_file
-        )
+        ),
+        response=response,
     )
 
 @router.get(
@@ -184,9 +186,10 @@ async def update_driver_profile(
 )
 async def delete_my_driver_profile(
         controller: Annotated[IDriverController, Depends(get_driver_controller)],
+        response: Response,
         user: UserDTO = Depends(is_driver),
 ):
-    return await controller.delete_my_driver_profile(user=user)
+    return await controller.delete_my_driver_profile(user=user, response=response)
 
 @admin_router.get(
     '',
@@ -205,6 +208,27 @@ async def get_driver_profiles(
 ):
     return await controller.get_driver_profiles(status, PaginationDriverDTO(**pagination.dict()))
 
+@admin_router.patch(
+    '/bulk',
+    status_code=s.HTTP_200_OK,
+    response_model=BulkStatusResponseSchema,
+    responses={
+        s.HTTP_400_BAD_REQUEST: RESPONSE_400,
+        s.HTTP_401_UNAUTHORIZED: RESPONSE_401,
+        s.HTTP_403_FORBIDDEN: RESPONSE_403,
+    }
+)
+async def bulk_update_driver_profile_status(
+        body: BulkStatusUpdateSchema,
+        controller: Annotated[IAdminDriverController, Depends(get_admin_driver_controller)],
+        user: UserDTO = Depends(is_admin),
+):
+    return await controller.bulk_update_driver_profile_status(
+        driver_ids=body.ids,
+        status=body.status,
+        rejection_reason=body.rejection_reason,
+    )
+
 @admin_router.patch(
     '/{driver_id}',
     status_code=s.HTTP_200_OK,
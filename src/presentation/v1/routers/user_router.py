@@ -1,15 +1,17 @@
-from typing import Annotated
+from typing import Annotated, Optional
 
-from fastapi import APIRouter, status as s, Depends, Response, UploadFile, File, Body
+from fastapi import APIRouter, status as s, Depends, Response, UploadFile, File, Body, Header, Request
 from pydantic import EmailStr
 
 from src.application.users.dtos import UserDTO
 from src.application.users.interfaces import IUserController
+from src.domain.enums import UploadFolder
 from src.domain.responses import *
 from src.presentation.v1.depends.controllers import get_user_controller
+from src.presentation.v1.depends.rate_limit import rate_limit
 from src.presentation.v1.depends.security import get_current_user
 from src.presentation.v1.schemas.user_schema import VerifyOTPSchema, LoginSchema, UserSchema, \
-    UpdateUserSchema
+    UpdateUserSchema, CreateUploadSchema, UploadSchema, UploadedFileSchema
 
 router = APIRouter(
     prefix="/user",
@@ -19,6 +21,7 @@ router = APIRouter(
 @router.post(
     "/send-otp",
     status_code=s.HTTP_200_OK,
+    dependencies=[Depends(rate_limit("send_otp"))],
     responses={
         s.HTTP_200_OK: {
             "description": "OTP code sent",
@@ -39,7 +42,8 @@ router = APIRouter(
                     }
                 }
             }
-        }
+        },
+        s.HTTP_429_TOO_MANY_REQUESTS: RESPONSE_429
     }
 )
 async def send_otp(
@@ -115,6 +119,7 @@ async def change_password(
 @router.post(
     '/login',
     status_code=s.HTTP_200_OK,
+    dependencies=[Depends(rate_limit("login"))],
     responses={
         s.HTTP_200_OK: {
             "description": "Logged in successfully",
@@ -136,7 +141,8 @@ async def change_password(
                     }
                 }
             }
-        }
+        },
+        s.HTTP_429_TOO_MANY_REQUESTS: RESPONSE_429
     }
 )
 async def login(
@@ -192,6 +198,50 @@ async def update_profile(
 ):
     return await controller.update(user=user, user_data=UserDTO(**body.dict(), avatar_file=file))
 
+@router.post(
+    '/uploads',
+    status_code=s.HTTP_201_CREATED,
+    response_model=UploadSchema,
+    responses={
+        s.HTTP_401_UNAUTHORIZED: RESPONSE_401,
+        s.HTTP_400_BAD_REQUEST: RESPONSE_400,
+    }
+)
+async def create_upload(
+        controller: Annotated[IUserController, Depends(get_user_controller)],
+        body: CreateUploadSchema,
+        user: UserDTO = Depends(get_current_user),
+):
+    return await controller.create_upload(user=user, folder=body.folder, content_type=body.content_type)
+
+@router.put(
+    '/uploads/{folder}',
+    status_code=s.HTTP_201_CREATED,
+    response_model=UploadedFileSchema,
+    responses={
+        s.HTTP_401_UNAUTHORIZED: RESPONSE_401,
+        s.HTTP_400_BAD_REQUEST: RESPONSE_400,
+        s.HTTP_408_REQUEST_TIMEOUT: RESPONSE_408,
+        s.HTTP_413_CONTENT_TOO_LARGE: RESPONSE_413,
+    }
+)
+async def stream_upload(
+        folder: UploadFolder,
+        request: Request,
+        controller: Annotated[IUserController, Depends(get_user_controller)],
+        content_type: str = Header(),
+        content_length: Optional[int] = Header(None),
+        user: UserDTO = Depends(get_current_user),
+):
+    """Raw image body, streamed to storage; attach the returned ``file_path`` like a presigned upload."""
+    return await controller.stream_upload(
+        user=user,
+        folder=folder,
+        content_type=content_type,
+        content_length=content_length,
+        chunks=request.stream(),
+    )
+
 @router.delete(
     '',
     status_code=s.HTTP_200_OK,
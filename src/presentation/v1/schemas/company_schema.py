@@ -12,6 +12,7 @@ class CreateCompanySchema(BaseSchema):
     bin: str
     description: str
     address: str
+    logo_path: Optional[str] = None
 
 class CompanySchema(BaseModel):
     id: int
@@ -20,6 +21,8 @@ class CompanySchema(BaseModel):
     description: str
     address: str
     logo_url: str
+    logo_thumb_url: Optional[str] = None
+    logo_medium_url: Optional[str] = None
     status: Status
     rejection_reason: Optional[str] = None
     created_at: datetime
@@ -34,4 +37,5 @@ class PaginationCompanySchema(PaginationSchema):
 class UpdateCompanySchema(BaseSchema):
     name: Optional[str] = None
     description: Optional[str] = None
-    address: Optional[str] = None
\ No newline at end of file
+    address: Optional[str] = None
+    logo_path: Optional[str] = None
\ No newline at end of file
@@ -13,6 +13,8 @@ class CreateDriverSchema(BaseSchema):
     license_number: str
     license_issued_at: date
     license_expires_at: date
+    id_photo_path: Optional[str] = None
+    license_photo_path: Optional[str] = None
 
     @field_validator("phone_number")
     def validate_phone(cls, v):
@@ -42,6 +44,8 @@ class UpdateDriverSchema(BaseSchema):
     license_number: Optional[str] = None
     licence_issued_at: Optional[date] = None
     license_expires_at: Optional[date] = None
+    id_photo_path: Optional[str] = None
+    license_photo_path: Optional[str] = None
 
     @field_validator("phone_number")
     def validate_phone(cls, v):
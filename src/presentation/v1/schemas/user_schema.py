@@ -1,10 +1,10 @@
 from datetime import datetime
-from typing import Optional
+from typing import Dict, Optional
 
 from pydantic import BaseModel, EmailStr
 
 from src.domain.base_schema import BaseSchema
-from src.domain.enums import UserRoles
+from src.domain.enums import UserRoles, UploadFolder
 
 
 class VerifyOTPSchema(BaseModel):
@@ -25,6 +25,8 @@ class UserSchema(BaseModel):
     last_name: str
     role: UserRoles
     avatar_url: Optional[str] = None
+    avatar_thumb_url: Optional[str] = None
+    avatar_medium_url: Optional[str] = None
     created_at: datetime
     updated_at: datetime
 
@@ -36,4 +38,22 @@ class UpdateUserSchema(BaseSchema):
     last_name: Optional[str] = None
     password: Optional[str] = None
     new_password: Optional[str] = None
-    avatar_url: Optional[str] = None
\ No newline at end of file
+    avatar_url: Optional[str] = None
+    # file_path from POST /user/uploads, used instead of the avatar file
+    avatar_path: Optional[str] = None
+
+class CreateUploadSchema(BaseModel):
+    folder: UploadFolder
+    content_type: str
+
+class UploadedFileSchema(BaseModel):
+    file_path: str
+
+class UploadSchema(BaseModel):
+    file_path: str
+    post_url: str
+    post_fields: Dict[str, str]
+    put_url: str
+    content_type: str
+    max_size: int
+    expires_at: datetime
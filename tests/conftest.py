@@ -0,0 +1,49 @@
+import os
+from contextlib import asynccontextmanager
+
+import pytest
+
+# Settings are read when the container module is imported.
+for name, value in {
+    "APP_NAME": "test", "APP_ENV": "test",
+    "POSTGRES_USER": "u", "POSTGRES_PASSWORD": "p", "POSTGRES_DB": "d", "POSTGRES_HOST": "localhost",
+    "POSTGRES_PORT": "5432", "DATABASE_URL": "postgresql+asyncpg://u:p@localhost/d",
+    "ALEMBIC_URL": "postgresql://u:p@localhost/d", "REDIS_URL": "redis://localhost",
+    "JWT_SECRET": "secret", "JWT_ALGORITHM": "HS256", "ACCESS_TOKEN_EXPIRE_MINUTES": "15",
+    "SMTP_HOST": "localhost", "SMTP_PORT": "25", "SMTP_USER": "u", "SMTP_PASSWORD": "p", "SMTP_FROM": "a@b.c",
+    "OTP_TTL": "300", "MINIO_ROOT_USER": "u", "MINIO_ROOT_PASSWORD": "p", "MINIO_BUCKET": "b",
+    "MINIO_ENDPOINT": "localhost:9000",
+}.items():
+    os.environ.setdefault(name, value)
+
+# Relationship mappers only resolve once every model is imported.
+from src.application.companies.models import Company  # noqa: E402,F401
+from src.application.drivers.models import Driver  # noqa: E402,F401
+from src.application.users.models import User  # noqa: E402,F401
+
+
+class FakeRedisConnection:
+    def __init__(self, client):
+        self.client = client
+
+    async def connect(self):
+        return self.client
+
+    @asynccontextmanager
+    async def pipeline(self, transaction: bool = True):
+        async with self.client.pipeline(transaction=transaction) as pipe:
+            yield pipe
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+@pytest.fixture
+async def redis():
+    fakeredis = pytest.importorskip("fakeredis")
+    client = fakeredis.FakeAsyncRedis(decode_responses=True)
+    yield FakeRedisConnection(client)
+    await client.flushall()
+    await client.aclose()
@@ -0,0 +1,65 @@
+import json
+
+import pytest
+
+from src.infrastructure.integrations.email_queue import EmailQueue, EmailWorker
+
+pytestmark = pytest.mark.anyio
+
+
+class StubSender:
+    def __init__(self, error=None):
+        self.error = error
+        self.sent = []
+
+    async def send_batch(self, emails):
+        self.sent.extend(emails)
+        return [self.error for _ in emails]
+
+
+async def deliver(worker: EmailWorker):
+    await worker.ensure_group()
+    await worker.handle_batch(await worker.read_batch())
+
+
+async def test_sent_messages_leave_the_stream(redis):
+    queue = EmailQueue(redis)
+    sender = StubSender()
+    await queue.enqueue("a@b.c", "subject", "body")
+
+    await deliver(EmailWorker(queue, sender, block=1))
+
+    assert [email.to_email for email in sender.sent] == ["a@b.c"]
+    assert await redis.client.xlen(queue.stream) == 0
+
+
+async def test_failures_are_retried_then_dead_lettered(redis):
+    queue = EmailQueue(redis)
+    worker = EmailWorker(queue, StubSender(ConnectionError("down")), max_attempts=2, block=1)
+    await queue.enqueue("a@b.c", "subject", "body")
+
+    await deliver(worker)
+    retries = await redis.client.zrange(queue.retry_key, 0, -1)
+    assert json.loads(retries[0])["attempts"] == 1
+    assert await redis.client.xlen(queue.dead_letter_stream) == 0
+
+    await redis.client.zadd(queue.retry_key, {retries[0]: 0})
+    await worker.requeue_due()
+    await deliver(worker)
+
+    dead = await redis.client.xrange(queue.dead_letter_stream)
+    assert json.loads(dead[0][1]["payload"])["attempts"] == 2
+    assert await redis.client.zcard(queue.retry_key) == 0
+    assert await redis.client.xlen(queue.stream) == 0
+
+
+async def test_malformed_messages_are_dead_lettered(redis):
+    queue = EmailQueue(redis)
+    sender = StubSender()
+    await redis.client.xadd(queue.stream, {"payload": "not json"})
+
+    await deliver(EmailWorker(queue, sender, block=1))
+
+    assert sender.sent == []
+    dead = await redis.client.xrange(queue.dead_letter_stream)
+    assert dead[0][1]["payload"] == "not json"
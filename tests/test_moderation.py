@@ -0,0 +1,57 @@
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from src.application.drivers.models import Driver
+from src.domain.enums import Status
+from src.infrastructure.dbs.moderation import bulk_update_status
+
+
+class StubSession:
+    def __init__(self, rows):
+        self.rows = rows
+        self.statement = None
+
+    async def execute(self, statement):
+        self.statement = str(statement.compile(dialect=postgresql.dialect()))
+        return SimpleNamespace(mappings=lambda: SimpleNamespace(all=lambda: self.rows))
+
+
+@pytest.mark.anyio
+async def test_results_follow_request_order():
+    session = StubSession([
+        {"id": 1, "previous_status": Status.WAITING, "updated": True},
+        {"id": 2, "previous_status": Status.APPROVED, "updated": False},
+        {"id": 3, "previous_status": None, "updated": False},
+    ])
+
+    results = await bulk_update_status(session, Driver.__table__, Driver.__table__.c.id, [3, 1, 2, 1], Status.APPROVED)
+
+    assert [result.id for result in results] == [3, 1, 2]
+    assert [result.updated for result in results] == [False, True, False]
+    assert results[0].detail == "Not found"
+    assert results[1].detail == "Status updated"
+    assert results[2].previous_status == Status.APPROVED
+    assert results[2].detail.startswith("Can not update status")
+
+
+@pytest.mark.anyio
+async def test_ids_missing_from_the_result_are_not_found():
+    session = StubSession([])
+
+    results = await bulk_update_status(session, Driver.__table__, Driver.__table__.c.id, [5], Status.REJECTED)
+
+    assert results[0].updated is False
+    assert results[0].previous_status is None
+    assert results[0].detail == "Not found"
+
+
+@pytest.mark.anyio
+async def test_existing_scan_is_limited_to_requested_ids():
+    session = StubSession([])
+
+    await bulk_update_status(session, Driver.__table__, Driver.__table__.c.id, [1, 2], Status.APPROVED)
+
+    assert "UPDATE drivers" in session.statement
+    assert "WHERE drivers.id IN" in session.statement
@@ -0,0 +1,73 @@
+import pytest
+from fastapi import HTTPException
+
+from src.application.users.services import EmailOtpService
+
+pytestmark = pytest.mark.anyio
+
+
+class RecordingEmailService:
+    def __init__(self):
+        self.sent = []
+
+    async def send_email(self, to_email: str, subject: str, body: str, html: bool = False) -> None:
+        self.sent.append(body)
+
+
+class FailingEmailService:
+    async def send_email(self, to_email: str, subject: str, body: str, html: bool = False) -> None:
+        raise ConnectionError
+
+
+def sent_code(email_service: RecordingEmailService) -> str:
+    return email_service.sent[-1].rsplit(" ", 1)[-1]
+
+
+async def test_code_is_consumed_once(redis):
+    email_service = RecordingEmailService()
+    otp = EmailOtpService(email_service, redis, otp_ttl=60, max_attempts=3)
+
+    await otp.send_otp("a@b.c")
+    code = sent_code(email_service)
+    await otp.verify_otp("a@b.c", code)
+
+    with pytest.raises(HTTPException) as error:
+        await otp.verify_otp("a@b.c", code)
+    assert error.value.status_code == 404
+
+
+async def test_pending_code_blocks_a_resend(redis):
+    otp = EmailOtpService(RecordingEmailService(), redis, otp_ttl=60)
+
+    await otp.send_otp("a@b.c")
+    with pytest.raises(HTTPException) as error:
+        await otp.send_otp("a@b.c")
+
+    assert error.value.status_code == 400
+
+
+async def test_failed_delivery_releases_the_slot(redis):
+    otp = EmailOtpService(FailingEmailService(), redis, otp_ttl=60)
+
+    with pytest.raises(ConnectionError):
+        await otp.send_otp("a@b.c")
+
+    otp.email_service = RecordingEmailService()
+    await otp.send_otp("a@b.c")
+
+
+async def test_attempts_are_limited(redis):
+    email_service = RecordingEmailService()
+    otp = EmailOtpService(email_service, redis, otp_ttl=60, max_attempts=2)
+    await otp.send_otp("a@b.c")
+    code = sent_code(email_service)
+    wrong = f"{(int(code) + 1) % 10 ** 6:06d}"
+
+    with pytest.raises(HTTPException) as first:
+        await otp.verify_otp("a@b.c", wrong)
+    with pytest.raises(HTTPException) as second:
+        await otp.verify_otp("a@b.c", wrong)
+    with pytest.raises(HTTPException) as third:
+        await otp.verify_otp("a@b.c", code)
+
+    assert (first.value.status_code, second.value.status_code, third.value.status_code) == (404, 429, 404)
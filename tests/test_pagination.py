@@ -0,0 +1,83 @@
+from datetime import datetime
+from types import SimpleNamespace
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql
+
+from src.application.drivers.models import Driver
+from src.infrastructure.dbs.pagination import decode_cursor, encode_cursor, fetch_page
+
+ORDER_BY = (Driver.created_at, Driver.id)
+
+
+class RecordingSession:
+    def __init__(self, total=7):
+        self.statements = []
+        self.total = total
+
+    async def execute(self, statement):
+        self.statements.append(str(statement.compile(dialect=postgresql.dialect())))
+        return SimpleNamespace(
+            scalar_one=lambda: self.total,
+            scalar_one_or_none=lambda: self.total,
+            scalars=lambda: SimpleNamespace(all=lambda: []),
+            mappings=lambda: SimpleNamespace(all=lambda: []),
+            all=lambda: [],
+        )
+
+
+def test_cursor_round_trip():
+    created_at = datetime(2024, 5, 1, 12, 30)
+    cursor = encode_cursor([created_at, 42])
+
+    assert "=" not in cursor
+    assert decode_cursor(cursor, ORDER_BY) == [created_at, 42]
+
+
+@pytest.mark.parametrize("cursor", ["not-base64!", encode_cursor([1]), encode_cursor(["yesterday", 1])])
+def test_invalid_cursor_is_rejected(cursor):
+    with pytest.raises(HTTPException) as error:
+        decode_cursor(cursor, ORDER_BY)
+
+    assert error.value.status_code == 400
+
+
+@pytest.mark.anyio
+async def test_page_number_listing_runs_one_exact_count():
+    session = RecordingSession()
+
+    page = await fetch_page(session, select(Driver), ORDER_BY, {"page": 2, "per_page": 5})
+
+    assert page.total == 7
+    assert page.page == 2
+    assert len(session.statements) == 2
+    assert session.statements[0].startswith("SELECT count(*)")
+    assert "OFFSET" in session.statements[1]
+    assert "OVER ()" not in session.statements[1]
+
+
+@pytest.mark.anyio
+async def test_cursor_listing_skips_the_total():
+    session = RecordingSession()
+    cursor = encode_cursor([datetime(2024, 5, 1), 3])
+
+    page = await fetch_page(session, select(Driver), ORDER_BY, {"cursor": cursor, "per_page": 5})
+
+    assert page.total is None
+    assert page.page is None
+    assert len(session.statements) == 1
+    assert "(drivers.created_at, drivers.id) >" in session.statements[0]
+    assert "count(" not in session.statements[0]
+
+
+@pytest.mark.anyio
+async def test_window_count_is_opt_in():
+    session = RecordingSession()
+
+    page = await fetch_page(session, select(Driver), ORDER_BY, {"page": 1, "per_page": 5, "count_mode": "window"})
+
+    assert len(session.statements) == 1
+    assert "count(*) OVER ()" in session.statements[0]
+    assert page.total == 0
@@ -0,0 +1,34 @@
+import pytest
+
+from src.infrastructure.rate_limiter import RateLimiter
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_bucket_rejects_once_empty(redis):
+    limiter = RateLimiter(redis, {"login": (2, 60)})
+
+    first = await limiter.hit("login", ["ip:1.2.3.4"])
+    second = await limiter.hit("login", ["ip:1.2.3.4"])
+    third = await limiter.hit("login", ["ip:1.2.3.4"])
+
+    assert (first.allowed, first.remaining) == (True, 1)
+    assert (second.allowed, second.remaining) == (True, 0)
+    assert third.allowed is False
+    assert third.retry_after > 0
+
+
+async def test_every_identity_must_have_a_token(redis):
+    limiter = RateLimiter(redis, {"login": (1, 60)})
+
+    await limiter.hit("login", ["email:a@b.c"])
+    result = await limiter.hit("login", ["ip:1.2.3.4", "email:a@b.c"])
+    other = await limiter.hit("login", ["ip:1.2.3.4"])
+
+    assert result.allowed is False
+    assert other.allowed is True
+
+
+async def test_unlimited_routes_are_skipped(redis):
+    assert await RateLimiter(redis, {"login": (1, 60)}).hit("send_otp", ["ip:1.2.3.4"]) is None
+    assert await RateLimiter(redis, {"login": (1, 60)}, enabled=False).hit("login", ["ip:1.2.3.4"]) is None
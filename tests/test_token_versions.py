@@ -0,0 +1,36 @@
+import pytest
+from fastapi import HTTPException
+from fastapi.security import HTTPAuthorizationCredentials
+
+from src.application.users.services import TokenVersionService
+from src.infrastructure.integrations.jwt_service import JWTService
+from src.presentation.v1.depends.security import get_token_payload
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_bump_moves_the_version_forward(redis):
+    versions = TokenVersionService(redis)
+    assert await versions.get(1) is None
+
+    issued = await versions.current(1)
+    assert await versions.current(1) == issued
+
+    await versions.bump(1)
+    assert await versions.get(1) > issued
+
+
+async def test_revoked_token_is_rejected(redis):
+    versions = TokenVersionService(redis)
+    jwt_service = JWTService(secret_key="secret", algorithm="HS256", access_token_expire_minutes=15)
+    issued = await versions.current(1)
+    token = jwt_service.encode_token(data={"user_id": 1, "role": "driver", "ver": issued})
+    credentials = HTTPAuthorizationCredentials(scheme="Bearer", credentials=token)
+
+    payload = await get_token_payload(token=credentials, jwt_service=jwt_service, token_versions=versions)
+    assert payload["verified_claims"] is True
+
+    await versions.bump(1)
+    with pytest.raises(HTTPException) as error:
+        await get_token_payload(token=credentials, jwt_service=jwt_service, token_versions=versions)
+    assert error.value.status_code == 401
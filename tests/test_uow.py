@@ -0,0 +1,66 @@
+from types import SimpleNamespace
+
+import pytest
+
+from src.infrastructure.dbs.postgre import primary_reads
+from src.infrastructure.dbs.uow import UoW
+
+
+class StubSession:
+    def __init__(self):
+        self.info = {}
+        self.calls = []
+
+    async def commit(self):
+        self.calls.append("commit")
+
+    async def rollback(self):
+        self.calls.append("rollback")
+
+
+@pytest.mark.anyio
+async def test_nested_blocks_commit_once_then_run_callbacks():
+    session = StubSession()
+    uow = UoW(session)
+
+    async def callback():
+        session.calls.append("callback")
+
+    async with uow:
+        async with uow:
+            uow.after_commit(callback)
+        assert session.calls == []
+
+    assert session.calls == ["commit", "callback"]
+
+
+@pytest.mark.anyio
+async def test_rollback_drops_callbacks():
+    session = StubSession()
+    uow = UoW(session)
+
+    async def callback():
+        session.calls.append("callback")
+
+    with pytest.raises(RuntimeError):
+        async with uow:
+            uow.after_commit(callback)
+            raise RuntimeError
+
+    async with uow:
+        pass
+
+    assert session.calls == ["rollback", "commit"]
+
+
+def test_primary_reads_restores_routing():
+    session = SimpleNamespace(info={})
+
+    with primary_reads(session):
+        assert session.info["use_primary"] is True
+    assert session.info["use_primary"] is False
+
+    session.info["use_primary"] = True
+    with primary_reads(session, enabled=False):
+        assert session.info["use_primary"] is True
+    assert session.info["use_primary"] is True